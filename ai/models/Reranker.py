@@ -0,0 +1,73 @@
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from telemetry.tracing import span
+
+DEFAULT_RERANKER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+DEFAULT_RERANKER_THRESHOLD = 0.05
+
+
+class Reranker:
+    """CPU-local cross-encoder that scores (query, passage) pairs for relevance.
+
+    Needs sentence-transformers (`pip install -r requirements-local.txt`), only imported when reranking is turned on.
+    """
+
+    # --- Methods ---
+    def __init__(self, model_name: str | None = None, threshold: float | None = None, batch_size: int = 32,
+                 workers: int = 2):
+        """Load the model. Defaults come from COGITO_RERANKER_MODEL and COGITO_RERANKER_THRESHOLD."""
+
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError as e:
+            raise ImportError("Reranking needs `pip install -r requirements-local.txt`.") from e
+
+        self.model_name = model_name or os.getenv("COGITO_RERANKER_MODEL", DEFAULT_RERANKER_MODEL)
+        if threshold is None:
+            threshold = float(os.getenv("COGITO_RERANKER_THRESHOLD", DEFAULT_RERANKER_THRESHOLD))
+        self.threshold = threshold
+        self.batch_size = batch_size
+
+        self.model = CrossEncoder(self.model_name, device="cpu")
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def score(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """Relevance of each (query, passage) pair in [0, 1], splitting large inputs into batches scored in parallel."""
+
+        if not pairs:
+            return []
+
+        with span("rerank", self.model_name, batch_size=len(pairs)):
+            if len(pairs) <= self.batch_size:
+                logits = self._predict(pairs)
+            else:
+                batches = [pairs[i:i + self.batch_size] for i in range(0, len(pairs), self.batch_size)]
+                logits = [s for batch in self._executor.map(self._predict, batches) for s in batch]
+
+        return [1 / (1 + math.exp(-logit)) for logit in logits]
+
+    def _predict(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """Score one batch (raw logits)."""
+
+        return [float(s) for s in self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)]
+
+
+_reranker: Reranker | None = None
+_reranker_lock = threading.Lock()
+
+
+def get_reranker() -> Reranker | None:
+    """Process-wide reranker, or None unless COGITO_RERANKER=1. The model is loaded on first use."""
+
+    global _reranker
+
+    if os.getenv("COGITO_RERANKER") != "1":
+        return None
+
+    with _reranker_lock:
+        if _reranker is None:
+            _reranker = Reranker()
+        return _reranker
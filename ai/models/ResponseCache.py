@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from langchain_core.messages import AnyMessage, messages_to_dict, message_to_dict, messages_from_dict
+
+DEFAULT_CACHE_PATH = Path.home() / Path(".cogito/llm_cache.sqlite3")
+
+# Public model attributes that change what a model answers, and so are part of the cache key
+SAMPLING_PARAMS = ("temperature", "max_tokens", "top_p", "seed", "stop", "reasoning_effort", "reasoning_format",
+                   "model_kwargs")
+
+
+class ResponseCache:
+    """Content-hashed LLM response cache with an in-memory LRU tier and a persistent SQLite tier."""
+
+    # --- Methods ---
+    def __init__(self, path: Path | None = DEFAULT_CACHE_PATH, max_entries: int = 512):
+        """Initialize the cache. Pass `path=None` for a memory-only cache."""
+
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lru: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires_at REAL, response TEXT);"
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the persistent tier."""
+
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def make_key(model, messages: list[AnyMessage]) -> str:
+        """Hash the model id, its sampling params and the messages into a cache key.
+
+        Only public attributes are read, so stand-in models (bench fixtures and fakes) key the same way as real ones.
+        """
+
+        # A model with bound kwargs (`bind(...)`) wraps the chat model
+        base = getattr(model, "bound", None) or model
+        params = {name: getattr(base, name) for name in SAMPLING_PARAMS if getattr(base, name, None) is not None}
+        if getattr(model, "kwargs", None):
+            params["bound"] = model.kwargs
+
+        payload = {
+            "model": getattr(base, "model_name", None) or getattr(base, "model", None) or type(base).__name__,
+            "params": params,
+            "messages": messages_to_dict(messages)
+        }
+        payload_str = json.dumps(payload, sort_keys=True, default=str)
+
+        return hashlib.sha256(payload_str.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> AnyMessage | None:
+        """Return the cached response for `key`, or None if missing or expired."""
+
+        now = time.time()
+        with self._lock:
+            # 1. In-memory tier
+            entry = self._lru.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at >= now:
+                    self._lru.move_to_end(key)
+                    self.hits += 1
+                    return messages_from_dict([response])[0]
+                del self._lru[key]
+
+            # 2. Persistent tier
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT expires_at, response FROM responses WHERE key = ?;", (key,)
+                ).fetchone()
+                if row and row[0] >= now:
+                    response = json.loads(row[1])
+                    self._remember(key, row[0], response)
+                    self.hits += 1
+                    return messages_from_dict([response])[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: AnyMessage, ttl: float):
+        """Store a response under `key` for `ttl` seconds."""
+
+        expires_at = time.time() + ttl
+        response_dict = message_to_dict(response)
+
+        with self._lock:
+            self._remember(key, expires_at, response_dict)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, expires_at, response) VALUES (?, ?, ?);",
+                    (key, expires_at, json.dumps(response_dict))
+                )
+                self._conn.execute("DELETE FROM responses WHERE expires_at < ?;", (time.time(),))
+                self._conn.commit()
+
+    def _remember(self, key: str, expires_at: float, response: dict):
+        """Insert into the in-memory tier, evicting the least recently used entry if full."""
+
+        self._lru[key] = (expires_at, response)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+
+_response_cache: ResponseCache | None = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the process-wide response cache, or None if caching is disabled (opt-in via COGITO_LLM_CACHE=1)."""
+
+    global _response_cache
+
+    if os.getenv("COGITO_LLM_CACHE", "0") != "1":
+        return None
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            path = os.getenv("COGITO_LLM_CACHE_PATH")
+            _response_cache = ResponseCache(path=Path(path) if path else DEFAULT_CACHE_PATH)
+
+    return _response_cache
@@ -24,6 +24,13 @@ oss_20b_low_temp = ChatGroq(
     reasoning_format="parsed",
 )
 
+oss_20b_med = ChatGroq(
+    model="openai/gpt-oss-20b",
+    temperature=0.5,
+    reasoning_effort="medium",
+    reasoning_format="parsed",
+)
+
 oss_20b_high_temp_med_reasoning = ChatGroq(
     model="openai/gpt-oss-20b",
     temperature=0.7,
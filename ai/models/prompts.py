@@ -0,0 +1,28 @@
+"""Prompt assembly in cache-friendly order.
+
+OpenAI and Groq cache the longest previously-seen prefix of a prompt, so messages are ordered from most to least stable:
+static instructions, then the conversation (which only grows between turns), then evidence (which only grows between
+planner iterations, always appended in the same order), then whatever changes on every call (plans, iteration counts).
+Instruction blocks must not interpolate anything per-call, or the shared prefix ends there.
+"""
+
+from langchain_core.messages import AnyMessage
+
+
+def assemble_prompt(instructions: AnyMessage, conversation: list[AnyMessage] | None = None,
+                    evidence: AnyMessage | None = None, volatile: AnyMessage | None = None) -> list[AnyMessage]:
+    """Order prompt parts so calls share the longest possible prefix. Parts that are None are left out."""
+
+    messages = [instructions]
+    if conversation:
+        messages.extend(conversation)
+    if evidence is not None:
+        messages.append(evidence)
+    if volatile is not None:
+        messages.append(volatile)
+    return messages
+
+def cached_token_ratio(input_tokens: int, cached_tokens: int) -> float:
+    """Share of input tokens served from the provider's prompt cache."""
+
+    return round(cached_tokens / input_tokens, 4) if input_tokens else 0.0
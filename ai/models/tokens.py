@@ -0,0 +1,122 @@
+"""Token accounting for prompt budgets.
+
+Encoders are loaded once per process, and token counts are memoized by a hash of the counted text, so a message or
+evidence item that stays in the prompt across planner iterations is only tokenized the first time it's seen.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import tiktoken
+from langchain_core.messages import AnyMessage
+
+from ai.research_agent.EvidenceStore import EvidenceStore
+from ai.research_agent.schemas.QueryResult import QueryResult
+from ai.research_agent.sources.stringify import stringify_query_result
+
+DEFAULT_ENCODING = "cl100k_base"
+
+# Rough per-message overhead of chat formatting (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_MAX_MEMO_ENTRIES = 16384
+
+_memo: OrderedDict[bytes, int] = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_encoding(name: str = DEFAULT_ENCODING) -> tiktoken.Encoding:
+    """Load an encoding once per process."""
+
+    return tiktoken.get_encoding(name)
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in a text, memoized by content hash."""
+
+    if not text:
+        return 0
+
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    with _memo_lock:
+        count = _memo.get(key)
+        if count is not None:
+            _memo.move_to_end(key)
+            return count
+
+    count = len(get_encoding().encode(text, disallowed_special=()))
+
+    with _memo_lock:
+        _memo[key] = count
+        if len(_memo) > _MAX_MEMO_ENTRIES:
+            _memo.popitem(last=False)
+    return count
+
+def count_message_tokens(message: AnyMessage) -> int:
+    """Number of tokens a chat message takes up in a prompt."""
+
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    return count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+class TokenBudget:
+    """Running token count of a prompt being assembled, checked against a limit."""
+
+    # --- Methods ---
+    def __init__(self, limit: int):
+        """Start an empty budget."""
+
+        self.limit = limit
+        self.used = 0
+
+    def add_text(self, text: str) -> int:
+        """Count a text against the budget and return its tokens."""
+
+        tokens = count_tokens(text)
+        self.used += tokens
+        return tokens
+
+    def add_messages(self, messages: list[AnyMessage]) -> int:
+        """Count chat messages against the budget and return their tokens."""
+
+        tokens = sum(count_message_tokens(msg) for msg in messages)
+        self.used += tokens
+        return tokens
+
+    def add_evidence(self, query_results: list[QueryResult], evidence_store: EvidenceStore) -> int:
+        """Count research results, as they're rendered into prompts, against the budget and return their tokens."""
+
+        tokens = sum(count_tokens(stringify_query_result(result, evidence_store)) for result in query_results)
+        self.used += tokens
+        return tokens
+
+    def fit_evidence(self, query_results: list[QueryResult], evidence_store: EvidenceStore) -> list[QueryResult]:
+        """Add research results in order while they fit, returning the ones that did."""
+
+        fitted = []
+        for result in query_results:
+            tokens = count_tokens(stringify_query_result(result, evidence_store))
+            if not self.fits(tokens):
+                break
+            self.used += tokens
+            fitted.append(result)
+        return fitted
+
+    def fits(self, tokens: int) -> bool:
+        """Whether `tokens` more would stay within the limit."""
+
+        return self.used + tokens <= self.limit
+
+    @property
+    def remaining(self) -> int:
+        """Tokens left before the limit."""
+
+        return max(self.limit - self.used, 0)
+
+    @property
+    def exceeded(self) -> bool:
+        """Whether the limit has been reached."""
+
+        return self.used >= self.limit
@@ -1,3 +1,10 @@
+from typing import Callable
+
+from ai.models.ResponseCache import get_response_cache, ResponseCache
+from ai.research_agent.CancellationToken import call_cancellable
+from telemetry.tracing import span, annotate, record_llm_usage
+
+
 def extract_content(result):
     """Extract the main text content from a model.invoke() result, ignoring any 'reasoning' or auxiliary objects."""
 
@@ -16,12 +23,41 @@ def extract_content(result):
     # Fallback: convert to string
     return str(result).strip()
 
-def safe_invoke(model, messages):
+def _is_valid(result, validate: Callable | None) -> bool:
+    """Whether a response passes the caller's check (a check that raises counts as a failure)."""
+
+    if validate is None:
+        return True
+    try:
+        return bool(validate(result))
+    except Exception:
+        return False
+
+def safe_invoke(model, messages, cache_config: dict | None = None, validate: Callable | None = None):
     """Invoke a model with optional reasoning parameters, handling models that may not support reasoning.
 
-    Also ensures no tool calls are made by unbinding any tools from the model.
+    Also ensures no tool calls are made by unbinding any tools from the model. If `cache_config` is given and enabled
+    (e.g. `{"enabled": True, "ttl": 3600}`) and response caching is turned on, identical calls are served from cache.
+    `validate` is the caller's parse check: only responses it accepts are cached or served from cache.
     """
 
-    model = model.bind_tools([], tool_choice="none")
-    result = model.invoke(messages)
-    return result
+    model_name = getattr(model, "model_name", None) or getattr(model, "model", None) or type(model).__name__
+    with span("llm", model_name):
+        cache = get_response_cache() if cache_config and cache_config.get("enabled") else None
+        key = None
+        if cache is not None:
+            key = ResponseCache.make_key(model, messages)
+            cached = cache.get(key)
+            if cached is not None and _is_valid(cached, validate):
+                annotate(cache_hits=1)
+                return cached
+
+        # Cancelling the run abandons the request instead of waiting for the response
+        bound_model = model.bind_tools([], tool_choice="none")
+        result = call_cancellable(bound_model.invoke, messages)
+        record_llm_usage(result)
+
+        if cache is not None and _is_valid(result, validate):
+            cache.put(key, result, ttl=cache_config.get("ttl", 3600))
+
+        return result
@@ -0,0 +1,154 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
+from typing import Callable
+
+from telemetry.tracing import propagate
+
+# How often blocked calls look at the token
+POLL_INTERVAL = 0.1
+
+_current_token: contextvars.ContextVar["CancellationToken | None"] = contextvars.ContextVar(
+    "cogito_cancellation", default=None
+)
+
+
+class RunCancelled(Exception):
+    """Raised inside an agent run once its cancellation token fires."""
+
+
+class CancellationToken:
+    """Cooperative cancellation for one agent run, fired explicitly with `cancel()` or by a deadline.
+
+    Deadlines are wall-clock times and `event` can be any Event-like object, so a token holding a
+    `multiprocessing.Manager().Event()` can be passed to a worker process and cancelled from the parent.
+    """
+
+    # --- Methods ---
+    def __init__(self, timeout: float | None = None, deadline: float | None = None, event=None):
+        """Create a token that fires `timeout` seconds from now or at the `deadline` timestamp (whichever is first)."""
+
+        if timeout is not None:
+            deadline = min(deadline, time.time() + timeout) if deadline is not None else time.time() + timeout
+
+        self.deadline = deadline
+        self.event = event if event is not None else threading.Event()
+
+    def cancel(self):
+        """Fire the token."""
+
+        self.event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the token was cancelled or its deadline has passed."""
+
+        return self.event.is_set() or (self.deadline is not None and time.time() >= self.deadline)
+
+    def remaining(self) -> float | None:
+        """Seconds left until the deadline (0 once cancelled), or None if there is no deadline."""
+
+        if self.event.is_set():
+            return 0.0
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def check(self):
+        """Raise `RunCancelled` if the token has fired."""
+
+        if self.event.is_set():
+            raise RunCancelled("Run cancelled")
+        if self.deadline is not None and time.time() >= self.deadline:
+            raise RunCancelled("Run deadline exceeded")
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Run a blocking call on a daemon thread and wait for it, raising `RunCancelled` as soon as the token fires.
+
+        A cancelled call is abandoned rather than interrupted: its thread finishes in the background and the result is
+        discarded, so the caller is free immediately.
+        """
+
+        self.check()
+
+        done = threading.Event()
+        outcome = {}
+
+        def target():
+            try:
+                outcome["result"] = func(*args, **kwargs)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+        threading.Thread(target=propagate(target), daemon=True, name="cogito-cancellable").start()
+
+        while not done.wait(POLL_INTERVAL):
+            self.check()
+
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    async def guard(self, coro):
+        """Await `coro`, cancelling it (and whatever I/O it is waiting on) as soon as the token fires."""
+
+        task = asyncio.ensure_future(coro)
+        while not task.done():
+            await asyncio.wait({task}, timeout=POLL_INTERVAL)
+            if not task.done() and self.cancelled:
+                task.cancel()
+                self.check()
+        return task.result()
+
+
+def current_token() -> CancellationToken | None:
+    """The token of the run the caller is part of, if it has one."""
+
+    return _current_token.get()
+
+@contextmanager
+def cancellation_scope(token: CancellationToken | None):
+    """Make `token` the current run's token inside the block (copied to threads along with the tracing context)."""
+
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+def check_cancelled():
+    """Raise `RunCancelled` if the current run has been cancelled."""
+
+    token = _current_token.get()
+    if token is not None:
+        token.check()
+
+def call_cancellable(func: Callable, *args, **kwargs):
+    """Run a blocking call so that cancelling the current run abandons it (a plain call outside cancellable runs)."""
+
+    token = _current_token.get()
+    if token is None:
+        return func(*args, **kwargs)
+    return token.call(func, *args, **kwargs)
+
+def wait_cancellable(future: Future):
+    """Wait for a future's result, giving up with `RunCancelled` if the current run is cancelled meanwhile."""
+
+    token = _current_token.get()
+    if token is None:
+        return future.result()
+
+    while not wait([future], timeout=POLL_INTERVAL).done:
+        token.check()
+    return future.result()
+
+def remaining_time() -> float | None:
+    """Seconds until the current run's deadline, or None if it has none."""
+
+    token = _current_token.get()
+    return token.remaining() if token is not None else None
@@ -0,0 +1,133 @@
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+import uuid
+
+
+class EvidenceStore:
+    """Per-run, content-addressed store of evidence texts (vector DB chunks, SEP sections).
+
+    The graph state only carries digests; nodes resolve them to text when they build prompts. This keeps the state that
+    LangGraph copies between nodes small, and identical texts are stored once.
+    """
+
+    # --- Methods ---
+    def __init__(self):
+        """Initialize an empty in-memory store."""
+
+        self._texts: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(text: str) -> str:
+        """Content address of a text."""
+
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def put(self, text: str) -> str:
+        """Store a text (once) and return its digest."""
+
+        key = self.digest(text)
+        with self._lock:
+            if key not in self._texts:
+                self._texts[key] = text
+        return key
+
+    def get(self, key: str) -> str:
+        """Resolve a digest to its text."""
+
+        return self._texts[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._texts
+
+    def close(self):
+        """Drop all stored texts."""
+
+        self._texts.clear()
+
+
+class MmapEvidenceStore(EvidenceStore):
+    """`EvidenceStore` whose texts live in an anonymous temp file read through mmap, keeping them off the Python heap."""
+
+    # --- Methods ---
+    def __init__(self):
+        """Open the backing temp file (deleted automatically on close)."""
+
+        super().__init__()
+        self._file = tempfile.TemporaryFile(prefix="cogito-evidence-")
+        self._offsets: dict[str, tuple[int, int]] = {}
+        self._size = 0
+        self._map: mmap.mmap | None = None
+
+    def put(self, text: str) -> str:
+        """Append a text to the file (once) and return its digest."""
+
+        key = self.digest(text)
+        data = text.encode("utf-8")
+        with self._lock:
+            if key not in self._offsets:
+                self._file.seek(self._size)
+                self._file.write(data)
+                self._file.flush()
+                self._offsets[key] = (self._size, len(data))
+                self._size += len(data)
+        return key
+
+    def get(self, key: str) -> str:
+        """Read a text back through the memory map, remapping if the file has grown."""
+
+        offset, length = self._offsets[key]
+        with self._lock:
+            if length == 0:
+                return ""
+            if self._map is None or len(self._map) < offset + length:
+                if self._map is not None:
+                    self._map.close()
+                self._map = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+            return self._map[offset:offset + length].decode("utf-8")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._offsets
+
+    def close(self):
+        """Unmap and delete the backing file."""
+
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+            self._offsets.clear()
+
+
+# Open stores by id; the graph state holds the id so the store itself is never copied or pickled with it
+_STORES: dict[str, EvidenceStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def open_evidence_store(kind: str | None = None) -> str:
+    """Open a store (`memory` or `mmap`, default COGITO_EVIDENCE_STORE, else `memory`) and return its id."""
+
+    kind = kind or os.getenv("COGITO_EVIDENCE_STORE", "memory")
+    store = MmapEvidenceStore() if kind == "mmap" else EvidenceStore()
+
+    store_id = uuid.uuid4().hex
+    with _STORES_LOCK:
+        _STORES[store_id] = store
+    return store_id
+
+def get_evidence_store(store_id: str) -> EvidenceStore:
+    """Look up an open store by id."""
+
+    return _STORES[store_id]
+
+def release_evidence_store(store_id: str):
+    """Close a store and forget it."""
+
+    with _STORES_LOCK:
+        store = _STORES.pop(store_id, None)
+    if store is not None:
+        store.close()
@@ -5,15 +5,24 @@ from langgraph.constants import START, END
 from langgraph.graph import StateGraph
 from rich.status import Status
 
+from ai.research_agent.CancellationToken import CancellationToken, RunCancelled, cancellation_scope, \
+    check_cancelled
+from ai.research_agent.EvidenceStore import open_evidence_store, release_evidence_store
+from ai.research_agent.nodes.check_answer_cache import check_answer_cache
 from ai.research_agent.nodes.classify_research_needed import classify_research_needed
 from ai.research_agent.nodes.create_conversation import create_conversation
+from ai.research_agent.nodes.decompose_question import decompose_question
 from ai.research_agent.nodes.execute_queries import execute_queries
 from ai.research_agent.nodes.plan_research import plan_research
+from ai.research_agent.nodes.research_strands import research_strands
+from ai.research_agent.nodes.store_answer_cache import store_answer_cache
 from ai.research_agent.nodes.write_response import write_response
 from ai.research_agent.schemas.ResearchAgentState import ResearchAgentState
 from ai.research_agent.schemas.ResearchEffort import ResearchEffort
+from dbs.AnswerCache import get_answer_cache
 from dbs.Postgres import Postgres
 from dbs.Qdrant import Qdrant
+from telemetry.tracing import trace_run, span
 
 
 class ResearchAgent:
@@ -24,16 +33,39 @@ class ResearchAgent:
         """Initialize the Research Agent subgraph."""
 
         self.graph = None
+        self.strand_graph = None
         self.qdrant = qdrant if qdrant is not None else Qdrant()
         self.postgres_filters = postgres_filters if postgres_filters is not None else Postgres()
+        self.answer_cache = get_answer_cache(self.qdrant)
         self.status = None
 
-    def run(self, conversation: list[AnyMessage], status: Status | None) -> ResearchAgentState:
-        """Invoke the Research Agent subgraph with a conversation."""
+    def run(self, conversation: list[AnyMessage], status: Status | None, summary: tuple[str, int] | None = None,
+            cancellation: CancellationToken | None = None) -> ResearchAgentState:
+        """Invoke the Research Agent subgraph with a conversation.
 
-        init_state = {"conversation": conversation}
+        `summary` is an earlier run's (`conversation_summary`, `summarized_messages`), which stands in for the messages
+        it covers instead of summarizing them again. If `cancellation` fires, the run stops at the next node or
+        in-flight LLM/SEP call and raises `RunCancelled`; its deadline also makes research end early.
+        """
+
+        # Result texts live in a per-run evidence store; the state only carries their digests
+        evidence_store = open_evidence_store()
+        init_state = {"conversation": conversation, "evidence_store": evidence_store}
+        if summary is not None:
+            init_state["conversation_summary"], init_state["summarized_messages"] = summary
         self.status = status
-        res = self.graph.invoke(init_state)
+        try:
+            with trace_run() as trace, cancellation_scope(cancellation):
+                try:
+                    res = self.graph.invoke(init_state)
+                except RunCancelled:
+                    trace.attrs["cancelled"] = True
+                    raise
+                trace.attrs["research_effort"] = res.get("research_effort")
+                trace.attrs["research_iterations"] = res.get("research_iterations")
+                trace.attrs["answer_cache_hit"] = res.get("answer_cache_hit")
+        finally:
+            release_evidence_store(evidence_store)
         return res
 
     def build(self) -> None:
@@ -43,6 +75,8 @@ class ResearchAgent:
         and generates summaries until satisfaction criteria are met.
         """
 
+        self.strand_graph = self._build_strand_graph()
+
         # --- Initialize graph ---
         g = StateGraph(ResearchAgentState)
 
@@ -50,9 +84,18 @@ class ResearchAgent:
         g.add_node(
             "create_conversation", self._wrap(create_conversation)
         )
+        g.add_node(
+            "check_answer_cache", self._wrap(check_answer_cache, self.answer_cache)
+        )
         g.add_node(
             "classify_research_needed", self._wrap(classify_research_needed)
         )
+        g.add_node(
+            "decompose_question", self._wrap(decompose_question)
+        )
+        g.add_node(
+            "research_strands", self._wrap(research_strands, self.strand_graph)
+        )
         g.add_node(
             "plan_research", self._wrap(plan_research)
         )
@@ -62,25 +105,63 @@ class ResearchAgent:
         g.add_node(
             "write_response", self._wrap(write_response)
         )
+        g.add_node(
+            "store_answer_cache", self._wrap(store_answer_cache, self.answer_cache)
+        )
 
         # --- Add edges ---
         g.add_edge(START, "create_conversation")
-        g.add_edge("create_conversation", "classify_research_needed")
+        g.add_edge("create_conversation", "check_answer_cache")
         g.add_edge("execute_queries", "plan_research")
-        g.add_edge("write_response", END)
+        g.add_edge("research_strands", "write_response")
+        g.add_edge("write_response", "store_answer_cache")
+        g.add_edge("store_answer_cache", END)
 
         # --- Add conditional edges ---
+        g.add_conditional_edges(
+            "check_answer_cache",
+            lambda state: END if state["answer_cache_hit"] else "classify_research_needed"
+        )
         g.add_conditional_edges(
             "plan_research",
             lambda state: "write_response" if state["completed"] else "execute_queries"
         )
         g.add_conditional_edges(
             "classify_research_needed",
-            lambda state: "plan_research" if state["research_effort"] is not ResearchEffort.NONE else "write_response"
+            lambda state: {
+                ResearchEffort.NONE: "write_response",
+                ResearchEffort.SIMPLE: "plan_research",
+                ResearchEffort.DEEP: "decompose_question"
+            }[state["research_effort"]]
+        )
+        g.add_conditional_edges(
+            "decompose_question",
+            lambda state: "research_strands" if state["sub_questions"] else "plan_research"
         )
 
         self.graph = g.compile()
 
+    def _build_strand_graph(self):
+        """Build the research loop run once per sub-question by `research_strands`."""
+
+        g = StateGraph(ResearchAgentState)
+
+        g.add_node(
+            "plan_research", self._wrap(plan_research)
+        )
+        g.add_node(
+            "execute_queries", self._wrap(execute_queries, self.qdrant)
+        )
+
+        g.add_edge(START, "plan_research")
+        g.add_edge("execute_queries", "plan_research")
+        g.add_conditional_edges(
+            "plan_research",
+            lambda state: END if state["completed"] else "execute_queries"
+        )
+
+        return g.compile()
+
     def close(self):
         """Close any database connections used by the Research Agent."""
 
@@ -94,9 +175,14 @@ class ResearchAgent:
         read the current value of `self.status` at invocation time. That
         allows callers to call `agent.build()` before `agent.run(status=...)`
         and still have the nodes receive the Status object passed to run().
+
+        Every node call is also traced as a span (see `telemetry.tracing`), and
+        no node starts once the run's cancellation token has fired.
         """
 
         def wrapped(state):
-            return func(state, *args, status=self.status, **kwargs)
+            check_cancelled()
+            with span("node", func.__name__, node=func.__name__, iteration=state.get("research_iterations")):
+                return func(state, *args, status=self.status, **kwargs)
 
         return wrapped
@@ -0,0 +1,62 @@
+import re
+
+from rapidfuzz import fuzz
+
+from ai.research_agent.schemas.QueryResult import QueryResult
+
+# In-text citations look like "(Source, Author, Source Title, Section X-Y)": parenthesized, at least three commas
+_CITATION_PATTERN = re.compile(r"\(([^()\n]*,[^()\n]*,[^()\n]*,[^()\n]*)\)")
+_REFERENCES_HEADING = re.compile(r"^#*\s*\**references\**:?\s*$", re.IGNORECASE | re.MULTILINE)
+_LIST_ITEM = re.compile(r"^\s*(?:[-*]|\d+\.)\s+(.+)$", re.MULTILINE)
+
+
+def _collected_titles(query_results: list[QueryResult]) -> list[str]:
+    """Titles of every source actually retrieved during research."""
+
+    titles = set()
+    for result in query_results:
+        if type(result.get("result")) == tuple:
+            _, citation = result["result"]
+            title = (citation.get("title") or "").strip()
+            if title and title != "null":
+                titles.add(title.lower())
+    return sorted(titles)
+
+def _cited_items(draft: str) -> list[str]:
+    """In-text citations plus the entries of the draft's References section."""
+
+    items = [m.group(1) for m in _CITATION_PATTERN.finditer(draft)]
+
+    heading = _REFERENCES_HEADING.search(draft)
+    if heading:
+        items.extend(m.group(1) for m in _LIST_ITEM.finditer(draft[heading.end():]))
+    return items
+
+def validate_draft(draft: str, query_results: list[QueryResult], rules: dict) -> list[str]:
+    """Cheaply check a drafted answer against the research it was written from. Returns the problems found (empty if
+    it passes).
+
+    Every citation and reference must name a source that was actually retrieved (fuzzy-matched on title, since drafts
+    reformat titles freely), there must be at least `min_citations` citations, and the length must fall within
+    `min_chars`/`max_chars`.
+    """
+
+    problems = []
+
+    if len(draft) < rules.get("min_chars", 0):
+        problems.append(f"too short ({len(draft)} chars)")
+    if len(draft) > rules.get("max_chars", float("inf")):
+        problems.append(f"too long ({len(draft)} chars)")
+
+    cited = _cited_items(draft)
+    if len(cited) < rules.get("min_citations", 0):
+        problems.append(f"too few citations ({len(cited)})")
+
+    titles = _collected_titles(query_results)
+    threshold = rules.get("match_threshold", 85)
+    for item in cited:
+        item = item.lower()
+        if not any(fuzz.partial_ratio(title, item) >= threshold for title in titles):
+            problems.append(f"cites a source that wasn't retrieved: {item[:80]}")
+
+    return problems
@@ -1,11 +1,42 @@
 from ai.models.groq import llama_8b_instant, llama_4_scout, oss_20b_high_temp_med_reasoning, oss_120b_med, \
-    oss_20b_low_temp
+    oss_20b_low_temp, oss_20b_med
+from ai.research_agent.schemas.ResearchEffort import ResearchEffort
 
 RESEARCH_AGENT_MODEL_CONFIG = {
     "create_conversation": llama_8b_instant,                        # Summarization task
     "research_classifier": oss_20b_low_temp,                        # Slightly nuanced classification task
     "extract_text": llama_8b_instant,                               # Text extraction task
     "plan_research": llama_4_scout,                                 # Moderate complexity planning + structured output task
+    "decompose_question": llama_4_scout,                            # Splitting DEEP questions into sub-questions
     "write_response_no_research": oss_20b_high_temp_med_reasoning,  # Moderate complexity evidence synthesis task
-    "write_response_research": oss_120b_med                         # Moderate complexity evidence synthesis task
+    "write_response_research": oss_120b_med,                        # Moderate complexity evidence synthesis task
+    "write_response_draft": oss_20b_med                             # First attempt at simple answers (see cascade below)
+}
+
+# Per-node LLM response caching (only used when COGITO_LLM_CACHE=1). Only deterministic, low-temperature nodes whose
+# prompts repeat across runs should be enabled here. TTL is in seconds.
+RESEARCH_AGENT_CACHE_CONFIG = {
+    "research_classifier": {"enabled": True, "ttl": 60 * 60 * 24},   # Same last-5-messages prompt for repeat questions
+    "extract_text": {"enabled": True, "ttl": 60 * 60 * 24 * 7},      # Same SEP article headers for popular entries
+    "plan_research": {"enabled": False, "ttl": 60 * 60},
+    "decompose_question": {"enabled": True, "ttl": 60 * 60 * 24},    # Same last-5-messages prompt for repeat questions
+    "write_response_no_research": {"enabled": False, "ttl": 60 * 60},
+    "write_response_research": {"enabled": False, "ttl": 60 * 60},
+    "write_response_draft": {"enabled": False, "ttl": 60 * 60}
+}
+
+# Model cascades. For the listed research efforts, `write_response` drafts the answer with `write_response_draft` and
+# only escalates to `write_response_research` when the draft fails validation: every citation and reference must
+# fuzzy-match (rapidfuzz partial ratio >= match_threshold) the title of a retrieved source, and the draft needs at least
+# min_citations citations and a length within min_chars..max_chars. Escalations are exported as
+# cogito_cascade_escalations_total (out of cogito_cascade_drafts_total).
+RESEARCH_AGENT_CASCADE_CONFIG = {
+    "write_response": {
+        "enabled": True,
+        "efforts": [ResearchEffort.SIMPLE],
+        "min_citations": 1,
+        "match_threshold": 85,
+        "min_chars": 300,
+        "max_chars": 12000
+    }
 }
@@ -0,0 +1,46 @@
+from langchain_core.messages import HumanMessage
+from rich.status import Status
+
+from ai.research_agent.schemas.ResearchAgentState import ResearchAgentState
+from telemetry.tracing import annotate
+
+
+def check_answer_cache(state: ResearchAgentState, answer_cache, status: Status | None):
+    """Serve a first-turn question from the answer cache if a near-identical one was already answered.
+
+    Only standalone questions (a conversation of a single user message) are looked up; their embedding is kept in the
+    state so `store_answer_cache` can cache the new answer on a miss.
+    """
+
+    # Extract graph state variables
+    conversation = state.get("conversation", [])
+
+    if answer_cache is None or len(conversation) != 1 or not isinstance(conversation[0], HumanMessage):
+        return {"answer_cache_hit": False, "question_embedding": None}
+
+    if status:
+        status.update("Checking for an earlier answer...")
+
+    try:
+        vector = answer_cache.embed(conversation[0].content)
+        entry = answer_cache.lookup(vector)
+    except Exception as e:
+        print(f"Answer cache lookup failed: {e}")
+        return {"answer_cache_hit": False, "question_embedding": None}
+
+    annotate(
+        answer_cache_hit=entry is not None,
+        metrics={"cogito_answer_cache_lookups_total": 1, "cogito_answer_cache_hits_total": 1 if entry else 0}
+    )
+
+    if entry is None:
+        return {"answer_cache_hit": False, "question_embedding": vector}
+
+    return {
+        "answer_cache_hit": True,
+        "question_embedding": None,
+        "response": entry["response"],
+        "research_effort": entry["research_effort"],
+        "query_results": entry["query_results"],
+        "completed": True
+    }
@@ -1,10 +1,12 @@
 from langchain_core.messages import SystemMessage
 from rich.status import Status
 
+from ai.models.prompts import assemble_prompt
 from ai.models.util import extract_content, safe_invoke
-from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG
+from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG, RESEARCH_AGENT_CACHE_CONFIG
 from ai.research_agent.schemas.ResearchAgentState import ResearchAgentState
 from ai.research_agent.schemas.ResearchEffort import ResearchEffort
+from telemetry.tracing import annotate
 
 
 def classify_research_needed(state: ResearchAgentState, status: Status | None):
@@ -16,8 +18,9 @@ def classify_research_needed(state: ResearchAgentState, status: Status | None):
     # Extract graph state variables
     conversation = state.get("conversation", [])
 
-    # Get configured model
+    # Get configured model and cache settings
     classifier_model = RESEARCH_AGENT_MODEL_CONFIG["research_classifier"]
+    cache_config = RESEARCH_AGENT_CACHE_CONFIG.get("research_classifier")
 
     # Build prompt (system and user message)
     system_msg = SystemMessage(content=(
@@ -52,10 +55,12 @@ def classify_research_needed(state: ResearchAgentState, status: Status | None):
 
     attempts = 0
     while True:
-        # Invoke model and extract output
+        # Invoke model and extract output (retries bypass the cache so a bad answer isn't replayed)
         result = extract_content(
             safe_invoke(
-                classifier_model, [conversation_context_message, system_msg]
+                classifier_model, assemble_prompt(system_msg, [conversation_context_message]),
+                cache_config=cache_config if attempts == 0 else None,
+                validate=lambda r: any(level in extract_content(r) for level in "012")
             )
         )
 
@@ -71,3 +76,4 @@ def classify_research_needed(state: ResearchAgentState, status: Status | None):
             return {"research_effort": ResearchEffort.NONE}
         else:
             attempts += 1
+            annotate(retries=1)
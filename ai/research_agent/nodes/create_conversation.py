@@ -1,12 +1,21 @@
-import tiktoken
 from langchain_core.messages import HumanMessage, SystemMessage
 from rich.status import Status
 
+from ai.models.prompts import assemble_prompt
+from ai.models.tokens import TokenBudget
 from ai.models.util import extract_content, safe_invoke
 from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG
 from ai.research_agent.schemas.ResearchAgentState import ResearchAgentState
 from ai.research_agent.schemas.ResearchEffort import ResearchEffort
 
+# --- Define constants ---
+CONVERSATION_TOKEN_LIMIT = 10000
+
+
+def _summary_message(summary: str) -> SystemMessage:
+    """System message carrying a summary of the earlier conversation."""
+
+    return SystemMessage(content=f"## CONVERSATION SUMMARY BEFORE THIS POINT\n{summary}")
 
 def create_conversation(state: ResearchAgentState, status: Status | None):
     """Initialize a new conversation by summarizing prior messages and extracting the last user message."""
@@ -16,18 +25,26 @@ def create_conversation(state: ResearchAgentState, status: Status | None):
 
     # Extract graph state variables
     conversation = state.get("conversation", [])
+    summary = state.get("conversation_summary")
+    summarized_messages = state.get("summarized_messages", 0)
+    message_count = len(conversation)
 
-    token_limit = 10000
-    tokenizer = tiktoken.get_encoding("cl100k_base")
-    tokens = sum(len(tokenizer.encode(msg.content)) for msg in conversation)
-    if tokens > token_limit:
-        model = RESEARCH_AGENT_MODEL_CONFIG["create_conversation_summary"]
+    # A summary from an earlier turn stands in for the messages it covers
+    if summary and 0 < summarized_messages < message_count:
+        conversation = [_summary_message(summary), *conversation[summarized_messages:]]
+    else:
+        summary, summarized_messages = None, 0
+
+    budget = TokenBudget(CONVERSATION_TOKEN_LIMIT)
+    budget.add_messages(conversation)
+    if budget.exceeded:
+        model = RESEARCH_AGENT_MODEL_CONFIG["create_conversation"]
 
         # Build prompt (system and user message)
         system_msg = HumanMessage(content=(
             "## YOUR ROLE\n"
             "You are a conversation summarizer. Your job is to summarize the conversation between the user and the AI "
-            "assistant up until and excluding this message, focusing on the key points addressed, questions asked, and "
+            "assistant that follows this message, focusing on the key points addressed, questions asked, and "
             "any relevant context that would help. Note philosophers, sources, and concepts discussed.\n\n"
             "Your summary should at most half the length of the original conversation.\n\n"
             
@@ -35,9 +52,16 @@ def create_conversation(state: ResearchAgentState, status: Status | None):
             "NEVER make tool calls of any kind.\n"
         ))
 
+        # The instructions lead so the prefix is shared; a closing request keeps the model from carrying on the chat
+        final_msg = HumanMessage(content=(
+            "Now write the summary of the conversation above, following the rules in the first message. Respond with "
+            "the summary only."
+        ))
+
         # Invoke model and extract content
-        result = safe_invoke(model, [*conversation[:-1], system_msg])
-        conversation = [SystemMessage(content=f"## CONVERSATION SUMMARY BEFORE THIS POINT\n{extract_content(result)}"), conversation[-1]]
+        result = safe_invoke(model, assemble_prompt(system_msg, conversation[:-1], volatile=final_msg))
+        summary, summarized_messages = extract_content(result), message_count - 1
+        conversation = [_summary_message(summary), conversation[-1]]
 
     # Initialize remaining required keys in state
     state.setdefault('response', '')
@@ -45,6 +69,7 @@ def create_conversation(state: ResearchAgentState, status: Status | None):
     state.setdefault('short_term_plan', 'No short term plan yet.')
     state.setdefault('vector_db_queries', [])
     state.setdefault('sep_queries', [])
+    state.setdefault('context_expansions', [])
     state.setdefault('research_iterations', 1)
     state.setdefault('completed', False)
     state.setdefault('research_effort', ResearchEffort.NONE)
@@ -53,9 +78,12 @@ def create_conversation(state: ResearchAgentState, status: Status | None):
 
     return {
         "conversation": conversation,
+        "conversation_summary": summary,
+        "summarized_messages": summarized_messages,
         'response': state['response'],
         'vector_db_queries': state['vector_db_queries'],
         'sep_queries': state['sep_queries'],
+        'context_expansions': state['context_expansions'],
         'completed': state['completed'],
         'research_effort': state['research_effort'],
         'query_results': state['query_results'],
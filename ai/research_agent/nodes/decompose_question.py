@@ -0,0 +1,73 @@
+import os
+
+from langchain_core.messages import SystemMessage
+from langchain_core.output_parsers import JsonOutputParser
+from rich.status import Status
+
+from ai.models.prompts import assemble_prompt
+from ai.models.util import extract_content, safe_invoke
+from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG, RESEARCH_AGENT_CACHE_CONFIG
+from ai.research_agent.schemas.ResearchAgentState import ResearchAgentState
+from telemetry.tracing import annotate
+
+# --- Define constants ---
+MAX_STRANDS = int(os.getenv("COGITO_MAX_STRANDS", "3"))
+
+
+def decompose_question(state: ResearchAgentState, status: Status | None):
+    """Split a DEEP research question into independent sub-questions that can be researched concurrently.
+
+    Returns an empty list (research proceeds as a single serial loop) if fan-out is disabled with COGITO_DEEP_FANOUT=0,
+    the question doesn't split, or the model's answer can't be parsed.
+    """
+
+    if os.getenv("COGITO_DEEP_FANOUT", "1") == "0":
+        return {"sub_questions": []}
+
+    if status:
+        status.update("Breaking down your question...")
+
+    # Extract graph state variables
+    conversation = state.get("conversation", [])
+
+    # Build prompt (system and user message)
+    system_msg = SystemMessage(content=(
+        "## YOUR JOB\n"
+        "You are a question decomposer for a philosophy research agent. Split the user's latest question into "
+        "independent sub-questions that can each be researched on their own, e.g. one per philosopher, text or "
+        "position being compared. Only split where the parts are genuinely independent; a question about one "
+        "philosopher's view is a single sub-question.\n\n"
+
+        "## YOUR RESPONSE\n"
+        f"Respond with ONLY a JSON array of 1 to {MAX_STRANDS} sub-questions as strings, each self-contained (name the "
+        "philosopher/concept explicitly). Example: `[\"What is Kant's account of duty?\", \"What is Hume's account of "
+        "moral motivation?\"]`\n\n"
+
+        "## STRICT RULES\n"
+        "NEVER make tool calls of any kind. Output NOTHING but the JSON array.\n"
+    ))
+    conversation_context_message = SystemMessage(content=(
+        "Here is the conversation so far (most recent messages last):\n\n"
+        f"{''.join([f'- {msg.content}\n' for msg in conversation[-5:]])}\n"
+    ))
+
+    model = RESEARCH_AGENT_MODEL_CONFIG["decompose_question"]
+    try:
+        content = extract_content(safe_invoke(
+            model, assemble_prompt(system_msg, [conversation_context_message]),
+            cache_config=RESEARCH_AGENT_CACHE_CONFIG.get("decompose_question"),
+            validate=lambda r: isinstance(JsonOutputParser().parse(extract_content(r)), list)
+        ))
+        sub_questions = JsonOutputParser().parse(content)
+    except Exception as e:
+        print(f"Failed to decompose question: {e}")
+        return {"sub_questions": []}
+
+    if not isinstance(sub_questions, list):
+        return {"sub_questions": []}
+
+    sub_questions = [q.strip() for q in sub_questions if isinstance(q, str) and q.strip()][:MAX_STRANDS]
+    annotate(strands=len(sub_questions))
+
+    # A single strand gains nothing over the normal loop
+    return {"sub_questions": sub_questions if len(sub_questions) > 1 else []}
@@ -3,23 +3,118 @@ from concurrent.futures import ThreadPoolExecutor
 
 from rich.status import Status
 
+from ai.models.Reranker import get_reranker, Reranker
+from ai.research_agent.CancellationToken import RunCancelled, wait_cancellable
+from ai.research_agent.EvidenceStore import get_evidence_store, EvidenceStore
 from ai.research_agent.schemas.QueryResult import QueryResult
 from ai.research_agent.schemas.ResearchAgentState import ResearchAgentState
 from ai.research_agent.sources.sep import query_sep
 from ai.research_agent.sources.vector_db import query_vector_db
 from dbs.Qdrant import Qdrant
+from telemetry.tracing import propagate, annotate
 
 
+def _query_text(query) -> str:
+    """The search text of a vector DB (query + filters dict) or SEP (plain string) query."""
+
+    return query.get("query", "") if isinstance(query, dict) else str(query)
+
+def _rerank(results: list[QueryResult], reranker: Reranker, conversation, evidence_store: EvidenceStore,
+            all_results: set) -> list[QueryResult]:
+    """Score new results against their query and the user's last message, drop those below the reranker's threshold
+    and sort the rest, most relevant first.
+
+    Only this iteration's results are reordered, so evidence from earlier iterations keeps its place in the prompt. A
+    query whose results were all dropped leaves a note so the planner knows to rewrite it.
+    """
+
+    last_message = conversation[-1].content if conversation else ""
+    scored = [r for r in results if type(r["result"]) == tuple]
+    scores = reranker.score([
+        (f"{_query_text(r['query'])}\n{last_message}", evidence_store.get(r["result"][0])) for r in scored
+    ])
+
+    kept, dropped_queries = [], []
+    for result, score in zip(scored, scores):
+        result["rerank_score"] = score
+        if score >= reranker.threshold:
+            kept.append(result)
+        else:
+            all_results.discard(result["result"][0])
+            dropped_queries.append(result["query"])
+    kept.sort(key=lambda r: r["rerank_score"], reverse=True)
+    annotate(reranked=len(scored), rerank_dropped=len(scored) - len(kept))
+
+    # Queries with no surviving results
+    notes = []
+    for query in dropped_queries:
+        if query in [r["query"] for r in kept] or query in [n["query"] for n in notes]:
+            continue
+        notes.append({
+            "id": int(uuid.uuid4()),
+            "query": query,
+            "source": next(r["source"] for r in scored if r["query"] == query),
+            "result": "[All Results Omitted, Below Relevance Threshold]"
+        })
+
+    return kept + [r for r in results if type(r["result"]) != tuple] + notes
+
+def _expand_context(expand_ids: list, query_results: list[QueryResult], qdrant: Qdrant,
+                    evidence_store: EvidenceStore, all_results: set) -> list[QueryResult]:
+    """Fetch the chunks around the requested vector DB results in one DB round trip and add them as new results.
+
+    Neighbours that were already retrieved are left out, and the ones fetched here count as retrieved from now on.
+    """
+
+    expand_ids = {str(i) for i in expand_ids}
+    targets = [
+        r for r in query_results
+        if str(r["id"]) in expand_ids and type(r["result"]) == tuple and r.get("chunk_index") is not None
+    ]
+    if not targets:
+        return []
+
+    hits = [
+        (r["result"][1]["authors"][0], r["result"][1]["title"], r["result"][1]["section"], r["chunk_index"])
+        for r in targets
+    ]
+    try:
+        expanded = qdrant.expand_context(hits)
+    except Exception as e:
+        print(f"\r\033[k::context expansion failed: {e}")
+        return []
+
+    results = []
+    for target, (before, after) in zip(targets, expanded):
+        before = [text for text in before if evidence_store.digest(text) not in all_results]
+        after = [text for text in after if evidence_store.digest(text) not in all_results]
+        if not before and not after:
+            continue
+
+        text = "\n".join([*before, f"[... result {target['id']} ...]", *after])
+        digest = evidence_store.put(text)
+        all_results.update(evidence_store.digest(chunk) for chunk in before + after)
+        all_results.add(digest)
+        results.append({
+            "id": int(uuid.uuid4()),
+            "query": f"[Context around result {target['id']}]",
+            "source": target["source"],
+            "result": (digest, target["result"][1])
+        })
+    return results
+
 def execute_queries(state: ResearchAgentState, qdrant: Qdrant, status: Status | None):
     """Query the vector database with the queries and filters from the graph state. Set resources to old resources +
     new ones."""
 
     # Extract graph state variables
     vector_db_queries = state.get("vector_db_queries", None)
+    context_expansions = state.get("context_expansions", None)
     sep_queries = state.get("sep_queries", None)
     query_results = state.get("query_results", [])
     conversation = state.get("conversation", [])
     all_results = state.get("all_raw_results", set())
+    evidence_store = get_evidence_store(state["evidence_store"])
 
     # Deduplicate
     if vector_db_queries:
@@ -46,26 +141,48 @@ def execute_queries(state: ResearchAgentState, qdrant: Qdrant, status: Status |
                 query_results.append(query_result)
 
     # Run vector DB and SEP queries concurrently (only if present)
-    with ThreadPoolExecutor(max_workers=2) as executor:
+    new_results = []
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
         futures = []
         if vector_db_queries:
-            futures.append(executor.submit(query_vector_db, vector_db_queries, qdrant))
+            futures.append(executor.submit(propagate(query_vector_db), vector_db_queries, qdrant))
         if sep_queries:
-            futures.append(executor.submit(query_sep, sep_queries, conversation))
+            futures.append(executor.submit(propagate(query_sep), sep_queries, conversation))
 
         for future in futures:
             try:
-                results = future.result() or []
+                results = wait_cancellable(future) or []
+            except RunCancelled:
+                raise
             except Exception:
                 results = []
             for result in results:
                 raw_result = result.get("result")
+
+                # Move result texts into the evidence store; the state keeps only their digests
                 if type(raw_result) == tuple:
-                    raw_result = raw_result[0]
+                    text, citation = raw_result
+                    raw_result = evidence_store.put(text)
+                    result["result"] = (raw_result, citation)
+
                 if raw_result in all_results:
                     result["result"] = "[Duplicate Result Omitted, Already Retrieved In Previous Queries]"
                 else:
                     all_results.add(raw_result)
-                query_results.append(result)
+                new_results.append(result)
+    finally:
+        # Don't wait on lookups a cancelled run has abandoned
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # Optional local reranking of this iteration's results (opt-in via COGITO_RERANKER=1)
+    reranker = get_reranker()
+    if reranker is not None and new_results:
+        new_results = _rerank(new_results, reranker, conversation, evidence_store, all_results)
+    query_results.extend(new_results)
+
+    # Neighbouring chunks of results the planner found truncated (a payload lookup, not a new search)
+    if context_expansions:
+        query_results.extend(_expand_context(context_expansions, query_results, qdrant, evidence_store, all_results))
 
     return {"query_results": query_results, "all_raw_results": all_results}
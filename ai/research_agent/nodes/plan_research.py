@@ -1,18 +1,26 @@
-import tiktoken
+import os
+
 from langchain_core.messages import SystemMessage, AIMessage
 from langchain_core.output_parsers import JsonOutputParser
 from rich.status import Status
 
+from ai.models.prompts import assemble_prompt
+from ai.models.tokens import TokenBudget
 from ai.models.util import safe_invoke, extract_content
-from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG
+from ai.research_agent.CancellationToken import remaining_time
+from ai.research_agent.EvidenceStore import get_evidence_store
+from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG, RESEARCH_AGENT_CACHE_CONFIG
 from ai.research_agent.schemas.ResearchAgentState import ResearchAgentState
 from ai.research_agent.schemas.ResearchEffort import ResearchEffort
 from ai.research_agent.sources.stringify import stringify_query_results
+from telemetry.tracing import annotate
 
 # --- Define constants ---
 MAX_ITERATIONS_DEEP = 7
 MAX_ITERATIONS_SIMPLE = 4
 MAX_TOKENS = 100000
+# Research ends early once less than this many seconds are left before the run's deadline (time to write the response)
+RESPONSE_RESERVE_SECONDS = float(os.getenv("COGITO_RESPONSE_RESERVE_SECONDS", "20"))
 
 SAMPLE_RESPONSE = \
 """
@@ -40,6 +48,9 @@ SAMPLE_RESPONSE = \
   "ids_to_remove": [  # optional field, list of IDs to remove from future consideration
     "id1",  # must be a string
     "id2"  # must be a string
+  ],
+  "expand_context": [  # optional field, list of IDs of Project Gutenberg results to fetch surrounding text for
+    "id3"  # must be a string
   ]
 }
 # To end research
@@ -48,7 +59,8 @@ SAMPLE_RESPONSE = \
     "short_term_plan": null,
     "vector_db_queries": null,
     "stanford_encyclopedia_queries": null,
-    "ids_to_remove": null
+    "ids_to_remove": null,
+    "expand_context": null
 }
 """
 
@@ -117,6 +129,8 @@ def plan_research(state: ResearchAgentState, status: Status | None):
     short_term_plan = state.get("short_term_plan", "No short term plan yet.")
     research_iterations = state.get("research_iterations", 1)
     research_effort = state.get("research_effort", None)
+    research_focus = state.get("research_focus", None)
+    evidence_store = get_evidence_store(state["evidence_store"])
 
     if research_effort == ResearchEffort.DEEP:
         max_iterations = MAX_ITERATIONS_DEEP
@@ -127,13 +141,20 @@ def plan_research(state: ResearchAgentState, status: Status | None):
     if research_iterations > max_iterations:
         return {"completed": True}
 
-    # Token limit check
-    encoding = tiktoken.get_encoding("cl100k_base")
-    tokens = encoding.encode(str([msg.content for msg in conversation]))
-    if len(tokens) >= MAX_TOKENS:
+    # Deadline check (the response still has to be written)
+    remaining = remaining_time()
+    if remaining is not None and remaining < RESPONSE_RESERVE_SECONDS:
+        annotate(deadline_stop=True)
+        return {"completed": True}
+
+    # Token limit check (conversation plus the evidence gathered so far)
+    budget = TokenBudget(MAX_TOKENS)
+    budget.add_messages(conversation)
+    budget.add_evidence(query_results, evidence_store)
+    if budget.exceeded:
         return {"completed": True}
 
-    # Construct prompt (system message and user message)
+    # Construct prompt (static instructions first so every iteration shares the same cached prefix)
     system_msg = SystemMessage(
         content=(
             "## YOUR ROLE\n"
@@ -141,10 +162,6 @@ def plan_research(state: ResearchAgentState, status: Status | None):
             "iterations plan + search queries, or stop research by returning null for all fields. You do not continue "
             "the conversation.\n\n"
 
-            f"## YOU ARE ON ITERATION #{research_iterations} (1-indexed):\n"
-            f"For this task, your hard limit is {max_iterations}, which will be your final iteration. If you finish "
-            f"early, ensure you have at least three successful and relevant queries unless nothing's working.\n\n"
-
             "## SOURCES\n"
             "1. **Project Gutenberg**: A vector db of primary source chunks from Project Gutenberg philosophy texts\n"
             "2. **SEP**: Stanford Encyclopedia articles for conceptual overviews\n\n"
@@ -177,12 +194,17 @@ def plan_research(state: ResearchAgentState, status: Status | None):
             
             "## HOW TO END RESEARCH:\n"
             "Set all fields, `long_term_plan`, `short_term_plan`, `stanford_encyclopedia_queries`, "
-            "`vector_db_queries`, and `ids_to_remove` to `null`\n\n"
+            "`vector_db_queries`, `ids_to_remove`, and `expand_context` to `null`\n\n"
             
             "## REMOVE UNNECESSARY RESOURCES\n"
             "If there are specific sources or chunks that are irrelevant or unhelpful from past research, you can "
             "include an `ids_to_remove` field with a list of their IDs to delete them from future consideration. "
             "Prune unnecessary sources as needed.\n\n"
+
+            "## EXPAND TRUNCATED RESULTS\n"
+            "If a relevant Project Gutenberg result is cut off mid-argument, list its ID in `expand_context` to fetch "
+            "the text immediately before and after it. This is much cheaper than a new query; prefer it over "
+            "re-querying for the rest of a passage you already have.\n\n"
             
             "## ADVICE:\n"
             "- If a user asks about previous research that you don't have, re-query for those sources.\n"
@@ -205,16 +227,27 @@ def plan_research(state: ResearchAgentState, status: Status | None):
             "you don't have access to any.\n\n"
         )
     )
+    previous_conversation_message = SystemMessage(content=(
+        "CONVERSATION HISTORY (for your context):\n```" + str(conversation) + "\n```\n^ Previous conversation.\n"
+    ))
     research_history_message = SystemMessage(content=(
+        f"PREVIOUS QUERIES + RESULTS:\n"
+        f"```\n{stringify_query_results(query_results, evidence_store)}\n```\n\n"
+    ))
+    # Research strands (see research_strands) only cover one part of the user's question
+    focus_block = (
+        "## YOUR RESEARCH FOCUS\n"
+        f"Other researchers are covering the rest of the user's question. Research ONLY this: \"{research_focus}\"\n\n"
+    ) if research_focus else ""
+    iteration_message = SystemMessage(content=(
+        f"{focus_block}"
+        f"## YOU ARE ON ITERATION #{research_iterations} (1-indexed):\n"
+        f"For this task, your hard limit is {max_iterations}, which will be your final iteration. If you finish "
+        f"early, ensure you have at least three successful and relevant queries unless nothing's working.\n\n"
         f"YOUR LONG TERM PLAN:\n"
         f"\"{long_term_plan}\"\n\n"
         f"YOUR SHORT TERM PLAN (PREVIOUS ITERATION):\n"
         f"\"{short_term_plan}\"\n\n"
-        f"PREVIOUS QUERIES + RESULTS:\n"
-        f"```\n{stringify_query_results(query_results)}\n```\n\n"
-    ))
-    previous_conversation_message = SystemMessage(content=(
-        "CONVERSATION HISTORY (for your context):\n```" + str(conversation) + "\n```\n^ Previous conversation.\n"
     ))
 
     # Invoke LLM with structured output and retry parsing on invalid JSON
@@ -226,13 +259,22 @@ def plan_research(state: ResearchAgentState, status: Status | None):
 
     while attempt < max_parse_attempts:
         try:
-            llm_output = safe_invoke(model, [previous_conversation_message, research_history_message, system_msg])
+            llm_output = safe_invoke(
+                model,
+                assemble_prompt(
+                    system_msg, [previous_conversation_message],
+                    evidence=research_history_message, volatile=iteration_message
+                ),
+                cache_config=RESEARCH_AGENT_CACHE_CONFIG.get("plan_research") if attempt == 0 else None,
+                validate=lambda r: isinstance(parser.parse(extract_content(r)), dict)
+            )
             content = extract_content(llm_output)
             result = parser.parse(content)
             break
         except Exception as e:
             print(f"Failed to parse research plan: {e}")
             attempt += 1
+            annotate(retries=1)
 
     # If parsing failed after retries, end gracefully
     if result is None:
@@ -244,13 +286,15 @@ def plan_research(state: ResearchAgentState, status: Status | None):
         _prune_research_results(state, ids_to_remove)
 
     # Check for research completion
-    long_term_plan, short_term_plan, vector_db_queries, sep_queries = (
+    long_term_plan, short_term_plan, vector_db_queries, sep_queries, context_expansions = (
         result.get("long_term_plan"),
         result.get("short_term_plan"),
         result.get("vector_db_queries"),
-        result.get("stanford_encyclopedia_queries")
+        result.get("stanford_encyclopedia_queries"),
+        result.get("expand_context")
     )
-    if not long_term_plan and not short_term_plan and not vector_db_queries and not sep_queries:
+    if not long_term_plan and not short_term_plan and not vector_db_queries and not sep_queries \
+            and not context_expansions:
         return {"completed": True}
 
     return {
@@ -258,5 +302,6 @@ def plan_research(state: ResearchAgentState, status: Status | None):
         "short_term_plan": short_term_plan,
         "vector_db_queries": vector_db_queries,
         "sep_queries": sep_queries,
+        "context_expansions": context_expansions or [],
         "research_iterations": research_iterations + 1,
     }
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from rich.status import Status
+
+from ai.research_agent.schemas.ResearchAgentState import ResearchAgentState
+from ai.research_agent.schemas.ResearchEffort import ResearchEffort
+from telemetry.tracing import propagate
+
+
+def _merge_strands(strand_states: list[ResearchAgentState]) -> list:
+    """Concatenate the strands' results, dropping evidence another strand already retrieved."""
+
+    merged = []
+    seen = set()
+    for strand_state in strand_states:
+        for result in strand_state.get("query_results", []):
+            if type(result.get("result")) == tuple:
+                digest, _ = result["result"]
+                if digest in seen:
+                    continue
+                seen.add(digest)
+            merged.append(result)
+    return merged
+
+def research_strands(state: ResearchAgentState, strand_graph, status: Status | None):
+    """Research each sub-question with its own bounded plan/execute loop, all strands running concurrently, and merge
+    the evidence for a single response.
+
+    Strands share the run's evidence store (and, through the agent, its DB clients, embedder and LLM response cache).
+    Each gets its own copy of the dedup set seeded from this run's, so concurrent strands never race on it; evidence
+    retrieved by more than one strand is dropped when merging. Each strand runs at SIMPLE effort, which caps its
+    iterations.
+    """
+
+    if status:
+        status.update("Researching each part of your question...")
+
+    # Extract graph state variables
+    sub_questions = state.get("sub_questions", [])
+    all_results = state.get("all_raw_results", set())
+
+    strand_inputs = [
+        {
+            "conversation": state["conversation"],
+            "evidence_store": state["evidence_store"],
+            "research_focus": sub_question,
+            "research_effort": ResearchEffort.SIMPLE,
+            "research_iterations": 1,
+            "long_term_plan": "No long term plan yet.",
+            "short_term_plan": "No short term plan yet.",
+            "completed": False,
+            "query_results": [],
+            "all_raw_results": set(all_results)
+        }
+        for sub_question in sub_questions
+    ]
+
+    with ThreadPoolExecutor(max_workers=len(strand_inputs), thread_name_prefix="cogito-strand") as executor:
+        strand_states = list(executor.map(propagate(strand_graph.invoke), strand_inputs))
+
+    all_results = set(all_results)
+    for strand_state in strand_states:
+        all_results |= strand_state.get("all_raw_results", set())
+
+    return {
+        "query_results": _merge_strands(strand_states),
+        "all_raw_results": all_results,
+        "research_iterations": max(s.get("research_iterations", 1) for s in strand_states),
+        "completed": True
+    }
@@ -0,0 +1,24 @@
+from rich.status import Status
+
+from ai.research_agent.schemas.ResearchAgentState import ResearchAgentState
+
+
+def store_answer_cache(state: ResearchAgentState, answer_cache, status: Status | None):
+    """Cache the answer to a first-turn question (see `check_answer_cache`) along with its citations."""
+
+    # Extract graph state variables
+    vector = state.get("question_embedding")
+    response = state.get("response", "")
+
+    if answer_cache is None or vector is None or not response:
+        return {}
+
+    try:
+        answer_cache.store(
+            vector, state["conversation"][0].content, response, state.get("research_effort"),
+            state.get("query_results", [])
+        )
+    except Exception as e:
+        print(f"Failed to store answer in cache: {e}")
+
+    return {}
@@ -1,12 +1,43 @@
-from langchain_core.messages import SystemMessage, AIMessage
+from langchain_core.messages import SystemMessage
 from rich.status import Status
 
+from ai.models.prompts import assemble_prompt
+from ai.models.tokens import TokenBudget
 from ai.models.util import extract_content, safe_invoke
-from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG
+from ai.research_agent.EvidenceStore import get_evidence_store
+from ai.research_agent.draft_validation import validate_draft
+from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG, RESEARCH_AGENT_CACHE_CONFIG, \
+    RESEARCH_AGENT_CASCADE_CONFIG
 from ai.research_agent.schemas.ResearchAgentState import ResearchAgentState
 from ai.research_agent.schemas.ResearchEffort import ResearchEffort
 from ai.research_agent.sources.stringify import stringify_query_results
+from telemetry.tracing import annotate
 
+# --- Define constants ---
+MAX_TOKENS = 100000
+
+
+def _draft_response(messages, query_results, research_effort) -> str | None:
+    """Try the cheaper draft model first (see RESEARCH_AGENT_CASCADE_CONFIG). Returns the draft if it passes
+    validation, or None if the answer should be escalated to the full model."""
+
+    cascade = RESEARCH_AGENT_CASCADE_CONFIG.get("write_response") or {}
+    if not cascade.get("enabled") or research_effort not in cascade.get("efforts", []):
+        return None
+    if not any(type(result.get("result")) == tuple for result in query_results):
+        return None
+
+    model = RESEARCH_AGENT_MODEL_CONFIG["write_response_draft"]
+    draft = extract_content(
+        safe_invoke(model, messages, cache_config=RESEARCH_AGENT_CACHE_CONFIG.get("write_response_draft"))
+    )
+    problems = validate_draft(draft, query_results, cascade)
+
+    annotate(
+        draft_problems=problems,
+        metrics={"cogito_cascade_drafts_total": 1, "cogito_cascade_escalations_total": 1 if problems else 0}
+    )
+    return None if problems else draft
 
 def write_response(state: ResearchAgentState, status: Status | None):
     """Compose the assistant's final answer by synthesizing conversation context and gathered research, using quoted
@@ -16,11 +47,20 @@ def write_response(state: ResearchAgentState, status: Status | None):
         status.update("Crafting my response...")
 
     # Extract graph state variables
-    query_results = state.get("query_results", "No research resources collected yet.")
+    query_results = state.get("query_results", [])
     conversation = state.get("conversation", [])
     research_effort = state.get("research_effort", None)
+    evidence_store = get_evidence_store(state["evidence_store"])
+
+    # Keep the prompt within budget, dropping the latest evidence first if it doesn't all fit
+    budget = TokenBudget(MAX_TOKENS)
+    budget.add_messages(conversation)
+    fitted_results = budget.fit_evidence(query_results, evidence_store)
+    if len(fitted_results) < len(query_results):
+        annotate(evidence_dropped=len(query_results) - len(fitted_results))
+    query_results = fitted_results
 
-    # Construct prompt (system message and user message)
+    # Construct prompt (static instructions first so they're served from the provider's prompt cache)
     system_msg_research = SystemMessage(content=(
         "## YOUR ROLE\n"
         "You are Cogito, a conversational AI research agent for philosophy. Your job is to respond to the user's "
@@ -103,19 +143,29 @@ def write_response(state: ResearchAgentState, status: Status | None):
         "- NEVER, EVER make up quotes, citations, or references. NEVER reference sources you don't have. THIS IS THE MOST "
         "CRITICAL INSTRUCTION TO FOLLOW. NEVER FABRICATE INFORMATION OR REFERENCE SOURCES YOU DON'T HAVE.\n"
     ))
-    research_history_message = AIMessage(content=(
+    research_history_message = SystemMessage(content=(
         "## RESEARCH RESULTS:\n"
-        f"```\n{stringify_query_results(query_results)}\n```\n\n"
+        f"```\n{stringify_query_results(query_results, evidence_store)}\n```\n\n"
     ))
 
     # Invoke LLM depending on complexity and extract output
     system_msg = system_msg_research if query_results else system_msg_no_research
     if research_effort == ResearchEffort.DEEP or research_effort == ResearchEffort.SIMPLE:
+        messages = assemble_prompt(system_msg, conversation, evidence=research_history_message)
+
+        # SIMPLE answers are drafted by a smaller model and only escalated if the draft fails validation
+        text = _draft_response(messages, query_results, research_effort)
+        if text is not None:
+            return {"response": text}
+
         model = RESEARCH_AGENT_MODEL_CONFIG["write_response_research"]
-        result = safe_invoke(model, [*conversation, research_history_message, system_msg])
+        result = safe_invoke(model, messages, cache_config=RESEARCH_AGENT_CACHE_CONFIG.get("write_response_research"))
     else:
         model = RESEARCH_AGENT_MODEL_CONFIG["write_response_no_research"]
-        result = safe_invoke(model, [*conversation, system_msg])
+        result = safe_invoke(
+            model, assemble_prompt(system_msg, conversation),
+            cache_config=RESEARCH_AGENT_CACHE_CONFIG.get("write_response_no_research")
+        )
     text = extract_content(result)
 
     return {"response": text}
@@ -1,13 +1,20 @@
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 from ai.research_agent.schemas.Citation import Citation
 from dbs.QueryAndFilterSchemas import QueryAndFilters
 
 
 class QueryResult(TypedDict):
-    """Schema for a source query and its result."""
+    """Schema for a source query and its result.
+
+    Sources return `result` as a (text, citation) tuple; once in the graph state the text is replaced by its digest in
+    the run's `EvidenceStore`.
+    """
 
     id: int
     query: str | QueryAndFilters
     source: str
-    result: tuple[str, Citation] | str | None
\ No newline at end of file
+    result: tuple[str, Citation] | str | None
+    score: NotRequired[float]               # Similarity score (vector DB results only)
+    rerank_score: NotRequired[float]        # Cross-encoder relevance in [0, 1] (only when reranking is on)
+    chunk_index: NotRequired[int]           # Position of a vector DB chunk in its book (for context expansion)
@@ -10,6 +10,8 @@ class ResearchAgentState(TypedDict):
     """State schema for the Research Agent subgraph."""
 
     conversation: list[AnyMessage]          # Conversation object
+    conversation_summary: str | None        # Summary standing in for the conversation's earlier messages
+    summarized_messages: int                # Number of leading messages `conversation_summary` covers
 
     response: str                           # Final response generated
 
@@ -18,8 +20,14 @@ class ResearchAgentState(TypedDict):
     short_term_plan: str                    # Short term research plan for the current iteration
     vector_db_queries: list                 # Queries for vector db
     sep_queries: list                       # Queries for Stanford Encyclopedia of Philosophy
+    context_expansions: list                # IDs of vector DB results to fetch neighbouring chunks for
     completed: bool                         # If the query results were satisfactory
     research_effort: ResearchEffort         # If the user question is too broad for research
-
-    query_results: list[QueryResult]        # Result status per query
-    all_raw_results: set                    # Raw results collected so far (to avoid duplicates)
+    sub_questions: list[str]                # DEEP questions split into independently researched strands
+    research_focus: str                     # Sub-question a research strand is limited to
+    answer_cache_hit: bool                  # If the response was served from the answer cache
+    question_embedding: list[float] | None  # Embedding of a first-turn question, to cache its answer under
+
+    query_results: list[QueryResult]        # Result status per query (texts held as evidence digests)
+    all_raw_results: set                    # Evidence digests collected so far (to avoid duplicates)
+    evidence_store: str                     # Id of the run's EvidenceStore holding result texts
@@ -8,113 +8,200 @@ import aiohttp
 from bs4 import BeautifulSoup
 from langchain_core.messages import SystemMessage, AnyMessage
 
+from ai.models.prompts import assemble_prompt
 from ai.models.util import extract_content, safe_invoke
-from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG
+from ai.research_agent.CancellationToken import current_token
+from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG, RESEARCH_AGENT_CACHE_CONFIG
 from ai.research_agent.schemas.Citation import Citation
 from ai.research_agent.schemas.QueryResult import QueryResult
+from telemetry.tracing import span, propagate
 
+# Articles are parsed with lxml's C parser when it's installed (an order of magnitude faster than building a
+# BeautifulSoup tree), else with BeautifulSoup's pure-Python parser
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
 
-async def _search_sep_async(query, limit=1):
-    """Search SEP and return list of results (async)."""
-    url = "https://plato.stanford.edu/search/searcher.py"
-    params = {"query": query}
+HTML_PARSER = "lxml" if lxml_html is not None else "html.parser"
+
+
+async def _fetch_html(url, params=None):
+    """Fetch a SEP page and return its HTML (async). All SEP HTTP traffic goes through here."""
     headers = {"User-Agent": "Cogito Research Bot (wbc008@bucknell.edu)"}
 
     async with aiohttp.ClientSession() as session:
         async with session.get(url, params=params, headers=headers,
                                timeout=aiohttp.ClientTimeout(total=10)) as response:
-            text = await response.text()
-            soup = BeautifulSoup(text, "html.parser")
+            return await response.text()
 
-            results = []
-            i = 0
-            for result in soup.find_all("div", class_="result_listing"):
-                if i >= limit:
-                    break
-                i += 1
 
-                title_elem = result.find("div", class_="result_title")
-                snippet_elem = result.find("div", class_="result_snippet")
+async def _search_sep_async(query, limit=1):
+    """Search SEP and return list of results (async)."""
+    url = "https://plato.stanford.edu/search/searcher.py"
+    params = {"query": query}
+
+    text = await _fetch_html(url, params=params)
+    soup = BeautifulSoup(text, HTML_PARSER)
 
-                if title_elem and title_elem.find("a"):
-                    link = title_elem.find("a")["href"]
-                    title = title_elem.get_text(strip=True)
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+    results = []
+    i = 0
+    for result in soup.find_all("div", class_="result_listing"):
+        if i >= limit:
+            break
+        i += 1
 
-                    results.append({"title": title, "url": link, "snippet": snippet})
+        title_elem = result.find("div", class_="result_title")
+        snippet_elem = result.find("div", class_="result_snippet")
 
-            return results
+        if title_elem and title_elem.find("a"):
+            link = title_elem.find("a")["href"]
+            title = title_elem.get_text(strip=True)
+            snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+
+            results.append({"title": title, "url": link, "snippet": snippet})
+
+    return results
 
 
 async def _extract_sections_async(url):
-    """Extract all sections from a SEP article with their headers and content (async)."""
-    headers = {"User-Agent": "Cogito Research Bot (wbc008@bucknell.edu)"}
+    """Extract all sections from a SEP article with their headers and content (async).
+
+    Parsing runs in a worker thread so large articles don't stall other fetches on the event loop.
+    """
+
+    text = await _fetch_html(url)
+    return await asyncio.to_thread(propagate(_parse_sections), text)
+
+
+def _slice_article(html: str) -> tuple[str, str]:
+    """Cut an article down to its <head> (citation metadata) and its `main-text` div, the only parts that are parsed.
+
+    The main text is followed by the bibliography, academic tools and site chrome, which make up much of the page.
+    """
+
+    head_end = html.find("</head>")
+    head = html[:head_end + len("</head>")] if head_end != -1 else ""
+
+    start = html.find('id="main-text"')
+    if start == -1:
+        return head, ""
+    start = html.rfind("<", 0, start)
+
+    end = html.find('id="bibliography"', start)
+    end = html.rfind("<", start, end) if end != -1 else len(html)
+
+    return head, html[start:end]
+
+
+def _parse_sections(html: str):
+    """Parse an article's HTML into its sections and citation metadata (sync, CPU-bound)."""
+
+    with span("sep", "parse_sections", bytes=len(html)):
+        return _parse_sections_untraced(html)
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
-            text = await response.text()
-            soup = BeautifulSoup(text, "html.parser")
-
-            # Extract citation metadata
-            citation: Citation = {"title": "", "authors": [], "source": ""}
-            title_meta = soup.find("meta", property="citation_title")
-            if title_meta:
-                citation["title"] = title_meta.get("content", "")
-
-            authors = []
-            author_metas = soup.find_all("meta", property="citation_author")
-            for author_meta in author_metas:
-                authors.append(author_meta.get("content", ""))
-            citation["authors"] = authors
-
-            date_meta = soup.find("meta", property="citation_publication_date")
-            if date_meta:
-                citation["source"] = "Stanford Encyclopedia of Philosophy - " + date_meta.get("content", "")
-
-            # Extract sections
-            main_content = soup.find("div", id="main-text")
-            if not main_content:
-                return [], citation
-
-            sections = []
-            current_section = None
-            current_level = 0
-
-            # Get all children of main-text in order
-            for elem in main_content.children:
-                # Skip non-tag elements (like NavigableString)
-                if not hasattr(elem, "name"):
-                    continue
-
-                if elem.name in ["h1", "h2", "h3", "h4", "h5", "h6"]:
-                    elem_level = int(elem.name[1])
-
-                    # Only start a new section if this header is same level or higher than current section
-                    if current_section is None or elem_level <= current_level:
-                        # Save previous section if it exists
-                        if current_section:
-                            sections.append(current_section)
-
-                        # Start new section
-                        current_section = {"header": elem.get_text(strip=True), "level": elem.name, "content": []}
-                        current_level = elem_level
-                    else:
-                        # This is a sub-header, add it as formatted content
-                        sub_header_text = f"### {elem.get_text(strip=True)}"
-                        current_section["content"].append(sub_header_text)
-
-                elif current_section is not None:
-                    # Add any non-header element's text to current section
-                    text = elem.get_text(strip=True)
-                    if text:
-                        current_section["content"].append(text)
-
-            # Add the last section
-            if current_section:
-                sections.append(current_section)
-
-            return sections, citation
 
+def _article_elements(head: str, main_text: str, parser: str = None) -> tuple[dict[str, list[str]], list[tuple[str, str]]]:
+    """Citation meta tags (property -> contents) and the (tag, text) of each child element of `main-text`."""
+
+    metas: dict[str, list[str]] = {}
+    parser = parser or HTML_PARSER
+
+    if parser == "lxml":
+        if head:
+            for meta in lxml_html.fromstring(head).iter("meta"):
+                if meta.get("property"):
+                    metas.setdefault(meta.get("property"), []).append(meta.get("content", ""))
+
+        root = lxml_html.fromstring(main_text) if main_text else None
+        if root is not None and root.get("id") != "main-text":
+            root = root.find('.//div[@id="main-text"]')
+        if root is None:
+            return metas, []
+
+        # Scripts and stylesheets are emptied (their tails stay separate text nodes, as in BeautifulSoup's tree)
+        for elem in root.iter("script", "style"):
+            elem.text = None
+            del elem[:]
+
+        # Same text as BeautifulSoup's get_text(strip=True): every text node stripped, then joined
+        elements = [(elem.tag, "".join(t.strip() for t in elem.itertext())) for elem in root if isinstance(elem.tag, str)]
+        return metas, elements
+
+    for meta in BeautifulSoup(head, "html.parser").find_all("meta", property=True):
+        metas.setdefault(meta["property"], []).append(meta.get("content", ""))
+
+    main_content = BeautifulSoup(main_text, "html.parser").find("div", id="main-text") if main_text else None
+    if not main_content:
+        return metas, []
+
+    for elem in main_content.find_all(["script", "style"]):
+        elem.decompose()
+
+    # Skip non-tag elements (like NavigableString)
+    elements = [(elem.name, elem.get_text(strip=True)) for elem in main_content.children if hasattr(elem, "name")]
+    return metas, elements
+
+
+def _parse_sections_untraced(html: str, parser: str = None):
+    """Untraced implementation of `_parse_sections`. `parser` overrides HTML_PARSER (for benchmarking)."""
+
+    head, main_text = _slice_article(html)
+    metas, elements = _article_elements(head, main_text, parser)
+
+    # Extract citation metadata
+    citation: Citation = {"title": "", "authors": [], "source": ""}
+    if metas.get("citation_title"):
+        citation["title"] = metas["citation_title"][0]
+
+    citation["authors"] = metas.get("citation_author", [])
+
+    if metas.get("citation_publication_date"):
+        citation["source"] = "Stanford Encyclopedia of Philosophy - " + metas["citation_publication_date"][0]
+
+    # Extract sections
+    if not elements:
+        return [], citation
+
+    sections = []
+    current_section = None
+    current_level = 0
+
+    # Walk the children of main-text in order
+    for name, text in elements:
+        if name in ["h1", "h2", "h3", "h4", "h5", "h6"]:
+            elem_level = int(name[1])
+
+            # Only start a new section if this header is same level or higher than current section
+            if current_section is None or elem_level <= current_level:
+                # Save previous section if it exists
+                if current_section:
+                    sections.append(current_section)
+
+                # Start new section
+                current_section = {"header": text, "level": name, "content": []}
+                current_level = elem_level
+            else:
+                # This is a sub-header, add it as formatted content
+                sub_header_text = f"### {text}"
+                current_section["content"].append(sub_header_text)
+
+        elif current_section is not None:
+            # Add any non-header element's text to current section
+            if text:
+                current_section["content"].append(text)
+
+    # Add the last section
+    if current_section:
+        sections.append(current_section)
+
+    return sections, citation
+
+
+def _parse_identifiers(content: str):
+    """Parse the section selector's JSON answer (markdown code fences are removed first)."""
+
+    return json.loads(content.replace("```json", "").replace("```", "").strip())
 
 def _select_relevant_sections(sections, conversation, article_title):
     """Use LLM to determine which sections are relevant to the user's query."""
@@ -131,10 +218,7 @@ def _select_relevant_sections(sections, conversation, article_title):
         section_headers.append(f"{section_id}. {header}")
 
     system_msg = SystemMessage(content=(
-        "Determine which sections are most relevant to the user's last message:\n"
-        
-        f"Article Title: {article_title}\n"
-        f"Section Headers:\n" + f"{chr(10).join(section_headers)}\n\n"
+        "Determine which sections of the article below are most relevant to the user's last message.\n\n"
         "Respond with ONLY an array of section identifiers as strings that are relevant. Only include at "
         "most 5 section identifiers. Do NOT include any other text and DO NOT make any tool calls.\n\n"
         "This exact format: `[\"1\", \"2.1\", \"3.4\"]`. Nothing other than the brackets and section identifiers in between them.\n"
@@ -143,16 +227,22 @@ def _select_relevant_sections(sections, conversation, article_title):
         "Here is the conversation so far (most recent messages last):\n\n"
         f"{''.join([f'- {msg.content}\n' for msg in conversation[-5:]])}\n"
     ))
+    article_message = SystemMessage(content=(
+        f"Article Title: {article_title}\n"
+        f"Section Headers:\n" + f"{chr(10).join(section_headers)}\n"
+    ))
 
     try:
         model = RESEARCH_AGENT_MODEL_CONFIG.get("extract_text")
-        content = extract_content(safe_invoke(model, [conversation_context_message, system_msg]))
-
-        # Try to extract JSON from the response
-        # Remove markdown code blocks if present
-        content = content.replace("```json", "").replace("```", "").strip()
+        cache_config = RESEARCH_AGENT_CACHE_CONFIG.get("extract_text")
+        content = extract_content(
+            safe_invoke(
+                model, assemble_prompt(system_msg, [conversation_context_message], evidence=article_message),
+                cache_config=cache_config, validate=lambda r: isinstance(_parse_identifiers(extract_content(r)), list)
+            )
+        )
 
-        relevant_identifiers = json.loads(content)
+        relevant_identifiers = _parse_identifiers(content)
 
         # Match identifiers to sections
         relevant_sections = []
@@ -199,7 +289,7 @@ async def _process_article_async(result, conversation):
     loop = asyncio.get_event_loop()
     relevant_sections = await loop.run_in_executor(
         None,
-        _select_relevant_sections,
+        propagate(_select_relevant_sections),
         sections,
         conversation,
         result["title"]
@@ -212,9 +302,8 @@ async def _process_article_async(result, conversation):
     tuples = []
     for section in relevant_sections:
         section_text = _format_section_text(section)
-        # Add section header to citation
-        base_citation["section"] = section["header"]
-        tuples.append((section_text, base_citation))
+        # Add section header to citation (a copy per section, they'd otherwise all share the last header)
+        tuples.append((section_text, {**base_citation, "section": section["header"]}))
 
     return tuples
 
@@ -275,4 +364,9 @@ def query_sep(queries: list[str], conversation: list[AnyMessage]) -> list[QueryR
     This is a synchronous wrapper around the async implementation.
     """
 
-    return asyncio.run(_query_sep_async(queries, conversation))
\ No newline at end of file
+    with span("sep", "query_sep", batch_size=len(queries)):
+        # Cancelling the run cancels the outstanding requests
+        token = current_token()
+        if token is not None:
+            return asyncio.run(token.guard(_query_sep_async(queries, conversation)))
+        return asyncio.run(_query_sep_async(queries, conversation))
\ No newline at end of file
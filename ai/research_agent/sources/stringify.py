@@ -1,15 +1,27 @@
 import json
 
+from ai.research_agent.EvidenceStore import EvidenceStore
 from ai.research_agent.schemas.QueryResult import QueryResult
 
+# Bookkeeping fields that are never shown to models
+HIDDEN_FIELDS = ("score", "rerank_score", "chunk_index")
 
-def stringify_query_results(query_results: list[QueryResult]) -> str:
-    """Convert a list of QueryResult objects into a formatted string."""
+def stringify_query_result(result: QueryResult, evidence_store: EvidenceStore) -> str:
+    """Format a single QueryResult the way it appears in prompts, resolving its evidence digest to text."""
+
+    result = {k: v for k, v in result.items() if k not in HIDDEN_FIELDS}
+    if type(result["result"]) == tuple:
+        digest, citation = result["result"]
+        result["result"] = (evidence_store.get(digest), citation)
+    return "```\n" + json.dumps(result, indent=4) + "\n```\n\n"
+
+def stringify_query_results(query_results: list[QueryResult], evidence_store: EvidenceStore) -> str:
+    """Convert a list of QueryResult objects into a formatted string, resolving evidence digests to their text."""
 
     output = ""
 
     if query_results:
         for result in query_results:
-            output += "```\n" + json.dumps(result, indent=4) + "\n```\n\n"
+            output += stringify_query_result(result, evidence_store)
 
     return output
@@ -0,0 +1,80 @@
+"""Micro-benchmark of embedding backends on planner-sized batches.
+
+The planner sends 1-3 queries per iteration, so what matters is per-call latency at tiny batch sizes, not bulk
+throughput. For each backend and batch size this times `--calls` `embed_batch` calls on questions from the benchmark
+corpus (after a warm-up call) and reports latency percentiles and texts per second.
+
+Usage (from the repo root):
+    python -m bench.embed_bench                        # openai vs. local
+    python -m bench.embed_bench --backends local --calls 200
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+
+
+def bench_backend(embedder, questions: list[str], batch_sizes: list[int], calls: int) -> dict:
+    """Time `calls` embed_batch calls per batch size."""
+
+    # First call pays connection setup / model load paths that don't recur
+    embedder.embed_batch(questions[:1])
+
+    report = {"dimensions": embedder.dimensions, "batches": {}}
+    for size in batch_sizes:
+        latencies = []
+        for _ in range(calls):
+            batch = random.sample(questions, size)
+            start = time.perf_counter()
+            embedder.embed_batch(batch)
+            latencies.append(time.perf_counter() - start)
+
+        latencies.sort()
+        report["batches"][str(size)] = {
+            "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+            "p95_ms": round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000, 2),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+            "texts_per_s": round(size * len(latencies) / sum(latencies), 1)
+        }
+    return report
+
+def main():
+    """Run the benchmark."""
+
+    args = _parse_args()
+
+    from embed.embedders import get_embedder
+
+    questions = [q["question"] for q in json.loads(args.questions.read_text(encoding="utf-8"))]
+
+    results = {}
+    for backend in args.backends:
+        try:
+            embedder = get_embedder(backend)
+        except Exception as e:
+            print(f"::Skipping {backend}: {e}", file=sys.stderr)
+            continue
+        results[backend] = bench_backend(embedder, questions, args.batch_sizes, args.calls)
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+def _parse_args():
+    """Parse command-line arguments."""
+
+    parser = argparse.ArgumentParser(description="Embedding backend latency micro-benchmark")
+    parser.add_argument("--backends", nargs="+", default=["openai", "local"])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--calls", type=int, default=50, help="timed calls per batch size")
+    parser.add_argument("--questions", type=Path, default=BENCH_DIR / "questions.json")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
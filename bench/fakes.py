@@ -0,0 +1,202 @@
+"""Synthetic local backends (LLM, embeddings, Qdrant, Postgres filters) with configurable latency.
+
+Unlike the record/replay fixtures in `bench/fixtures.py`, these need no recordings: every call returns a plausible
+synthetic answer after sleeping for a fixed latency. They're meant for load testing the servicer, where what matters is
+how long each backend holds a worker, not what it says.
+"""
+
+import json
+import os
+import random
+import time
+
+from langchain_core.messages import AIMessage
+from qdrant_client.http.models import QueryResponse, ScoredPoint
+
+from ai.research_agent.ResearchAgent import ResearchAgent
+from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG
+from dbs.Qdrant import Qdrant
+
+# Providers cache prompt prefixes of at least 1024 tokens, in 128-token blocks
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_BLOCK_TOKENS = 128
+
+FAKE_AUTHOR_SOURCES = {
+    "Immanuel Kant": ["Fundamental Principles of the Metaphysic of Morals", "The Critique of Pure Reason"],
+    "David Hume": ["An Enquiry Concerning Human Understanding", "A Treatise of Human Nature"],
+    "Plato": ["The Republic", "Phaedo"]
+}
+
+
+class FakeChatModel:
+    """Chat model stand-in that recognizes which node is calling it and answers in the expected format."""
+
+    # --- Methods ---
+    def __init__(self, role: str, latency: float):
+        """Initialize with the RESEARCH_AGENT_MODEL_CONFIG role it replaces."""
+
+        self.role = role
+        self.model_name = f"fake-{role}"
+        self.latency = latency
+        self._previous_prompt = ""
+
+    def bind_tools(self, tools, **kwargs):
+        """Tool binding is a no-op."""
+
+        return self
+
+    def invoke(self, messages):
+        """Sleep for the configured latency and return a synthetic answer."""
+
+        time.sleep(self.latency)
+        prompt = "\n".join(str(m.content) for m in messages)
+
+        if "router agent" in prompt:
+            content = "1"
+        elif "question decomposer" in prompt:
+            content = json.dumps(["What is Kant's account of duty?", "What is Hume's account of moral motivation?"])
+        elif "PLANNER NODE" in prompt:
+            # One round of research, then stop
+            if "ITERATION #1 (" in prompt:
+                content = json.dumps({
+                    "long_term_plan": "Search primary sources, then stop.",
+                    "short_term_plan": "Searching primary sources...",
+                    "vector_db_queries": [{"query": "the nature of duty", "filters": None}],
+                    "stanford_encyclopedia_queries": None,
+                    "ids_to_remove": None
+                })
+            else:
+                content = json.dumps({
+                    "long_term_plan": None, "short_term_plan": None, "vector_db_queries": None,
+                    "stanford_encyclopedia_queries": None, "ids_to_remove": None
+                })
+        elif "Section Headers" in prompt:
+            content = '["1"]'
+        else:
+            content = ("Duty, for Kant, is the necessity of an action done out of respect for the law "
+                       "(Project Gutenberg, Immanuel Kant, Fundamental Principles of the Metaphysic of Morals, "
+                       "First Section).\n\n## References\n- Project Gutenberg, Immanuel Kant, Fundamental Principles of "
+                       "the Metaphysic of Morals, First Section")
+
+        input_tokens = len(prompt) // 4
+        output_tokens = len(content) // 4
+        cached_tokens = self._cached_prefix_tokens(prompt)
+        return AIMessage(content=content, usage_metadata={
+            "input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens,
+            "input_token_details": {"cache_read": cached_tokens}
+        })
+
+    def _cached_prefix_tokens(self, prompt: str) -> int:
+        """Tokens a provider's prefix cache would serve, given the previous prompt sent to this model."""
+
+        shared = len(os.path.commonprefix([prompt, self._previous_prompt])) // 4
+        self._previous_prompt = prompt
+        if shared < PROMPT_CACHE_MIN_TOKENS:
+            return 0
+        return shared - shared % PROMPT_CACHE_BLOCK_TOKENS
+
+
+class FakeEmbedder:
+    """Embedder stand-in returning random unit-ish vectors."""
+
+    name = "fake"
+    collection_suffix = ""
+
+    # --- Methods ---
+    def __init__(self, latency: float, dimensions: int = 1536):
+        """Initialize with a per-call latency."""
+
+        self.latency = latency
+        self.dimensions = dimensions
+
+    def embed_batch(self, texts: list[str]):
+        """Sleep, then return one random vector per text."""
+
+        time.sleep(self.latency)
+        return [[random.random() for _ in range(self.dimensions)] for _ in texts]
+
+
+class FakeQdrantClient:
+    """QdrantClient stand-in returning one synthetic chunk per request."""
+
+    # --- Methods ---
+    def __init__(self, latency: float):
+        """Initialize with a per-batch latency."""
+
+        self.latency = latency
+
+    def query_batch_points(self, collection_name, requests, **kwargs):
+        """Sleep, then return a synthetic hit for every request."""
+
+        time.sleep(self.latency)
+        author = random.choice(list(FAKE_AUTHOR_SOURCES))
+        return [
+            QueryResponse(points=[ScoredPoint(
+                id=random.randint(1, 2 ** 63), version=0, score=random.uniform(0.3, 0.9),
+                payload={
+                    "text": "Nothing can possibly be conceived in the world which can be called good without "
+                            "qualification, except a good will. " * 20,
+                    "author": author,
+                    "title": FAKE_AUTHOR_SOURCES[author][0],
+                    "section": "First Section"
+                }
+            )])
+            for _ in requests
+        ]
+
+    def close(self):
+        """Nothing to close."""
+
+
+class FakePostgresFilters:
+    """Postgres filters stand-in with a fixed author -> sources map."""
+
+    # --- Methods ---
+    def __init__(self):
+        """Initialize the filter map."""
+
+        self.author_sources = FAKE_AUTHOR_SOURCES
+
+    @property
+    def all_sources(self) -> list[str]:
+        """List of all unique sources."""
+
+        return sorted({s for sources in self.author_sources.values() for s in sources})
+
+    def close(self):
+        """Nothing to close."""
+
+
+class FakeQdrant(Qdrant):
+    """`dbs.Qdrant` wired to the fake client, embedder and filters (its own query logic still runs)."""
+
+    # --- Methods ---
+    def __init__(self, embed_latency: float, qdrant_latency: float):
+        """Build the fake providers."""
+
+        self.collection = "fake"
+        self.client = FakeQdrantClient(qdrant_latency)
+        self.postgres_client = FakePostgresFilters()
+        self.embedder = FakeEmbedder(embed_latency)
+
+
+def install_fake_models(llm_latency: float):
+    """Replace every configured chat model with a fake."""
+
+    for role, model in list(RESEARCH_AGENT_MODEL_CONFIG.items()):
+        if not isinstance(model, FakeChatModel):
+            RESEARCH_AGENT_MODEL_CONFIG[role] = FakeChatModel(role, llm_latency)
+
+
+def build_fake_agent(llm_latency: float = 0.5, embed_latency: float = 0.1, qdrant_latency: float = 0.02) -> ResearchAgent:
+    """Agent factory wired entirely to fake backends (module-level so it can be used as a process-pool initializer)."""
+
+    # Repeated benchmark questions must run the whole pipeline
+    os.environ["COGITO_ANSWER_CACHE"] = "0"
+
+    install_fake_models(llm_latency)
+    qdrant = FakeQdrant(embed_latency, qdrant_latency)
+
+    agent = ResearchAgent(qdrant=qdrant, postgres_filters=qdrant.postgres_client)
+    agent.build()
+    return agent
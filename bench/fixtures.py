@@ -0,0 +1,309 @@
+"""Record/replay stand-ins for every external provider the Research Agent talks to.
+
+In `record` mode each stand-in wraps the real provider, forwards the call and stores the response (and how long it
+took) in a JSON fixture file. In `replay` mode the stand-ins answer from those files without touching the network, so a
+benchmark run is offline and deterministic. Calls are keyed on a hash of their normalized inputs; random ids (query
+result ids, uuids) are normalized away so a replayed run produces the same keys as the recorded one. Repeated identical
+calls (e.g. retry loops) replay their recorded responses in order.
+
+Covered providers:
+- Groq/OpenAI chat models (every entry in RESEARCH_AGENT_MODEL_CONFIG)
+- OpenAI embeddings (`Embedder.embed_batch`)
+- Qdrant (`QdrantClient.query_batch_points` and `QdrantClient.scroll`)
+- Postgres (the author -> sources filter map)
+- SEP HTTP (`sep._fetch_html`)
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+
+from langchain_core.messages import messages_to_dict, message_to_dict, messages_from_dict
+from qdrant_client.http.models import QueryResponse, Record
+
+from ai.research_agent.model_config import RESEARCH_AGENT_MODEL_CONFIG
+from ai.research_agent.sources import sep
+from dbs.Qdrant import Qdrant
+
+RECORD = "record"
+REPLAY = "replay"
+
+_ID_PATTERNS = [
+    (re.compile(r'"id": \d+'), '"id": 0'),
+    (re.compile(r"'id': \d+"), "'id': 0"),
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"), "00000000-0000-0000-0000-000000000000"),
+    (re.compile(r"\b\d{30,40}\b"), "0"),
+]
+
+
+class FixtureMissError(KeyError):
+    """Raised in replay mode when a call was never recorded."""
+
+
+class FixtureStore:
+    """One JSON fixture file of recorded calls for a single provider."""
+
+    # --- Methods ---
+    def __init__(self, path: Path, mode: str, latency_scale: float = 0.0):
+        """Load the fixture file (replay) or start an empty one (record)."""
+
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+
+        self._lock = threading.Lock()
+        self._calls: dict[str, list[dict]] = {}
+        self._cursor: dict[str, int] = {}
+
+        if mode == REPLAY:
+            if not path.exists():
+                raise FileNotFoundError(f"No fixtures at {path}. Record them first with `--mode record`.")
+            self._calls = json.loads(path.read_text(encoding="utf-8"))
+
+    @staticmethod
+    def key(payload) -> str:
+        """Stable hash of a call's inputs with random ids normalized away."""
+
+        text = json.dumps(payload, sort_keys=True, default=str)
+        for pattern, replacement in _ID_PATTERNS:
+            text = pattern.sub(replacement, text)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def call(self, payload, real_call):
+        """Replay the response for `payload`, or (record mode) make the real call and store it.
+
+        `real_call` returns a JSON-serializable response.
+        """
+
+        if self.mode == RECORD:
+            start = time.perf_counter()
+            response = real_call()
+            self._record(payload, response, time.perf_counter() - start)
+            return response
+
+        entry = self._replay(payload)
+        if self.latency_scale:
+            time.sleep(entry["latency"] * self.latency_scale)
+        return entry["response"]
+
+    async def call_async(self, payload, real_call):
+        """Async variant of `call`; `real_call` returns an awaitable."""
+
+        if self.mode == RECORD:
+            start = time.perf_counter()
+            response = await real_call()
+            self._record(payload, response, time.perf_counter() - start)
+            return response
+
+        entry = self._replay(payload)
+        if self.latency_scale:
+            await asyncio.sleep(entry["latency"] * self.latency_scale)
+        return entry["response"]
+
+    def _record(self, payload, response, latency: float):
+        """Store a recorded response."""
+
+        with self._lock:
+            self._calls.setdefault(self.key(payload), []).append({"response": response, "latency": latency})
+
+    def _replay(self, payload) -> dict:
+        """Return the next recorded entry for `payload`."""
+
+        key = self.key(payload)
+        with self._lock:
+            recorded = self._calls.get(key)
+            if not recorded:
+                raise FixtureMissError(f"{self.path.name}: no recording for call {key[:12]}. Re-record fixtures.")
+            cursor = self._cursor.get(key, 0)
+            self._cursor[key] = cursor + 1
+            return recorded[min(cursor, len(recorded) - 1)]
+
+    def reset(self):
+        """Rewind replay cursors (call between benchmark passes)."""
+
+        with self._lock:
+            self._cursor.clear()
+
+    def save(self):
+        """Write recorded calls to disk (record mode only)."""
+
+        if self.mode != RECORD:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.path.write_text(json.dumps(self._calls), encoding="utf-8")
+
+
+class RecordReplayChatModel:
+    """Stand-in for a LangChain chat model."""
+
+    # --- Methods ---
+    def __init__(self, role: str, real_model, store: FixtureStore):
+        """Wrap `real_model` (configured for `role` in RESEARCH_AGENT_MODEL_CONFIG)."""
+
+        self.role = role
+        self.real_model = real_model
+        self.store = store
+        self.model_name = getattr(real_model, "model_name", None) or role
+
+    def bind_tools(self, tools, **kwargs):
+        """Tool binding is a no-op; the real model is bound only when recording."""
+
+        return self
+
+    def invoke(self, messages):
+        """Replay (or record) a model call."""
+
+        payload = {"role": self.role, "model": self.model_name, "messages": messages_to_dict(messages)}
+
+        def real_call():
+            result = self.real_model.bind_tools([], tool_choice="none").invoke(messages)
+            return message_to_dict(result)
+
+        return messages_from_dict([self.store.call(payload, real_call)])[0]
+
+
+class RecordReplayEmbedder:
+    """Stand-in for `embed.Embedder`."""
+
+    # --- Methods ---
+    def __init__(self, store: FixtureStore, real_embedder=None):
+        """Wrap `real_embedder` (only needed when recording)."""
+
+        self.store = store
+        self.real_embedder = real_embedder
+
+    def embed_batch(self, texts: list[str]):
+        """Replay (or record) an embedding call."""
+
+        return self.store.call({"texts": texts}, lambda: self.real_embedder.embed_batch(texts))
+
+
+class RecordReplayQdrantClient:
+    """Stand-in for the `QdrantClient` methods the agent uses."""
+
+    # --- Methods ---
+    def __init__(self, store: FixtureStore, real_client=None):
+        """Wrap `real_client` (only needed when recording)."""
+
+        self.store = store
+        self.real_client = real_client
+
+    def query_batch_points(self, collection_name, requests, **kwargs):
+        """Replay (or record) a batch query."""
+
+        payload = {"requests": [r.model_dump(mode="json") for r in requests]}
+
+        def real_call():
+            responses = self.real_client.query_batch_points(collection_name=collection_name, requests=requests, **kwargs)
+            return [r.model_dump(mode="json") for r in responses]
+
+        return [QueryResponse.model_validate(r) for r in self.store.call(payload, real_call)]
+
+    def scroll(self, collection_name, scroll_filter=None, limit=10, offset=None, **kwargs):
+        """Replay (or record) a scroll (the payload lookups behind context expansion)."""
+
+        payload = {
+            "scroll": scroll_filter.model_dump(mode="json") if scroll_filter is not None else None,
+            "limit": limit,
+            "offset": offset,
+            "with_payload": kwargs.get("with_payload", True)
+        }
+
+        def real_call():
+            points, next_offset = self.real_client.scroll(
+                collection_name=collection_name, scroll_filter=scroll_filter, limit=limit, offset=offset, **kwargs
+            )
+            return {"points": [p.model_dump(mode="json") for p in points], "next_offset": next_offset}
+
+        response = self.store.call(payload, real_call)
+        return [Record.model_validate(p) for p in response["points"]], response["next_offset"]
+
+    def close(self):
+        """Close the real client if there is one."""
+
+        if self.real_client is not None:
+            self.real_client.close()
+
+
+class RecordReplayPostgres:
+    """Stand-in for `dbs.Postgres`: serves the author -> sources filter map from fixtures."""
+
+    # --- Methods ---
+    def __init__(self, store: FixtureStore, real_postgres=None):
+        """Load (or record) the filter map once."""
+
+        self.real_postgres = real_postgres
+        self.author_sources = store.call({"table": "filters"}, lambda: real_postgres.author_sources)
+
+    @property
+    def all_sources(self) -> list[str]:
+        """List of all unique sources."""
+
+        seen: set[str] = set()
+        for sources in self.author_sources.values():
+            seen.update(sources)
+        return sorted(seen)
+
+    def close(self):
+        """Close the real connection if there is one."""
+
+        if self.real_postgres is not None:
+            self.real_postgres.close()
+
+
+class RecordReplayQdrant(Qdrant):
+    """`dbs.Qdrant` with its client, embedder and filters replaced by record/replay stand-ins.
+
+    Only the providers are swapped, so `batch_query`'s own work (fuzzy filter matching, request building, result
+    conversion) still runs and is measured.
+    """
+
+    # --- Methods ---
+    def __init__(self, stores: dict[str, FixtureStore], mode: str):
+        """Build the stand-ins, wrapping real providers when recording."""
+
+        if mode == RECORD:
+            super().__init__()
+            self.client = RecordReplayQdrantClient(stores["qdrant"], self.client)
+            self.postgres_client = RecordReplayPostgres(stores["postgres"], self.postgres_client)
+            self.embedder = RecordReplayEmbedder(stores["embeddings"], self.embedder)
+        else:
+            self.collection = "replay"
+            self.client = RecordReplayQdrantClient(stores["qdrant"])
+            self.postgres_client = RecordReplayPostgres(stores["postgres"])
+            self.embedder = RecordReplayEmbedder(stores["embeddings"])
+
+
+def open_stores(fixtures_dir: Path, mode: str, latency_scale: float = 0.0) -> dict[str, FixtureStore]:
+    """Open one fixture store per provider."""
+
+    return {
+        name: FixtureStore(fixtures_dir / Path(f"{name}.json"), mode, latency_scale)
+        for name in ("llm", "embeddings", "qdrant", "postgres", "sep")
+    }
+
+def install_stand_ins(stores: dict[str, FixtureStore], mode: str) -> RecordReplayQdrant:
+    """Swap every chat model and SEP HTTP fetch for record/replay stand-ins and return a stand-in Qdrant.
+
+    Pass the returned Qdrant to `ResearchAgent(qdrant=..., postgres_filters=...)` together with
+    `qdrant.postgres_client`.
+    """
+
+    for role, model in list(RESEARCH_AGENT_MODEL_CONFIG.items()):
+        if not isinstance(model, RecordReplayChatModel):
+            RESEARCH_AGENT_MODEL_CONFIG[role] = RecordReplayChatModel(role, model, stores["llm"])
+
+    real_fetch_html = sep._fetch_html
+
+    async def fetch_html(url, params=None):
+        payload = {"url": url, "params": params}
+        return await stores["sep"].call_async(payload, lambda: real_fetch_html(url, params=params))
+
+    sep._fetch_html = fetch_html
+
+    return RecordReplayQdrant(stores, mode)
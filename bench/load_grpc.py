@@ -0,0 +1,336 @@
+"""gRPC load-test driver for the Cogito servicer.
+
+Seeds the `conversations` table with synthetic conversations, starts a Cogito server in-process wired to the fake
+LLM/embedding/Qdrant backends in `bench/fakes.py` (Postgres is real, configured through the usual COGITO_POSTGRES_*
+variables), then drives `Cogito.Complete` either closed-loop at a fixed concurrency or open-loop at a fixed Poisson
+arrival rate. Reports throughput, a latency histogram, error codes, and utilisation of the gRPC thread pool and the
+agent process pool, which shows where each saturates.
+
+Usage (from the repo root):
+    python -m bench.load_grpc --concurrency 8 --requests 200
+    python -m bench.load_grpc --rate 5 --duration 60 --llm-latency 0.8
+    python -m bench.load_grpc --target localhost:50051 --no-seed    # drive an already running server
+"""
+
+import argparse
+import functools
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import grpc
+from psycopg2.extras import execute_values
+
+from dbs.Postgres import Postgres
+
+# Synthetic conversations live under their own user ids so they never collide with real users
+LOADTEST_USER_BASE = 9_000_000
+
+CONVERSATIONS_VERSION_SQL = Path(__file__).parent.parent / "dbs" / "conversations_version.sql"
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+
+class UtilisationMonitor:
+    """Samples how busy the server's gRPC threads and agent worker processes are."""
+
+    # --- Methods ---
+    def __init__(self, max_threads: int, max_workers: int, interval: float = 0.1):
+        """Initialize with the sizes of the two pools being sampled."""
+
+        self.max_threads = max_threads
+        self.max_workers = max_workers
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._rpcs_in_flight = 0
+        self._tasks_in_flight = 0
+        self.samples: list[tuple[int, int]] = []
+        self._stopped = threading.Event()
+
+    def instrument_servicer_class(self, servicer_class):
+        """Count in-flight RPCs. Must run before the servicer is registered, which binds `Complete`."""
+
+        complete = servicer_class.Complete
+        monitor = self
+
+        def counted_complete(servicer, request, context):
+            monitor._add(rpcs=1)
+            try:
+                return complete(servicer, request, context)
+            finally:
+                monitor._add(rpcs=-1)
+
+        servicer_class.Complete = counted_complete
+
+    def instrument_pool(self, pool):
+        """Count agent tasks submitted to the servicer's process pool (running or queued)."""
+
+        submit = pool.submit
+
+        def counted_submit(*args, **kwargs):
+            self._add(tasks=1)
+            future = submit(*args, **kwargs)
+            future.add_done_callback(lambda _: self._add(tasks=-1))
+            return future
+
+        pool.submit = counted_submit
+
+    def start(self):
+        """Start sampling on a daemon thread."""
+
+        threading.Thread(target=self._sample_loop, daemon=True).start()
+
+    def stop(self):
+        """Stop sampling."""
+
+        self._stopped.set()
+
+    def summary(self) -> dict:
+        """Mean and peak utilisation of each pool, plus how many agent tasks were queued behind busy workers."""
+
+        if not self.samples:
+            return {}
+
+        rpcs = [r for r, _ in self.samples]
+        tasks = [t for _, t in self.samples]
+        return {
+            "grpc_threads": {
+                "size": self.max_threads,
+                "mean_utilisation": sum(min(r, self.max_threads) for r in rpcs) / len(rpcs) / self.max_threads,
+                "peak_in_flight": max(rpcs)
+            },
+            "agent_workers": {
+                "size": self.max_workers,
+                "mean_utilisation": sum(min(t, self.max_workers) for t in tasks) / len(tasks) / self.max_workers,
+                "peak_in_flight": max(tasks),
+                "mean_queued": sum(max(t - self.max_workers, 0) for t in tasks) / len(tasks)
+            }
+        }
+
+    def _add(self, rpcs: int = 0, tasks: int = 0):
+        with self._lock:
+            self._rpcs_in_flight += rpcs
+            self._tasks_in_flight += tasks
+
+    def _sample_loop(self):
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                self.samples.append((self._rpcs_in_flight, self._tasks_in_flight))
+
+
+def seed_conversations(count: int, turns: int) -> list[tuple[int, int]]:
+    """Replace the synthetic conversations in the `conversations` table and return their (user_id, conversation_id)."""
+
+    from langchain_core.messages import HumanMessage, AIMessage, messages_to_dict
+
+    db = Postgres()
+    cur = db.conn.cursor()
+    try:
+        cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {db.conversations_table} ("
+            "user_id BIGINT NOT NULL, conversation_id BIGINT NOT NULL, conversation TEXT NOT NULL, "
+            "PRIMARY KEY (user_id, conversation_id));"
+        )
+        # Version column the servicer's conversation cache needs
+        cur.execute(CONVERSATIONS_VERSION_SQL.read_text(encoding="utf-8"))
+        cur.execute(f"DELETE FROM {db.conversations_table} WHERE user_id >= %s;", (LOADTEST_USER_BASE,))
+
+        keys, rows = [], []
+        for i in range(count):
+            user_id, conversation_id = LOADTEST_USER_BASE + i % 100, i
+            messages = []
+            for turn in range(turns):
+                messages += [
+                    HumanMessage(content=f"Synthetic question {turn} about duty and the good will?"),
+                    AIMessage(content="Synthetic answer. " * 40)
+                ]
+            messages.append(HumanMessage(content="What does Kant mean by duty?"))
+            keys.append((user_id, conversation_id))
+            rows.append((user_id, conversation_id, json.dumps(messages_to_dict(messages))))
+
+        execute_values(
+            cur, f"INSERT INTO {db.conversations_table} (user_id, conversation_id, conversation) VALUES %s;", rows
+        )
+        return keys
+    finally:
+        cur.close()
+        db.close()
+
+def run_load(stub, keys: list[tuple[int, int]], args) -> list[tuple[float, str]]:
+    """Drive Complete and return (latency, outcome) per request. Outcome is OK, APP_ERROR or a gRPC status code."""
+
+    from cogito_servicer import cogito_pb2
+
+    results: list[tuple[float, str]] = []
+    results_lock = threading.Lock()
+
+    def one_request(scheduled_at: float):
+        user_id, conversation_id = random.choice(keys)
+        request = cogito_pb2.Conversation(user_id=str(user_id), conversation_id=str(conversation_id))
+        try:
+            response = stub.Complete(request, timeout=args.timeout)
+            outcome = "APP_ERROR" if response.status.startswith("Error") else "OK"
+        except grpc.RpcError as e:
+            outcome = e.code().name
+        # Open-loop latency includes time spent waiting to be sent, so queueing shows up
+        latency = time.perf_counter() - scheduled_at
+        with results_lock:
+            results.append((latency, outcome))
+
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    def more() -> bool:
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        with results_lock:
+            return len(results) + in_flight[0] < args.requests
+
+    in_flight = [0]
+    in_flight_lock = threading.Lock()
+
+    def tracked(scheduled_at: float):
+        try:
+            one_request(scheduled_at)
+        finally:
+            with in_flight_lock:
+                in_flight[0] -= 1
+
+    if args.rate:
+        # Open loop: Poisson arrivals regardless of how fast the server answers
+        with ThreadPoolExecutor(max_workers=args.max_outstanding) as executor:
+            next_arrival = time.perf_counter()
+            while more():
+                now = time.perf_counter()
+                if now < next_arrival:
+                    time.sleep(next_arrival - now)
+                with in_flight_lock:
+                    in_flight[0] += 1
+                executor.submit(tracked, next_arrival)
+                next_arrival += random.expovariate(args.rate)
+    else:
+        # Closed loop: each client sends its next request as soon as the previous one returns
+        def client():
+            while True:
+                with in_flight_lock:
+                    if not more():
+                        return
+                    in_flight[0] += 1
+                tracked(time.perf_counter())
+
+        threads = [threading.Thread(target=client) for _ in range(args.concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    return results
+
+def build_report(results: list[tuple[float, str]], elapsed: float, utilisation: dict) -> dict:
+    """Summarize a load run."""
+
+    latencies = sorted(latency for latency, outcome in results if outcome == "OK")
+    outcomes: dict[str, int] = {}
+    for _, outcome in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    histogram = {}
+    previous = 0.0
+    for bound in (*LATENCY_BUCKETS, float("inf")):
+        label = f"<= {bound}s" if bound != float("inf") else f"> {LATENCY_BUCKETS[-1]}s"
+        histogram[label] = sum(1 for latency in latencies if previous < latency <= bound)
+        previous = bound
+
+    def pct(p: float) -> float | None:
+        if not latencies:
+            return None
+        return latencies[min(int(p / 100 * len(latencies)), len(latencies) - 1)]
+
+    return {
+        "requests": len(results),
+        "elapsed_s": elapsed,
+        "throughput_rps": outcomes.get("OK", 0) / elapsed if elapsed else 0.0,
+        "latency_s": {"p50": pct(50), "p90": pct(90), "p95": pct(95), "p99": pct(99),
+                      "max": latencies[-1] if latencies else None},
+        "latency_histogram": histogram,
+        "outcomes": outcomes,
+        "utilisation": utilisation
+    }
+
+def main():
+    """Seed, start the server, drive load and print the report."""
+
+    args = _parse_args()
+
+    from bench.fakes import build_fake_agent
+    from cogito_servicer import cogito_pb2_grpc
+    from cogito_servicer.CogitoServer import CogitoServer
+    from cogito_servicer.Server import Server
+
+    keys = seed_conversations(args.conversations, args.turns) if not args.no_seed else [
+        (LOADTEST_USER_BASE + i % 100, i) for i in range(args.conversations)
+    ]
+
+    server, monitor = None, None
+    target = args.target
+    if target is None:
+        factory = functools.partial(
+            build_fake_agent,
+            llm_latency=args.llm_latency, embed_latency=args.embed_latency, qdrant_latency=args.qdrant_latency
+        )
+        monitor = UtilisationMonitor(args.threads, args.workers)
+        monitor.instrument_servicer_class(CogitoServer)
+        server = Server(agent_factory=factory, max_workers=args.workers, max_threads=args.threads, port=args.port)
+        monitor.instrument_pool(server.servicer.process_pool)
+        server.start(wait=False)
+        target = f"localhost:{args.port}"
+
+    channel = grpc.insecure_channel(target)
+    grpc.channel_ready_future(channel).result(timeout=30)
+    stub = cogito_pb2_grpc.CogitoStub(channel)
+
+    if monitor:
+        monitor.start()
+    start = time.perf_counter()
+    results = run_load(stub, keys, args)
+    elapsed = time.perf_counter() - start
+    if monitor:
+        monitor.stop()
+
+    report = build_report(results, elapsed, monitor.summary() if monitor else {})
+    print(json.dumps(report, indent=2))
+
+    channel.close()
+    if server:
+        server.stop(grace=5)
+
+def _parse_args():
+    """Parse command-line arguments."""
+
+    parser = argparse.ArgumentParser(description="Load test Cogito.Complete")
+    parser.add_argument("--target", help="host:port of a running server (default: start one in-process with fakes)")
+    parser.add_argument("--port", type=int, default=50061, help="port for the in-process server")
+    parser.add_argument("--workers", type=int, default=4, help="agent worker processes (in-process server)")
+    parser.add_argument("--threads", type=int, default=10, help="gRPC handler threads (in-process server)")
+    parser.add_argument("--conversations", type=int, default=200, help="synthetic conversations to seed")
+    parser.add_argument("--turns", type=int, default=3, help="prior turns per synthetic conversation")
+    parser.add_argument("--no-seed", action="store_true", help="reuse previously seeded conversations")
+    parser.add_argument("--concurrency", type=int, default=8, help="closed-loop clients")
+    parser.add_argument("--rate", type=float, help="open-loop arrival rate (req/s); overrides --concurrency")
+    parser.add_argument("--max-outstanding", type=int, default=256, help="open-loop cap on in-flight requests")
+    parser.add_argument("--requests", type=int, default=100, help="total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, help="run for this many seconds instead of a request count")
+    parser.add_argument("--timeout", type=float, default=120, help="per-request gRPC deadline (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="fake LLM latency per call (s)")
+    parser.add_argument("--embed-latency", type=float, default=0.1, help="fake embedding latency per call (s)")
+    parser.add_argument("--qdrant-latency", type=float, default=0.02, help="fake Qdrant latency per batch (s)")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
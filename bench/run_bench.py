@@ -0,0 +1,261 @@
+"""Offline benchmark harness for the Research Agent.
+
+Replays a corpus of real questions through `ResearchAgent.run` against recorded provider fixtures (see
+`bench/fixtures.py`) and reports turn latency, a per-node breakdown, tokens per turn, research iterations per
+`ResearchEffort` and peak RSS. Reports can be saved as a baseline and later runs compared against it.
+
+Fixtures and the baseline are not checked in: they are tied to the ingested corpus, the filters and the prompts. Record
+them once against your own setup (and again whenever any of those change) before replaying.
+
+Usage (from the repo root):
+    python -m bench.run_bench --mode record        # once, online: needs API keys and running DBs
+    python -m bench.run_bench                      # offline, deterministic replay
+    python -m bench.run_bench --save-baseline      # store this report as the new baseline
+    python -m bench.run_bench --latency-scale 1.0  # also replay recorded provider latencies
+
+Exits with status 1 if any metric regresses past the tolerance relative to the baseline.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+
+# Metrics compared against the baseline, with the minimum absolute change that counts as a regression
+COMPARED_METRICS = {
+    "turn_latency.p50": 0.005,
+    "turn_latency.p95": 0.005,
+    "tokens_per_turn.input": 1,
+    "tokens_per_turn.output": 1,
+    "peak_rss_mb": 5
+}
+
+
+class _TraceCollector:
+    """Telemetry sink that keeps every finished run trace."""
+
+    def __init__(self):
+        self.runs: list[dict] = []
+
+    def on_run(self, trace):
+        self.runs.append(trace.to_dict())
+
+
+def main():
+    """Run the benchmark."""
+
+    args = _parse_args()
+
+    # Model clients are constructed at import time and require keys, even though replay never uses them
+    if args.mode == "replay":
+        os.environ.setdefault("GROQ_API_KEY", "replay")
+        os.environ.setdefault("OPENAI_API_KEY", "replay")
+
+    # Repeated passes over the question set must run the whole pipeline
+    os.environ["COGITO_ANSWER_CACHE"] = "0"
+
+    from langchain_core.messages import HumanMessage, AIMessage
+
+    from ai.research_agent.ResearchAgent import ResearchAgent
+    from bench.fixtures import open_stores, install_stand_ins
+    from telemetry.tracing import add_sink
+
+    try:
+        stores = open_stores(args.fixtures, args.mode, args.latency_scale)
+    except FileNotFoundError as e:
+        print(f"::{e}")
+        print("::Fixtures aren't checked in; record them once with `python -m bench.run_bench --mode record`.")
+        return 2
+    qdrant = install_stand_ins(stores, args.mode)
+
+    collector = _TraceCollector()
+    add_sink(collector)
+
+    agent = ResearchAgent(qdrant=qdrant, postgres_filters=qdrant.postgres_client)
+    agent.build()
+
+    questions = json.loads(args.questions.read_text(encoding="utf-8"))
+    errors = 0
+
+    for bench_pass in range(args.repeat):
+        for store in stores.values():
+            store.reset()
+
+        for item in questions:
+            conversation = []
+            for human, ai in item.get("history", []):
+                conversation += [HumanMessage(content=human), AIMessage(content=ai)]
+            conversation.append(HumanMessage(content=item["question"]))
+
+            try:
+                agent.run(conversation, status=None)
+            except Exception as e:
+                errors += 1
+                print(f"::[{item['id']}] failed: {type(e).__name__}: {e}")
+
+            print(f"::pass {bench_pass + 1}/{args.repeat} - {item['id']} done", file=sys.stderr)
+
+    if args.mode == "record":
+        for store in stores.values():
+            store.save()
+        print(f"::Fixtures written to {args.fixtures}")
+
+    report = build_report(collector.runs, errors)
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"::Baseline written to {args.baseline}")
+        return 0
+
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_reports(baseline, report, args.tolerance)
+        if regressions:
+            print("::Regressions against baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("::No regressions against baseline.")
+    else:
+        print(f"::No baseline at {args.baseline}; save one with --save-baseline to check for regressions.")
+
+    return 0
+
+def build_report(runs: list[dict], errors: int) -> dict:
+    """Summarize run traces into a benchmark report."""
+
+    from ai.models.prompts import cached_token_ratio
+    from ai.research_agent.schemas.ResearchEffort import ResearchEffort
+
+    effort_names = {v: k for k, v in vars(ResearchEffort).items() if not k.startswith("_")}
+
+    latencies = [run["duration"] for run in runs]
+    node_durations: dict[str, list[float]] = {}
+    input_tokens, output_tokens, cached_tokens = [], [], []
+    node_tokens: dict[str, list[int]] = {}
+    iterations: dict[str, list[int]] = {}
+
+    for run in runs:
+        llm_spans = [s for s in run["spans"] if s["kind"] == "llm"]
+        input_tokens.append(sum(s["input_tokens"] for s in llm_spans))
+        output_tokens.append(sum(s["output_tokens"] for s in llm_spans))
+        cached_tokens.append(sum(s["cached_tokens"] for s in llm_spans))
+
+        for s in llm_spans:
+            totals = node_tokens.setdefault(s["node"] or s["parent"] or "unknown", [0, 0])
+            totals[0] += s["input_tokens"]
+            totals[1] += s["cached_tokens"]
+
+        for s in run["spans"]:
+            if s["kind"] == "node":
+                node_durations.setdefault(s["name"], []).append(s["duration"])
+
+        effort = effort_names.get(run.get("research_effort"), "UNKNOWN")
+        iterations.setdefault(effort, []).append(run.get("research_iterations") or 0)
+
+    return {
+        "turns": len(runs),
+        "errors": errors,
+        "turn_latency": {
+            "mean": _mean(latencies),
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95)
+        },
+        "nodes": {
+            name: {
+                "calls": len(durations),
+                "mean": _mean(durations),
+                "p95": _percentile(durations, 95),
+                "total": sum(durations)
+            }
+            for name, durations in sorted(node_durations.items())
+        },
+        "tokens_per_turn": {"input": _mean(input_tokens), "output": _mean(output_tokens), "cached": _mean(cached_tokens)},
+        "prompt_cache": {
+            "cached_ratio": cached_token_ratio(sum(input_tokens), sum(cached_tokens)),
+            "by_node": {name: cached_token_ratio(*totals) for name, totals in sorted(node_tokens.items())}
+        },
+        "iterations_per_effort": {effort: _mean(values) for effort, values in sorted(iterations.items())},
+        "peak_rss_mb": _peak_rss_mb()
+    }
+
+def compare_reports(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """Return a description of every metric that got worse than the baseline by more than `tolerance`."""
+
+    regressions = []
+
+    metrics = dict(COMPARED_METRICS)
+    for name in current.get("nodes", {}):
+        metrics[f"nodes.{name}.mean"] = 0.005
+
+    for path, min_delta in metrics.items():
+        old, new = _lookup(baseline, path), _lookup(current, path)
+        if old is None or new is None:
+            continue
+        if new > old * (1 + tolerance) and new - old > min_delta:
+            regressions.append(f"{path}: {old:.4f} -> {new:.4f} (+{(new - old) / old * 100 if old else 100:.1f}%)")
+
+    if current.get("errors", 0) > baseline.get("errors", 0):
+        regressions.append(f"errors: {baseline.get('errors', 0)} -> {current['errors']}")
+
+    return regressions
+
+def _parse_args():
+    """Parse command-line arguments."""
+
+    parser = argparse.ArgumentParser(description="Offline Research Agent benchmark")
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--questions", type=Path, default=BENCH_DIR / "questions.json")
+    parser.add_argument("--fixtures", type=Path, default=BENCH_DIR / "fixtures")
+    parser.add_argument("--baseline", type=Path, default=BENCH_DIR / "baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="store this report as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression (default 15%%)")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the corpus this many times")
+    parser.add_argument("--latency-scale", type=float, default=0.0,
+                        help="sleep for recorded provider latency times this factor during replay")
+
+    return parser.parse_args()
+
+def _lookup(report: dict, path: str):
+    """Read a dotted path out of a report."""
+
+    value = report
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+def _mean(values: list[float]) -> float:
+    """Mean of a list (0 if empty)."""
+
+    return sum(values) / len(values) if values else 0.0
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (0 if empty)."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+def _peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MiB (None where unsupported)."""
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+if __name__ == "__main__":
+    sys.exit(main())
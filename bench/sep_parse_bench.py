@@ -0,0 +1,133 @@
+"""Micro-benchmark of SEP article parsing.
+
+Times section extraction over a set of cached SEP articles: the original full-document `html.parser` parse against
+the sliced parse in `ai.research_agent.sources.sep` with each available parser. It also measures how long the event
+loop stalls while a batch of articles is parsed concurrently, inline on the loop versus in worker threads.
+
+Articles come from the recorded SEP fixtures (`python -m bench.run_bench --mode record`) or from a directory of saved
+`.html` pages.
+
+Usage (from the repo root):
+    python -m bench.sep_parse_bench
+    python -m bench.sep_parse_bench --html-dir ~/sep_pages --repeat 20
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+BENCH_DIR = Path(__file__).parent
+
+
+def load_articles(fixtures: Path, html_dir: Path | None) -> list[str]:
+    """Article pages from a directory of .html files, else from the recorded SEP fixtures."""
+
+    if html_dir is not None:
+        return [p.read_text(encoding="utf-8") for p in sorted(html_dir.glob("*.html"))]
+
+    if not fixtures.exists():
+        return []
+    recorded = json.loads(fixtures.read_text(encoding="utf-8"))
+    pages = [entry["response"] for entries in recorded.values() for entry in entries]
+    return [page for page in pages if isinstance(page, str) and 'id="main-text"' in page]
+
+def baseline_parse(html: str):
+    """The original extraction path: parse the whole page with html.parser, then walk `main-text`."""
+
+    soup = BeautifulSoup(html, "html.parser")
+    main_content = soup.find("div", id="main-text")
+    return [elem.get_text(strip=True) for elem in main_content.children if hasattr(elem, "name")] if main_content else []
+
+def time_parse(parse, articles: list[str], repeat: int) -> dict:
+    """Per-article parse times in milliseconds."""
+
+    timings = []
+    for _ in range(repeat):
+        for html in articles:
+            start = time.perf_counter()
+            parse(html)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        "p50_ms": round(timings[len(timings) // 2], 2),
+        "p95_ms": round(timings[min(int(len(timings) * 0.95), len(timings) - 1)], 2),
+        "mean_ms": round(sum(timings) / len(timings), 2)
+    }
+
+async def loop_stall(parse, articles: list[str], in_thread: bool) -> float:
+    """Longest event loop stall (ms) while every article is parsed concurrently."""
+
+    stalls = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stalls.append((time.perf_counter() - start) * 1000 - 1)
+
+    async def parse_one(html):
+        if in_thread:
+            await asyncio.to_thread(parse, html)
+        else:
+            parse(html)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    await asyncio.gather(*(parse_one(html) for html in articles))
+    done.set()
+    await tick
+
+    return round(max(stalls, default=0.0), 2)
+
+def main():
+    """Run the benchmark."""
+
+    args = _parse_args()
+
+    from ai.research_agent.sources import sep
+
+    articles = load_articles(args.fixtures, args.html_dir)
+    if not articles:
+        print("::No SEP articles found. Record fixtures first or pass --html-dir.", file=sys.stderr)
+        return 1
+
+    def sliced_parse(parser):
+        return lambda html: sep._parse_sections_untraced(html, parser)
+
+    parsers = ["html.parser"] + (["lxml"] if sep.HTML_PARSER == "lxml" else [])
+    report = {
+        "articles": len(articles),
+        "mean_kb": round(sum(len(a) for a in articles) / len(articles) / 1024, 1),
+        "parse": {"baseline": time_parse(baseline_parse, articles, args.repeat)},
+        "loop_stall_ms": {}
+    }
+    for parser in parsers:
+        report["parse"][f"sliced_{parser}"] = time_parse(sliced_parse(parser), articles, args.repeat)
+
+    fastest = sliced_parse(parsers[-1])
+    report["loop_stall_ms"]["inline"] = asyncio.run(loop_stall(fastest, articles, in_thread=False))
+    report["loop_stall_ms"]["thread"] = asyncio.run(loop_stall(fastest, articles, in_thread=True))
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+def _parse_args():
+    """Parse command-line arguments."""
+
+    parser = argparse.ArgumentParser(description="SEP article parsing micro-benchmark")
+    parser.add_argument("--fixtures", type=Path, default=BENCH_DIR / "fixtures" / "sep.json")
+    parser.add_argument("--html-dir", type=Path, default=None, help="directory of saved SEP article pages")
+    parser.add_argument("--repeat", type=int, default=10, help="passes over the article set")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
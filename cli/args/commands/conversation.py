@@ -1,39 +1,29 @@
-import os
-
 from rich.console import Console
 
 from cli.conversations.agent_loop import conversation_loop
-from cli.conversations.conversations import user_select_conversation, get_conversation_by_id, get_new_conversation_id, \
-    Conversation, CONVERSATIONS_DIR
-from cli.db_containers import manage_containers
-
-
-def _start_docker_containers(console: Console):
-    """Setup Docker containers."""
+from cli.conversations.conversations import user_select_conversation, read_conversation_dict, get_new_conversation_id, \
+    Conversation, get_conversation_summaries, remove_conversation
+from cli.warmup import AgentWarmup
 
-    with console.status("[dim]Starting dbs...[/dim]", spinner="clock") as status:
-        manage_containers(status)
 
 def user_option_conversation(console: Console):
     """Start a new conversation with user-selected conversation."""
 
-    _start_docker_containers(console)
+    # Containers and the agent warm up while the user picks a conversation
+    warmup = AgentWarmup()
     conversation = user_select_conversation(console)
-    conversation_loop(console, conversation)
+    conversation_loop(console, conversation, warmup)
 
 def delete_conversation(console: Console, conversation_id: int):
     """Delete an existing conversation."""
 
-    conversation = get_conversation_by_id(conversation_id)
-
-    if not conversation:
+    if not any(s["id"] == conversation_id for s in get_conversation_summaries()):
         console.print(f"[bold red]Error:[/bold red] [gold3]No conversation found with ID[/gold3] {conversation_id}.")
         return
 
     # Delete the conversation file
-    path = CONVERSATIONS_DIR / f"conversation-{conversation_id}.json"
     try:
-        os.remove(path)
+        remove_conversation(conversation_id)
         console.print(f"[bold green]Success:[/bold green] [gold3]Deleted conversation with ID[/gold3] {conversation_id}.")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] [gold3]Failed to delete conversation with ID[/gold3] {conversation_id}.")
@@ -42,7 +32,7 @@ def delete_conversation(console: Console, conversation_id: int):
 def start_new_conversation(console: Console, name: str | None):
     """Start a new conversation with user-selected conversation."""
 
-    _start_docker_containers(console)
+    warmup = AgentWarmup()
     if name is not None:
         conversation_id = get_new_conversation_id()
         conversation: Conversation = {
@@ -50,18 +40,17 @@ def start_new_conversation(console: Console, name: str | None):
             "name": name,
             "conversation": []
         }
-        conversation_loop(console, conversation)
+        conversation_loop(console, conversation, warmup)
     else:
-        conversation_loop(console, None)
+        conversation_loop(console, None, warmup)
 
 def resume_conversation(console: Console, conversation_id: int):
     """Resume an existing conversation."""
 
-    _start_docker_containers(console)
-    conversation = get_conversation_by_id(conversation_id)
+    conversation = read_conversation_dict(conversation_id)
 
     if not conversation:
         console.print(f"[bold red]Error:[/bold red] [gold3]No conversation found with ID[/gold3] {conversation_id}.")
         return
 
-    conversation_loop(console, conversation)
\ No newline at end of file
+    conversation_loop(console, conversation, AgentWarmup())
\ No newline at end of file
@@ -2,7 +2,7 @@ from rich.align import Align
 from rich.console import Console
 from rich.table import Table
 
-from cli.conversations.conversations import get_conversations
+from cli.conversations.conversations import get_conversation_summaries
 
 
 def list_conversations(console: Console):
@@ -18,9 +18,10 @@ def list_conversations(console: Console):
     )
     table.add_column("Conversation Name", header_style="bold yellow2 italic", style="yellow2")
     table.add_column("Conversation ID", header_style="bold yellow2 italic", style="yellow2")
+    table.add_column("Messages", header_style="bold yellow2 italic", style="yellow2")
 
-    for conversation in get_conversations():
-        table.add_row(f"'{conversation['name']}'", str(conversation['id']))
+    for conversation in get_conversation_summaries():
+        table.add_row(f"'{conversation['name']}'", str(conversation['id']), str(conversation['message_count']))
 
     console.print(table)
 
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+
+from cli.conversations.conversations import save_conversation, read_conversation_dict, read_journal, repair_journal, journal_path
+
+
+class ConversationJournal:
+    """Append-only, fsync'd JSON Lines journal of a conversation's messages.
+
+    Each turn appends only its new messages, so per-turn write cost is O(message) instead of O(history). The journal is
+    periodically compacted into the conversation's snapshot file on a background thread. Every record carries a sequence
+    number and the snapshot stores the last one it contains, so a crash at any point never loses or duplicates messages.
+    """
+
+    # --- Methods ---
+    def __init__(self, conversation_id: int, conversation_name: str | None, compact_every: int = 20):
+        """Open (or create) the journal for a conversation."""
+
+        self.conversation_id = conversation_id
+        self.conversation_name = conversation_name or f"Conversation {conversation_id}"
+        self.compact_every = compact_every
+
+        self.path = journal_path(conversation_id)
+        self._lock = threading.Lock()
+        self._compaction_thread: threading.Thread | None = None
+
+        # Make sure a snapshot exists so the conversation is listed (and resumable) even if we crash before compacting
+        snapshot = read_conversation_dict(conversation_id)
+        if snapshot is None:
+            save_conversation([], conversation_id, self.conversation_name, journal_seq=0)
+            snapshot = {"journal_seq": 0}
+
+        # A crash mid-append can leave a torn last line; cut it off so new records start on a fresh line
+        repair_journal(conversation_id)
+        records = read_journal(conversation_id)
+        self._seq = max([snapshot.get("journal_seq", 0), *(r["seq"] for r in records)])
+        self._pending = len(records)
+
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def append(self, messages: list[dict]):
+        """Durably append messages (in `messages_to_dict` format) to the journal."""
+
+        with self._lock:
+            for message in messages:
+                self._seq += 1
+                self._file.write(json.dumps({"seq": self._seq, "message": message}) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending += len(messages)
+
+            should_compact = self._pending >= self.compact_every
+
+        if should_compact:
+            self.compact_in_background()
+
+    def compact_in_background(self):
+        """Fold the journal into the snapshot on a background thread (no-op if one is already running)."""
+
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+
+        self._compaction_thread = threading.Thread(target=self.compact, daemon=True)
+        self._compaction_thread.start()
+
+    def compact(self):
+        """Fold the journal into the snapshot and truncate the journal."""
+
+        with self._lock:
+            if self._file.closed:
+                return
+
+            conversation = read_conversation_dict(self.conversation_id) or {"conversation": []}
+            save_conversation(
+                conversation["conversation"], self.conversation_id, self.conversation_name, journal_seq=self._seq
+            )
+
+            # Every record up to self._seq is now in the snapshot
+            self._file.truncate(0)
+            self._file.seek(0)
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def close(self, conversation_name: str | None = None):
+        """Compact the journal one final time (optionally renaming the conversation) and remove it."""
+
+        if conversation_name:
+            self.conversation_name = conversation_name
+
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+
+        self.compact()
+
+        with self._lock:
+            self._file.close()
+        self.path.unlink(missing_ok=True)
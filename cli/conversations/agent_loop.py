@@ -1,43 +1,57 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from langchain_core.messages import HumanMessage, AIMessage, messages_to_dict
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
 
+from ai.research_agent.CancellationToken import CancellationToken, RunCancelled
 from ai.research_agent.ResearchAgent import ResearchAgent
 from ai.research_agent.schemas.ResearchEffort import ResearchEffort
-from cli.conversations.conversations import save_conversation, Conversation, get_new_conversation_id
+from cli.conversations.ConversationJournal import ConversationJournal
+from cli.conversations.conversations import Conversation, get_new_conversation_id, messages_dict_to_messages
 from cli.output.panels import ai_bubble, system_panel
+from cli.warmup import AgentWarmup
 
 
-def conversation_loop(console: Console, conversation: Conversation | None):
-    """Main agent conversation loop."""
+def conversation_loop(console: Console, conversation: Conversation | None, warmup: AgentWarmup):
+    """Main agent conversation loop. The agent is taken from `warmup` when the first message is sent.
+
+    `conversation` holds message dicts; they're only parsed into messages when the agent first needs them.
+    """
 
     console.print("\n::Type 'exit' or 'quit' to end the conversation.\n", style="bold gold3")
 
     # Build conversation state
     if conversation:
-        messages = conversation["conversation"]
+        message_dicts = conversation["conversation"]
         conversation_id = conversation["id"]
         conversation_name = conversation["name"]
     else:
-        messages = []
+        message_dicts = []
         conversation_id = get_new_conversation_id()
         conversation_name = None
 
-    # Build agent
-    agent = ResearchAgent()
-    agent.build()
+    # Every turn is journaled to disk as it happens, so a crash loses at most the in-flight turn
+    journal = ConversationJournal(conversation_id, conversation_name)
+
+    agent: ResearchAgent | None = None
+
+    # The agent runs off the main thread so Ctrl-C can cancel a turn without leaving the conversation
+    run_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cogito-run")
 
     # ---- Output section -------------------------------------------------
-    for msg in messages:
-        if isinstance(msg, HumanMessage):
-            console.print(f"[bold cyan]▸ You[/bold cyan]: {msg.content}\n")
-        elif isinstance(msg, AIMessage):
-            console.print(ai_bubble(msg.content))
+    for msg_dict in message_dicts:
+        if msg_dict["type"] == "human":
+            console.print(f"[bold cyan]▸ You[/bold cyan]: {msg_dict['data']['content']}\n")
+        elif msg_dict["type"] == "ai":
+            console.print(ai_bubble(msg_dict["data"]["content"]))
             console.print()
 
+    # Parsed on the first turn
+    messages = None
+
     try:
         # ---- Main loop -------------------------------------------------------
         while True:
@@ -47,16 +61,39 @@ def conversation_loop(console: Console, conversation: Conversation | None):
             if user_input.lower() in {"exit", "quit"}:
                 break
 
+            if messages is None:
+                messages = messages_dict_to_messages(message_dicts)
             messages.append(HumanMessage(content=user_input))
             console.print()  # New line for spacing
 
-            # Run agent
+            # Usually already warm by the time the user has typed their first message
+            if agent is None:
+                agent = warmup.result(console)
+
+            # Run agent (Ctrl-C cancels this turn)
             start = time.perf_counter()
+            cancellation = CancellationToken()
             with console.status("[dim]thinking…[/dim]", spinner="clock") as status:
                 # Allows us to show status updates from within the agent
-                output = agent.run(messages, status=status)
+                future = run_executor.submit(agent.run, messages, status=status, cancellation=cancellation)
+                try:
+                    output = future.result()
+                except KeyboardInterrupt:
+                    cancellation.cancel()
+                    output = None
+
+                    # Wait for the run to wind down (it stops at its next check) before starting another
+                    try:
+                        future.result()
+                    except RunCancelled:
+                        pass
             end = time.perf_counter()
 
+            if output is None:
+                messages.pop()
+                console.print("::Cancelled. Ask again, or type 'exit' to quit.\n", style="dim italic")
+                continue
+
             # Handle output
             txt_out = output.get("response", "No response available")
             research_level = output.get("research_effort", "N/A")
@@ -89,8 +126,9 @@ def conversation_loop(console: Console, conversation: Conversation | None):
             )
             console.print()
 
-            # Update messages
+            # Update messages and persist this turn
             messages.append(AIMessage(content=txt_out))
+            journal.append(messages_to_dict(messages[-2:]))
 
     except KeyboardInterrupt:
         console.print("\n::Quitting...", style="dim italic")  # New line for spacing
@@ -99,14 +137,14 @@ def conversation_loop(console: Console, conversation: Conversation | None):
         print(f"::Error while running agent:\n{e}")
 
     # ---- Cleanup ------------------------------------------------------
+    run_executor.shutdown(wait=False)
     try:
-        agent.close()
+        warmup.close()
 
         if not conversation_name:
             conversation_name = Prompt.ask("\n::Enter a name for this conversation", default=f"Conversation {conversation_id}")
 
-        messages_dict = messages_to_dict(messages)
-        save_conversation(messages_dict, conversation_id, conversation_name)
+        journal.close(conversation_name)
         console.print(system_panel("Session ended. Logs written to disk."))
     except KeyboardInterrupt:
         console.print("\n::Quitting before cleanup...", style="dim italic")  # New line for spacing
@@ -1,4 +1,5 @@
 import json
+import os
 from pathlib import Path
 from typing import TypedDict
 
@@ -14,42 +15,155 @@ class Conversation(TypedDict):
     name: str           # name given by user or LLM
     conversation: list  # conversation dict
 
+class ConversationSummary(TypedDict):
+    id: int             # unique ID for conversation
+    name: str           # name given by user or LLM
+    message_count: int  # number of messages in the conversation
+    mtime: float        # modification time of the conversation file when indexed
+
 
 def get_conversations() -> list[Conversation]:
     """Retrieve saved conversation logs from disk."""
 
     conversations = []
-    for file in CONVERSATIONS_DIR.glob("conversation-*.json"):
-        conversation_str = file.read_text(encoding="utf-8")
-        conversation: Conversation = json.loads(conversation_str)
-        conversation["conversation"] = _messages_dict_to_messages(conversation["conversation"])
-        conversations.append(conversation)
+    for summary in get_conversation_summaries():
+        conversation = get_conversation_by_id(summary["id"])
+        if conversation:
+            conversations.append(conversation)
 
     return conversations
 
+def get_conversation_summaries() -> list[ConversationSummary]:
+    """Retrieve the id, name, and message count of every saved conversation without parsing any messages.
+
+    Served from the index file, which is re-synced against the conversation files on every call so edits made outside
+    the CLI are picked up. Only files whose mtime or size changed are re-read.
+    """
+
+    index = _load_index()
+    changed = False
+
+    on_disk: dict[int, os.stat_result] = {}
+    for file in CONVERSATIONS_DIR.glob("conversation-*.json"):
+        conversation_id = _conversation_id_from_path(file)
+        if conversation_id is not None:
+            on_disk[conversation_id] = file.stat()
+
+    # Drop entries whose files were deleted
+    for conversation_id in list(index):
+        if conversation_id not in on_disk:
+            del index[conversation_id]
+            changed = True
+
+    # (Re)index new or modified files
+    for conversation_id, stat in on_disk.items():
+        entry = index.get(conversation_id)
+        if (entry and entry["mtime"] == stat.st_mtime and entry.get("size") == stat.st_size
+                and entry.get("journal_size", 0) == _journal_size(conversation_id)):
+            continue
+
+        summary = _read_summary(conversation_id, stat)
+        if summary is None:
+            index.pop(conversation_id, None)
+        else:
+            index[conversation_id] = summary
+        changed = True
+
+    if changed:
+        _write_index(index)
+
+    return sorted(
+        ({"id": e["id"], "name": e["name"], "message_count": e["message_count"], "mtime": e["mtime"]}
+         for e in index.values()),
+        key=lambda e: e["id"]
+    )
+
 def get_conversation_by_id(conversation_id: int) -> Conversation | None:
-    """Load a conversation by ID."""
+    """Load a conversation by ID (snapshot plus any journal entries not yet compacted into it)."""
+
+    conversation = read_conversation_dict(conversation_id)
+    if conversation is None:
+        return None
+
+    conversation["conversation"] = messages_dict_to_messages(conversation["conversation"])
+    return conversation
+
+def read_conversation_dict(conversation_id: int) -> dict | None:
+    """Load a conversation's raw message dicts: the snapshot file followed by the journal tail."""
+
+    p = _conversation_path(conversation_id)
+    if not p.exists():
+        return None
+
+    try:
+        conversation = json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    snapshot_seq = conversation.get("journal_seq", 0)
+    for record in read_journal(conversation_id):
+        if record["seq"] > snapshot_seq:
+            conversation["conversation"].append(record["message"])
+            conversation["journal_seq"] = record["seq"]
+
+    return conversation
+
+def read_journal(conversation_id: int) -> list[dict]:
+    """Read a conversation's journal records, ignoring a torn final line left by a crash."""
+
+    return _read_journal_records(conversation_id)[0]
+
+def repair_journal(conversation_id: int):
+    """Truncate a conversation's journal to its last complete record, dropping a torn final line left by a crash.
+
+    Must run before appending to the journal again, or new records would be glued onto the torn fragment.
+    """
+
+    path = journal_path(conversation_id)
+    _, valid_size = _read_journal_records(conversation_id)
+    if path.exists() and path.stat().st_size > valid_size:
+        with open(path, "r+b") as f:
+            f.truncate(valid_size)
+            os.fsync(f.fileno())
+
+def _read_journal_records(conversation_id: int) -> tuple[list[dict], int]:
+    """Journal records up to the first incomplete or unparsable line, and the byte size of that valid prefix."""
 
-    conversations = get_conversations()
-    for conv in conversations:
-        if conv["id"] == conversation_id:
-            return conv
-    return None
+    records = []
+    valid_size = 0
+    try:
+        with open(journal_path(conversation_id), "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                valid_size += len(line)
+    except FileNotFoundError:
+        pass
+
+    return records, valid_size
 
 def get_new_conversation_id() -> int:
     """Generate a new unique conversation ID."""
 
-    conversations: list[Conversation] = get_conversations()
-    if not conversations:
+    summaries = get_conversation_summaries()
+    if not summaries:
         return 1
     else:
-        max_id = max(c.get("id") for c in conversations)
+        max_id = max(s["id"] for s in summaries)
         return max_id + 1
 
-def save_conversation(conversation: list[dict], conversation_id: int, conversation_name: str):
-    """Write conversation logs to disk."""
+def save_conversation(conversation: list[dict], conversation_id: int, conversation_name: str,
+                      journal_seq: int | None = None):
+    """Write conversation logs to disk.
+
+    `journal_seq` records the last journal entry folded into this snapshot so it isn't replayed on load.
+    """
 
-    p = CONVERSATIONS_DIR / Path(f"conversation-{conversation_id}.json")
+    p = _conversation_path(conversation_id)
     p.parent.mkdir(parents=True, exist_ok=True)
 
     conversation_dict: Conversation = {
@@ -57,20 +171,48 @@ def save_conversation(conversation: list[dict], conversation_id: int, conversati
         "name": conversation_name,
         "conversation": conversation
     }
+    if journal_seq is not None:
+        conversation_dict["journal_seq"] = journal_seq
     conversation_dict_str = json.dumps(conversation_dict)
 
-    p.write_text(conversation_dict_str, encoding="utf-8")
+    # Write atomically so a crash mid-write never corrupts the existing snapshot
+    tmp = p.with_suffix(".json.tmp")
+    tmp.write_text(conversation_dict_str, encoding="utf-8")
+    os.replace(tmp, p)
+
+    # Keep the index in sync
+    stat = p.stat()
+    index = _load_index()
+    index[conversation_id] = {
+        "id": conversation_id,
+        "name": conversation_name,
+        "message_count": len(conversation),
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "journal_size": _journal_size(conversation_id)
+    }
+    _write_index(index)
+
+def remove_conversation(conversation_id: int):
+    """Delete a conversation's file from disk and drop it from the index."""
+
+    os.remove(_conversation_path(conversation_id))
+    journal_path(conversation_id).unlink(missing_ok=True)
+
+    index = _load_index()
+    if index.pop(conversation_id, None) is not None:
+        _write_index(index)
 
 def user_select_conversation(console: Console) -> Conversation | None:
-    """Load a conversation by ID."""
+    """Let the user pick a conversation and load it, leaving its messages as dicts until they're needed."""
 
-    conversations = get_conversations()
+    summaries = get_conversation_summaries()
 
     # Use Questionary for the interaction
     console.print("::Select a conversation to resume or start a new one", style="bold gold3")
     answer = questionary.select(
         "",
-        choices=["New conversation", *(f"'{c['name']}' (ID={c['id']})" for c in conversations)],
+        choices=["New conversation", *(f"'{c['name']}' (ID={c['id']})" for c in summaries)],
         style=questionary.Style([
             ('qmark', 'fg:gold bold'),
             ('question', 'bold fg:gold'),
@@ -88,13 +230,10 @@ def user_select_conversation(console: Console) -> Conversation | None:
     # Extract the conversation ID from the selected answer
     selected_id = int(answer.split("ID=")[-1].replace(")", "").strip())
 
-    # Find and return the selected conversation
-    for conv in conversations:
-        if conv["id"] == selected_id:
-            return conv
-    return None
+    # Load only the selected conversation
+    return read_conversation_dict(selected_id)
 
-def _messages_dict_to_messages(messages_dict: list[dict]) -> list[AnyMessage]:
+def messages_dict_to_messages(messages_dict: list[dict]) -> list[AnyMessage]:
     """Convert a list of message dicts to LangChain message objects."""
 
     messages_res = []
@@ -106,3 +245,67 @@ def _messages_dict_to_messages(messages_dict: list[dict]) -> list[AnyMessage]:
         elif msg_dict["type"] == "system":
             messages_res.append(SystemMessage(msg_dict.get("data").get("content")))
     return messages_res
+
+def _conversation_path(conversation_id: int) -> Path:
+    """Path of the snapshot file for a conversation."""
+
+    return CONVERSATIONS_DIR / Path(f"conversation-{conversation_id}.json")
+
+def journal_path(conversation_id: int) -> Path:
+    """Path of the append-only journal file for a conversation."""
+
+    return CONVERSATIONS_DIR / Path(f"conversation-{conversation_id}.jsonl")
+
+def _journal_size(conversation_id: int) -> int:
+    """Size of a conversation's journal file, or 0 if it has none."""
+
+    try:
+        return journal_path(conversation_id).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+def _conversation_id_from_path(path: Path) -> int | None:
+    """Parse the conversation ID out of a `conversation-<id>.json` filename."""
+
+    try:
+        return int(path.stem.removeprefix("conversation-"))
+    except ValueError:
+        return None
+
+def _read_summary(conversation_id: int, stat: os.stat_result) -> dict | None:
+    """Build an index entry by reading a single conversation file (messages are counted, not parsed)."""
+
+    conversation = read_conversation_dict(conversation_id)
+    if conversation is None:
+        return None
+
+    return {
+        "id": conversation_id,
+        "name": conversation.get("name", f"Conversation {conversation_id}"),
+        "message_count": len(conversation.get("conversation", [])),
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "journal_size": _journal_size(conversation_id)
+    }
+
+def _index_path() -> Path:
+    """Path of the index file listing every conversation."""
+
+    return CONVERSATIONS_DIR / Path("index.json")
+
+def _load_index() -> dict[int, dict]:
+    """Load the index file, returning an empty index if it is missing or corrupt."""
+
+    try:
+        entries = json.loads(_index_path().read_text(encoding="utf-8")).get("conversations", [])
+        return {int(e["id"]): e for e in entries}
+    except (OSError, json.JSONDecodeError, AttributeError, KeyError, TypeError, ValueError):
+        return {}
+
+def _write_index(index: dict[int, dict]):
+    """Atomically write the index file."""
+
+    index_path = _index_path()
+    tmp = index_path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps({"conversations": list(index.values())}), encoding="utf-8")
+    os.replace(tmp, index_path)
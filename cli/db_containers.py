@@ -1,16 +1,55 @@
 import os
 import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 
+import psycopg2
 from docker import from_env
 from rich.status import Status
 
 
+def _probe_qdrant() -> bool:
+    """Return True if Qdrant's readiness endpoint answers."""
+
+    try:
+        with urllib.request.urlopen("http://localhost:6333/readyz", timeout=1) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+def _probe_postgres() -> bool:
+    """Return True if Postgres accepts a connection and answers `SELECT 1`."""
+
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv("COGITO_POSTGRES_HOST"),
+            port=int(os.getenv("COGITO_POSTGRES_PORT")),
+            dbname=os.getenv("COGITO_POSTGRES_DBNAME"),
+            user=os.getenv("COGITO_POSTGRES_USER"),
+            password=os.getenv("COGITO_POSTGRES_PASSWORD"),
+            connect_timeout=1
+        )
+    except Exception:
+        return False
+
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1;")
+        return cur.fetchone() == (1,)
+    except Exception:
+        return False
+    finally:
+        conn.close()
+
+
 CONTAINERS_CONFIG = [
     {
         "name": "cogito-vectors",
         "image": "crazywillbear/cogito-vectors:latest",
         "ports": {'6333/tcp': 6333, '6334/tcp': 6334},
-        "environment": {"QDRANT__SERVICE__API_KEY": "default"}
+        "environment": {"QDRANT__SERVICE__API_KEY": "default"},
+        "probe": _probe_qdrant
     },
     {
         "name": "cogito-postgres",
@@ -20,15 +59,23 @@ CONTAINERS_CONFIG = [
             "POSTGRES_USER": "default",
             "POSTGRES_PASSWORD": "default",
             "POSTGRES_DB": "cogito"
-        }
+        },
+        "probe": _probe_postgres
     }
 ]
 
 def manage_containers(status: Status):
-    """Ensure required Docker containers are running."""
+    """Ensure required Docker containers are running and their services are ready."""
 
     _set_env_variables()
 
+    # Fast path: both services already answer, no need to talk to Docker at all
+    with ThreadPoolExecutor(max_workers=len(CONTAINERS_CONFIG)) as executor:
+        ready = list(executor.map(lambda config: config["probe"](), CONTAINERS_CONFIG))
+    if all(ready):
+        status.update(status="Databases are already running.")
+        return
+
     try:
         client = from_env()
 
@@ -36,35 +83,42 @@ def manage_containers(status: Status):
         print(f"Could not connect to Docker. Is the service running? Are you on Python <=3.12.0\n{e}")
         return
 
-    for config in CONTAINERS_CONFIG:
-        try:
-            # 1. Try to get the container by name
-            container = client.containers.get(config["name"])
-
-            if container.status == "running":
-                status.update(status=f"{config['name']} is already running")
-            else:
-                status.update(status=f"{config['name']} exists but is stopped. Starting...")
-                container.start()
-                if _wait_for_running(container):
-                    status.update(status=f"{config['name']} launched successfully.")
-                else:
-                    status.update(status=f"{config['name']} failed to reach 'running' in time.")
-
-        except Exception:
-            # 2. If it doesn't exist, pull and run
-            status.update(status=f"{config['name']} not found. Pulling image and starting...")
-            container = client.containers.run(
-                config["image"],
-                name=config["name"],
-                detach=True,
-                ports=config["ports"],
-                environment=config.get("environment")
-            )
-            if _wait_for_running(container):
-                status.update(status=f"{config['name']} launched successfully.")
-            else:
-                status.update(status=f"{config['name']} failed to reach 'running' in time.")
+    # Bring up every container that isn't ready concurrently
+    pending = [config for config, is_ready in zip(CONTAINERS_CONFIG, ready) if not is_ready]
+    with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        futures = [executor.submit(_ensure_container, client, config, status) for config in pending]
+        for future in futures:
+            future.result()
+
+
+def _ensure_container(client, config: dict, status: Status):
+    """Start (or pull and run) a single container, then wait until its service is ready."""
+
+    try:
+        # 1. Try to get the container by name
+        container = client.containers.get(config["name"])
+
+        if container.status == "running":
+            status.update(status=f"{config['name']} is running, waiting for it to accept connections...")
+        else:
+            status.update(status=f"{config['name']} exists but is stopped. Starting...")
+            container.start()
+
+    except Exception:
+        # 2. If it doesn't exist, pull and run
+        status.update(status=f"{config['name']} not found. Pulling image and starting...")
+        client.containers.run(
+            config["image"],
+            name=config["name"],
+            detach=True,
+            ports=config["ports"],
+            environment=config.get("environment")
+        )
+
+    if _wait_for_ready(config["probe"]):
+        status.update(status=f"{config['name']} launched successfully.")
+    else:
+        status.update(status=f"{config['name']} failed to become ready in time.")
 
 
 def _set_env_variables():
@@ -82,15 +136,16 @@ def _set_env_variables():
     os.environ["COGITO_POSTGRES_HOST"] = "localhost"
 
 
-def _wait_for_running(container, timeout: int = 60, interval: float = 1.0) -> bool:
-    """Poll Docker until the container reports running or we time out."""
+def _wait_for_ready(probe: Callable[[], bool], timeout: float = 60, initial_interval: float = 0.1,
+                    max_interval: float = 2.0) -> bool:
+    """Poll a readiness probe with exponential backoff until it passes or we time out."""
 
     deadline = time.monotonic() + timeout
+    interval = initial_interval
     while time.monotonic() < deadline:
-        container.reload()
-        if container.status == "running":
-            time.sleep(2)  # Give a bit of extra time for the service to be ready
+        if probe():
             return True
-        time.sleep(interval)
+        time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+        interval = min(interval * 2, max_interval)
 
     return False
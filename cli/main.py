@@ -1,6 +1,7 @@
 from rich.console import Console
 
 from cli.args.args_handler import execute_args
+from telemetry.exporters import configure_exporters_from_env
 
 START_TEXT = \
 r"""-=-=-=-=-=-
@@ -19,6 +20,8 @@ Code and license at https://github.com/CrazyWillBear/cogito-ai
 def main(version: str):
     """Main entry point for the Cogito CLI application."""
 
+    configure_exporters_from_env()
+
     # Execute args
     console = Console()
     console.print(START_TEXT, style="bold gold3")
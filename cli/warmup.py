@@ -0,0 +1,75 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+from rich.console import Console
+
+from ai.models.Reranker import get_reranker
+from ai.models.tokens import get_encoding
+from ai.research_agent.ResearchAgent import ResearchAgent
+from cli.db_containers import manage_containers
+
+
+class AgentWarmup:
+    """Brings up the DB containers and builds the Research Agent on a background thread.
+
+    Started before the user picks a conversation or types their first message, so by the time `agent.run` is first
+    called the containers are up, DB connections are open, the graph is compiled and tiktoken encodings are loaded.
+    """
+
+    # --- Methods ---
+    def __init__(self):
+        """Start warming up immediately."""
+
+        self.message = "Starting dbs..."
+        self._future: Future[ResearchAgent] = Future()
+
+        # Daemon thread so quitting early never blocks on a slow container pull
+        thread = threading.Thread(target=self._warm_up, daemon=True)
+        thread.start()
+
+    def update(self, status: str):
+        """Record the latest progress message (lets this object stand in for a rich Status)."""
+
+        self.message = status
+
+    def result(self, console: Console) -> ResearchAgent:
+        """Return the warmed-up agent, showing a spinner with progress if it isn't ready yet."""
+
+        if not self._future.done():
+            with console.status(f"[dim]{self.message}[/dim]", spinner="clock") as status:
+                while not self._future.done():
+                    status.update(f"[dim]{self.message}[/dim]")
+                    time.sleep(0.1)
+
+        return self._future.result()
+
+    def close(self):
+        """Close the agent's connections if warm-up finished successfully."""
+
+        if self._future.done() and self._future.exception() is None:
+            self._future.result().close()
+
+    def _warm_up(self):
+        """Run every warm-up step in order, resolving the future with the built agent."""
+
+        try:
+            manage_containers(self)
+
+            self.update("Loading tokenizer...")
+            get_encoding()
+
+            if os.getenv("COGITO_RERANKER") == "1":
+                self.update("Loading reranker...")
+                get_reranker()
+
+            self.update("Connecting to dbs...")
+            agent = ResearchAgent()
+
+            self.update("Building agent...")
+            agent.build()
+
+            self._future.set_result(agent)
+        except BaseException as e:
+            self._future.set_exception(e)
@@ -0,0 +1,112 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator
+
+from langchain_core.messages import AIMessage, messages_from_dict, messages_to_dict
+
+from ai.research_agent.CancellationToken import CancellationToken
+from ai.research_agent.ResearchAgent import ResearchAgent
+from dbs.Postgres import Postgres
+from embed.MicroBatchingEmbedder import MicroBatchingEmbedder
+
+
+class BatchScheduler:
+    """Runs batches of conversations through one shared, warm agent on a thread pool.
+
+    Unlike `Complete`, which hands each conversation to its own worker process, a batch runs on threads in the server
+    process so every run shares one agent: the same DB connections, the same LLM response cache, and one embedder that
+    merges concurrent embedding calls across conversations into single requests. Conversations are loaded in one query
+    and results are written back in bulk.
+    """
+
+    # --- Methods ---
+    def __init__(self, postgres_db: Postgres, agent_factory: Callable[[], ResearchAgent], workers: int = 8,
+                 flush_every: int = 16, flush_interval: float = 2.0):
+        """Initialize; the shared agent is built on the first batch."""
+
+        self.postgres_db = postgres_db
+        self.agent_factory = agent_factory
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self._agent: ResearchAgent | None = None
+        self._agent_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cogito-batch")
+
+    def run(self, keys: list[tuple[str, str]],
+            cancellation: CancellationToken | None = None) -> Iterator[tuple[str, str, str]]:
+        """Complete every (user_id, conversation_id) and yield (user_id, conversation_id, status) as each finishes.
+
+        "Success" is only reported once the conversation has been written back. Once `cancellation` fires, runs still
+        in progress stop and report an error.
+        """
+
+        agent = self._get_agent()
+        conversations = self.postgres_db.get_conversations(keys)
+
+        futures = {}
+        for user_id, conversation_id in keys:
+            conversation = conversations.get((int(user_id), int(conversation_id)))
+            if conversation is None:
+                yield user_id, conversation_id, "Error: conversation not found"
+                continue
+
+            messages = messages_from_dict(conversation)
+            future = self._executor.submit(agent.run, messages, status=None, cancellation=cancellation)
+            futures[future] = (user_id, conversation_id, messages)
+
+        pending_writes = []
+        last_flush = time.monotonic()
+
+        for future in as_completed(futures):
+            user_id, conversation_id, messages = futures[future]
+            try:
+                output = future.result().get("response")
+            except Exception as e:
+                print("Error during batch item:", user_id, conversation_id, str(e))
+                yield user_id, conversation_id, f"Error: {str(e)}"
+                continue
+
+            messages.append(AIMessage(content=output))
+            pending_writes.append((user_id, conversation_id, messages_to_dict(messages)))
+
+            if len(pending_writes) >= self.flush_every or time.monotonic() - last_flush >= self.flush_interval:
+                yield from self._flush(pending_writes)
+                pending_writes = []
+                last_flush = time.monotonic()
+
+        yield from self._flush(pending_writes)
+
+    def close(self):
+        """Stop the worker threads and close the shared agent."""
+
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._agent is not None:
+            self._agent.close()
+
+    def _get_agent(self) -> ResearchAgent:
+        """Build the shared agent once, with its embedder wrapped to merge concurrent calls."""
+
+        with self._agent_lock:
+            if self._agent is None:
+                agent = self.agent_factory()
+                agent.qdrant.embedder = MicroBatchingEmbedder(agent.qdrant.embedder)
+                self._agent = agent
+        return self._agent
+
+    def _flush(self, pending_writes: list[tuple[str, str, list[dict]]]) -> Iterator[tuple[str, str, str]]:
+        """Write finished conversations back in bulk and report their status."""
+
+        if not pending_writes:
+            return
+
+        try:
+            self.postgres_db.update_conversations(pending_writes)
+            status = "Success"
+        except Exception as e:
+            print("Error during batch write:", str(e))
+            status = f"Error: {str(e)}"
+
+        for user_id, conversation_id, _ in pending_writes:
+            yield user_id, conversation_id, status
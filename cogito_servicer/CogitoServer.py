@@ -1,19 +1,61 @@
-from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from typing import Callable
 
-from langchain_core.messages import AnyMessage, messages_from_dict, AIMessage
+from langchain_core.messages import AnyMessage, messages_from_dict, messages_to_dict, AIMessage, message_to_dict
 
+from ai.research_agent.CancellationToken import CancellationToken, RunCancelled
 from ai.research_agent.ResearchAgent import ResearchAgent
-from cogito_servicer import cogito_pb2_grpc
+from cogito_servicer import cogito_pb2, cogito_pb2_grpc
+from cogito_servicer.BatchScheduler import BatchScheduler
+from cogito_servicer.ConversationCache import get_conversation_cache
 from dbs.Postgres import Postgres
+from telemetry.tracing import RunCollector, add_sink, emit_recorded_run
 
-# Global process pool for handling requests
-process_pool = ProcessPoolExecutor(max_workers=4)
+# Attempts at writing a completed conversation back when other writers keep changing it
+STORE_ATTEMPTS = 3
 
+# Agent owned by the current process-pool worker (built once per worker by `_init_worker`)
+_worker_agent: ResearchAgent | None = None
+# Runs traced in the current worker, shipped back to the server process with each result
+_worker_runs: RunCollector | None = None
 
-def _run_agent_task(agent: ResearchAgent, conversation: list[AnyMessage]) -> str:
-    """Helper function to run the agent task in a separate process."""
 
-    return agent.run(conversation).get("response")
+def build_agent() -> ResearchAgent:
+    """Default agent factory: a Research Agent connected to the configured Qdrant and Postgres."""
+
+    agent = ResearchAgent()
+    agent.build()
+    return agent
+
+def _init_worker(agent_factory: Callable[[], ResearchAgent]):
+    """Process-pool initializer: build this worker's agent once so requests find it warm.
+
+    The agent can't be shipped to workers per request: its compiled graph and DB clients aren't picklable.
+    """
+
+    global _worker_agent, _worker_runs
+    _worker_runs = RunCollector()
+    add_sink(_worker_runs)
+    _worker_agent = agent_factory()
+
+def _run_agent_task(conversation: list[AnyMessage], summary: tuple[str, int] | None = None,
+                    cancellation: CancellationToken | None = None) -> tuple[str, tuple[str, int] | None, list[dict]]:
+    """Helper function to run the agent task in a separate process. Returns the response, the conversation summary
+    the run used (if any) so the next turn can reuse it, and the run's trace for the server process's exporters."""
+
+    _worker_runs.take()
+    output = _worker_agent.run(conversation, status=None, summary=summary, cancellation=cancellation)
+    runs = _worker_runs.take()
+    if output.get("conversation_summary"):
+        return output.get("response"), (output["conversation_summary"], output["summarized_messages"]), runs
+    return output.get("response"), None, runs
+
+def _worker_ready() -> bool:
+    """No-op task used to start workers ahead of traffic."""
+
+    return _worker_agent is not None
 
 def _convert_conversation(conversation: list[dict]) -> list[AnyMessage]:
     """Convert a conversation from dict format to AnyMessage format."""
@@ -24,13 +66,83 @@ def _convert_conversation(conversation: list[dict]) -> list[AnyMessage]:
 class CogitoServer(cogito_pb2_grpc.CogitoServicer):
     """gRPC servicer for the Cogito AI research assistant."""
 
-    def __init__(self, agent: ResearchAgent, postgres_db: Postgres):
-        """Initialize the CogitoServer with a ResearchAgent and Postgres database."""
+    def __init__(self, postgres_db: Postgres, agent_factory: Callable[[], ResearchAgent] = build_agent,
+                 max_workers: int = 4, batch_workers: int = 8):
+        """Initialize the CogitoServer with a Postgres database and a pool of agent worker processes.
 
+        `agent_factory` must be a picklable (module-level) callable; each worker process calls it once. It is also used
+        to build the agent shared by `CompleteBatch`'s `batch_workers` threads.
+        """
 
         print("Initializing CogitoServer...")
-        self.agent = agent
         self.postgres_db = postgres_db
+        self.max_workers = max_workers
+        # Workers are spawned by `warm_up()`, which `Server.start` calls before `server.start()`, so no gRPC threads
+        # exist yet when they start (forking a process with live gRPC threads is unsafe)
+        self.process_pool = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker, initargs=(agent_factory,)
+        )
+        self.batch_scheduler = BatchScheduler(postgres_db, agent_factory, workers=batch_workers)
+        self.conversation_cache = get_conversation_cache(postgres_db)
+
+        # Serves the events that let a request cancel its run inside a worker process (started on first use)
+        self._manager = None
+        self._manager_lock = threading.Lock()
+
+    def warm_up(self):
+        """Start every worker process and build its agent before the first request arrives."""
+
+        # Submitting one task per worker at once makes the pool spawn all of them
+        ready = [self.process_pool.submit(_worker_ready) for _ in range(self.max_workers)]
+        for future in ready:
+            future.result()
+        self._get_manager()
+
+    def close(self):
+        """Shut down the agent workers, the batch scheduler and the cancellation event manager."""
+
+        self.process_pool.shutdown(wait=True, cancel_futures=True)
+        self.batch_scheduler.close()
+        if self._manager is not None:
+            self._manager.shutdown()
+
+    def _get_manager(self):
+        """Process serving cancellation events shared with the worker processes."""
+
+        with self._manager_lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            return self._manager
+
+    def _cancellation_token(self, context, cross_process: bool) -> CancellationToken | None:
+        """Token that fires when the RPC ends (client disconnect, cancellation) or its deadline passes."""
+
+        if context is None:
+            return None
+
+        event = self._get_manager().Event() if cross_process else None
+
+        token = CancellationToken(timeout=context.time_remaining(), event=event)
+        # Callbacks run when the RPC terminates for any reason; after a normal return there's nothing left to stop
+        if not context.add_callback(token.cancel):
+            token.cancel()
+        return token
+
+    def _run(self, conversation: list[AnyMessage], summary, context) -> tuple[str, tuple[str, int] | None]:
+        """Run the agent on a worker process, abandoning the run if the RPC goes away first. The worker's trace is
+        handed to this process's exporters."""
+
+        token = self._cancellation_token(context, cross_process=True)
+        future = self.process_pool.submit(_run_agent_task, conversation, summary, token)
+        if context is not None:
+            # A request still queued for a worker never starts
+            context.add_callback(future.cancel)
+
+        response, summary, runs = future.result()
+        for run in runs:
+            emit_recorded_run(run)
+        return response, summary
 
     def Complete(self, request, context):
         """Handle the Ask gRPC method to process user questions."""
@@ -42,24 +154,87 @@ class CogitoServer(cogito_pb2_grpc.CogitoServicer):
 
             print("Attempting to complete conversation for user:", user_id, "conversation:", conversation_id)
 
+            if self.conversation_cache is not None:
+                return self._complete_cached(user_id, conversation_id, context)
+
             # Retrieve the conversation from the Postgres database
             conversation = self.postgres_db.get_conversation(user_id, conversation_id)
             conversation = _convert_conversation(conversation)
 
             # Run the agent in a separate process
-            future = process_pool.submit(_run_agent_task, self.agent, conversation)
-            output = future.result()
+            output, _ = self._run(conversation, None, context)
             conversation.append(AIMessage(content=output))
 
             print("Completed conversation for user:", user_id, "conversation:", conversation_id)
 
             # Convert conversation back to dict format and store
-            conversation = [msg.to_dict() for msg in conversation]
+            conversation = messages_to_dict(conversation)
             self.postgres_db.update_conversation(user_id, conversation_id, conversation)
 
-            return "Success"
+            return cogito_pb2.Status(status="Success")
+
+        except (RunCancelled, CancelledError) as e:
+            print("Abandoned conversation for user:", request.user_id, "conversation:", request.conversation_id)
+
+            return cogito_pb2.Status(status=f"Error: {str(e) or 'Run cancelled'}")
 
         except Exception as e:
             print("Error during Complete:", str(e))
 
-            return f"Error: {str(e)}"
+            return cogito_pb2.Status(status=f"Error: {str(e)}")
+
+    def _complete_cached(self, user_id, conversation_id, context):
+        """`Complete` through the conversation cache: recently completed conversations skip the full read and parse,
+        and the summary of their earlier messages is reused."""
+
+        conversation = self.conversation_cache.load(user_id, conversation_id)
+        if conversation is None:
+            raise ValueError("conversation not found")
+
+        # Run the agent in a separate process
+        output, summary = self._run(conversation["messages"], conversation["summary"], context)
+
+        print("Completed conversation for user:", user_id, "conversation:", conversation_id)
+
+        response = AIMessage(content=output)
+        response_dict = message_to_dict(response)
+        summarized = conversation["message_dicts"][:summary[1]] if summary else None
+
+        # Write through, conditional on the version read; if another writer changed the conversation meanwhile,
+        # reload it and append the response to the fresh copy
+        for attempt in range(STORE_ATTEMPTS):
+            if attempt:
+                print("Conversation changed while completing, retrying:", user_id, conversation_id)
+                conversation = self.conversation_cache.load(user_id, conversation_id)
+                if conversation is None:
+                    raise ValueError("conversation deleted while completing")
+
+            conversation["messages"].append(response)
+            conversation["message_dicts"].append(response_dict)
+            # The summary only carries over if the messages it covers are unchanged
+            fresh = summary is not None and conversation["message_dicts"][:summary[1]] == summarized
+            conversation["summary"] = summary if fresh else None
+
+            if self.conversation_cache.store(user_id, conversation_id, conversation):
+                return cogito_pb2.Status(status="Success")
+
+        print("Gave up storing conversation after repeated conflicts:", user_id, conversation_id)
+        return cogito_pb2.Status(status=f"Error: conversation kept changing, response not saved after "
+                                        f"{STORE_ATTEMPTS} attempts")
+
+    def CompleteBatch(self, request, context):
+        """Handle the CompleteBatch gRPC method, streaming back each conversation's status as it finishes."""
+
+        keys = [(c.user_id, c.conversation_id) for c in request.conversations]
+        print(f"Attempting to complete a batch of {len(keys)} conversations")
+
+        try:
+            cancellation = self._cancellation_token(context, cross_process=False)
+            for user_id, conversation_id, status in self.batch_scheduler.run(keys, cancellation=cancellation):
+                yield cogito_pb2.BatchItemStatus(user_id=user_id, conversation_id=conversation_id, status=status)
+
+        except Exception as e:
+            print("Error during CompleteBatch:", str(e))
+
+            # Anything not yet reported failed with the batch
+            yield cogito_pb2.BatchItemStatus(status=f"Error: {str(e)}")
@@ -0,0 +1,143 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import TypedDict
+
+from langchain_core.messages import AnyMessage, messages_from_dict
+
+from dbs.Postgres import Postgres
+
+DEFAULT_MAX_CONVERSATIONS = 256
+
+
+class CachedConversation(TypedDict):
+    """A conversation as last read or written by this server."""
+
+    version: int                            # Row version it was read or written at
+    digest: str                             # Postgres' digest of the messages at that version
+    messages: list[AnyMessage]              # Parsed messages
+    message_dicts: list[dict]               # The same messages as stored
+    summary: tuple[str, int] | None         # Summary of the first N messages from the agent's last run (text, N)
+
+
+class ConversationCache:
+    """Bounded LRU of recently active conversations with write-through to Postgres.
+
+    Entries are validated against the row's version column (see `dbs/conversations_version.sql`) on every read. If
+    the conversation is unchanged it is used as is; if messages were only appended (the usual back-and-forth), which
+    is checked with a digest of the whole cached prefix, just the new ones are fetched and parsed. Writes are conditional on the version read, so replicas never silently overwrite
+    each other.
+    """
+
+    # --- Methods ---
+    def __init__(self, postgres_db: Postgres, max_entries: int | None = None):
+        """Initialize the cache. The size defaults to COGITO_CONVERSATION_CACHE_SIZE."""
+
+        if max_entries is None:
+            max_entries = int(os.getenv("COGITO_CONVERSATION_CACHE_SIZE", DEFAULT_MAX_CONVERSATIONS))
+
+        self.postgres_db = postgres_db
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lru: OrderedDict[tuple[int, int], CachedConversation] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, user_id: str | int, conversation_id: str | int) -> CachedConversation | None:
+        """Current version of a conversation, served from cache where possible. None if it doesn't exist."""
+
+        key = (int(user_id), int(conversation_id))
+        with self._lock:
+            cached = self._lru.get(key)
+
+        if cached is not None:
+            row = self.postgres_db.get_conversation_tail(
+                user_id, conversation_id, cached["version"], len(cached["message_dicts"])
+            )
+            if row is None:
+                self.evict(user_id, conversation_id)
+                return None
+
+            version, prefix_digest, digest, tail = row
+            if version == cached["version"]:
+                self.hits += 1
+                return self._copy(cached)
+
+            # Appended to since our copy, with every cached message unchanged: parse only the new messages
+            if prefix_digest == cached["digest"]:
+                self.hits += 1
+                return {
+                    "version": version,
+                    "digest": digest,
+                    "messages": cached["messages"] + messages_from_dict(tail),
+                    "message_dicts": cached["message_dicts"] + tail,
+                    "summary": cached["summary"]
+                }
+
+        # Not cached, or changed in some other way than appending
+        self.misses += 1
+        row = self.postgres_db.get_conversation_versioned(user_id, conversation_id)
+        if row is None:
+            return None
+        version, digest, message_dicts = row
+        return {"version": version, "digest": digest, "messages": messages_from_dict(message_dicts),
+                "message_dicts": message_dicts, "summary": None}
+
+    def store(self, user_id: str | int, conversation_id: str | int, conversation: CachedConversation) -> bool:
+        """Write a conversation through to Postgres if it's still at the version it was loaded at, and cache it.
+
+        Returns False (and drops the cached copy) if another writer got there first.
+        """
+
+        row = self.postgres_db.update_conversation_versioned(
+            user_id, conversation_id, conversation["message_dicts"], conversation["version"]
+        )
+        if row is None:
+            self.evict(user_id, conversation_id)
+            return False
+
+        conversation["version"], conversation["digest"] = row
+        self._remember((int(user_id), int(conversation_id)), conversation)
+        return True
+
+    def evict(self, user_id: str | int, conversation_id: str | int):
+        """Drop a conversation from the cache."""
+
+        with self._lock:
+            self._lru.pop((int(user_id), int(conversation_id)), None)
+
+    def _remember(self, key: tuple[int, int], conversation: CachedConversation):
+        """Insert into the LRU, evicting the least recently used entry if full."""
+
+        with self._lock:
+            self._lru[key] = self._copy(conversation)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    @staticmethod
+    def _copy(conversation: CachedConversation) -> CachedConversation:
+        """Copy with its own message lists, so appending to a loaded conversation never touches the cached one."""
+
+        return {**conversation, "messages": list(conversation["messages"]),
+                "message_dicts": list(conversation["message_dicts"])}
+
+
+def get_conversation_cache(postgres_db: Postgres) -> ConversationCache | None:
+    """Conversation cache for the servicer, or None if COGITO_CONVERSATION_CACHE_SIZE=0 or the conversations table
+    has no version column yet."""
+
+    if int(os.getenv("COGITO_CONVERSATION_CACHE_SIZE", DEFAULT_MAX_CONVERSATIONS)) <= 0:
+        return None
+
+    try:
+        versioned = postgres_db.has_conversation_versions()
+    except Exception as e:
+        print("Could not check the conversations table for a version column:", str(e))
+        return None
+    if not versioned:
+        print("Conversation cache disabled: apply dbs/conversations_version.sql to enable it.")
+        return None
+
+    return ConversationCache(postgres_db)
@@ -1,33 +1,38 @@
 from concurrent import futures
+from typing import Callable
 
 import grpc
 
 from ai.research_agent.ResearchAgent import ResearchAgent
 from cogito_servicer import cogito_pb2_grpc
-from cogito_servicer.CogitoServer import CogitoServer
+from cogito_servicer.CogitoServer import CogitoServer, build_agent
 from dbs.Postgres import Postgres
+from telemetry.exporters import configure_exporters_from_env
 
 
 class Server:
     """gRPC server for the Cogito service."""
 
-    def __init__(self, agent: ResearchAgent = None, postgres_db: Postgres = None):
-        """Initialize and start the gRPC server for the Cogito service."""
+    def __init__(self, postgres_db: Postgres = None, agent_factory: Callable[[], ResearchAgent] = build_agent,
+                 max_workers: int = 4, max_threads: int = 10, batch_workers: int = 8, port: int = 50051):
+        """Initialize and start the gRPC server for the Cogito service.
+
+        `agent_factory` is called once in each of the `max_workers` agent worker processes, and once for the agent
+        shared by the `batch_workers` threads serving `CompleteBatch`.
+        """
 
         print("Initializing Cogito gRPC server...")
 
+        self.port = port
+
+        # Exporters live in this process only; agent workers send their runs back here (see `CogitoServer._run`)
+        configure_exporters_from_env()
+
         # Create gRPC server
         self.server = grpc.server(
-            futures.ThreadPoolExecutor(max_workers=10)
+            futures.ThreadPoolExecutor(max_workers=max_threads)
         )
 
-        print("Building agent...")
-
-        # Build agent
-        if agent is None:
-            agent = ResearchAgent()
-            agent.build()
-
         print("Initializing database...")
         # Initialize database
         if postgres_db is None:
@@ -35,15 +40,27 @@ class Server:
 
         print("Adding Cogito servicer to server...")
 
-        # Add Cogito servicer to server
-        servicer = CogitoServer(agent, postgres_db)
-        cogito_pb2_grpc.add_CogitoServicer_to_server(servicer, self.server)
+        # Add Cogito servicer to server (agents are built inside the worker processes)
+        self.servicer = CogitoServer(
+            postgres_db, agent_factory=agent_factory, max_workers=max_workers, batch_workers=batch_workers
+        )
+        cogito_pb2_grpc.add_CogitoServicer_to_server(self.servicer, self.server)
 
-    def start(self):
+    def start(self, wait: bool = True):
         """Start the gRPC server and listen for requests."""
 
-        print("Starting Cogito gRPC server on port 50051...")
+        print("Starting agent workers...")
+        self.servicer.warm_up()
+
+        print(f"Starting Cogito gRPC server on port {self.port}...")
 
-        self.server.add_insecure_port("[::]:50051")
+        self.server.add_insecure_port(f"[::]:{self.port}")
         self.server.start()
-        self.server.wait_for_termination()
+        if wait:
+            self.server.wait_for_termination()
+
+    def stop(self, grace: float | None = None):
+        """Stop the gRPC server and shut down the agent workers."""
+
+        self.server.stop(grace).wait()
+        self.servicer.close()
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1c\x63ogito_servicer/cogito.proto\x12\x06\x63ogito\"8\n\x0c\x43onversation\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x17\n\x0f\x63onversation_id\x18\x02 \x01(\t\"\x18\n\x06Status\x12\x0e\n\x06status\x18\x01 \x01(\t2:\n\x06\x43ogito\x12\x30\n\x08\x43omplete\x12\x14.cogito.Conversation\x1a\x0e.cogito.Statusb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1c\x63ogito_servicer/cogito.proto\x12\x06\x63ogito\"8\n\x0c\x43onversation\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x17\n\x0f\x63onversation_id\x18\x02 \x01(\t\"\x18\n\x06Status\x12\x0e\n\x06status\x18\x01 \x01(\t\"@\n\x11\x43onversationBatch\x12+\n\rconversations\x18\x01 \x03(\x0b\x32\x14.cogito.Conversation\"K\n\x0f\x42\x61tchItemStatus\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x17\n\x0f\x63onversation_id\x18\x02 \x01(\t\x12\x0e\n\x06status\x18\x03 \x01(\t2\x81\x01\n\x06\x43ogito\x12\x30\n\x08\x43omplete\x12\x14.cogito.Conversation\x1a\x0e.cogito.Status\x12\x45\n\rCompleteBatch\x12\x19.cogito.ConversationBatch\x1a\x17.cogito.BatchItemStatus0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,6 +35,10 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_CONVERSATION']._serialized_end=96
   _globals['_STATUS']._serialized_start=98
   _globals['_STATUS']._serialized_end=122
-  _globals['_COGITO']._serialized_start=124
-  _globals['_COGITO']._serialized_end=182
+  _globals['_CONVERSATIONBATCH']._serialized_start=124
+  _globals['_CONVERSATIONBATCH']._serialized_end=188
+  _globals['_BATCHITEMSTATUS']._serialized_start=190
+  _globals['_BATCHITEMSTATUS']._serialized_end=265
+  _globals['_COGITO']._serialized_start=268
+  _globals['_COGITO']._serialized_end=397
 # @@protoc_insertion_point(module_scope)
@@ -39,6 +39,11 @@ class CogitoStub(object):
                 request_serializer=cogito__servicer_dot_cogito__pb2.Conversation.SerializeToString,
                 response_deserializer=cogito__servicer_dot_cogito__pb2.Status.FromString,
                 _registered_method=True)
+        self.CompleteBatch = channel.unary_stream(
+                '/cogito.Cogito/CompleteBatch',
+                request_serializer=cogito__servicer_dot_cogito__pb2.ConversationBatch.SerializeToString,
+                response_deserializer=cogito__servicer_dot_cogito__pb2.BatchItemStatus.FromString,
+                _registered_method=True)
 
 
 class CogitoServicer(object):
@@ -50,6 +55,12 @@ class CogitoServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def CompleteBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_CogitoServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -58,6 +69,11 @@ def add_CogitoServicer_to_server(servicer, server):
                     request_deserializer=cogito__servicer_dot_cogito__pb2.Conversation.FromString,
                     response_serializer=cogito__servicer_dot_cogito__pb2.Status.SerializeToString,
             ),
+            'CompleteBatch': grpc.unary_stream_rpc_method_handler(
+                    servicer.CompleteBatch,
+                    request_deserializer=cogito__servicer_dot_cogito__pb2.ConversationBatch.FromString,
+                    response_serializer=cogito__servicer_dot_cogito__pb2.BatchItemStatus.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'cogito.Cogito', rpc_method_handlers)
@@ -95,3 +111,30 @@ class Cogito(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def CompleteBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/cogito.Cogito/CompleteBatch',
+            cogito__servicer_dot_cogito__pb2.ConversationBatch.SerializeToString,
+            cogito__servicer_dot_cogito__pb2.BatchItemStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
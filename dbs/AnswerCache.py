@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+from qdrant_client import models
+from qdrant_client.http.models import FieldCondition, Filter, MatchValue, Range
+
+from ai.research_agent.schemas.QueryResult import QueryResult
+from telemetry.tracing import span
+
+DEFAULT_THRESHOLD = 0.95
+DEFAULT_TTL = 7 * 24 * 3600
+
+# How long the collection's point count is trusted before it's fetched again
+CORPUS_CHECK_INTERVAL = 60
+
+
+class AnswerCache:
+    """Semantic cache of whole answers to first-turn questions, kept in a Qdrant collection next to the corpus.
+
+    Entries are keyed by the embedding of the normalized question and tagged with a corpus version (the collection's
+    name and point count plus a hash of the Postgres filters), so ingesting books or changing filters invalidates them.
+    """
+
+    # --- Methods ---
+    def __init__(self, qdrant, threshold: float | None = None, ttl: float | None = None):
+        """Initialize the cache. Defaults come from COGITO_ANSWER_CACHE_THRESHOLD and COGITO_ANSWER_CACHE_TTL."""
+
+        # The embedder is read from `qdrant` at use time, so wrappers installed later (e.g. micro-batching) apply
+        self.qdrant = qdrant
+        self.client = qdrant.client
+        self.filters = qdrant.postgres_client
+        self.corpus_collection = qdrant.collection
+        self.collection = f"{qdrant.collection}_answers"
+
+        if threshold is None:
+            threshold = float(os.getenv("COGITO_ANSWER_CACHE_THRESHOLD", DEFAULT_THRESHOLD))
+        if ttl is None:
+            ttl = float(os.getenv("COGITO_ANSWER_CACHE_TTL", DEFAULT_TTL))
+        self.threshold = threshold
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._ready = False
+        self._points_count = None
+        self._points_checked_at = 0.0
+        self._filters_seen = None
+        self._filters_hash = ""
+
+    @staticmethod
+    def normalize(question: str) -> str:
+        """Lowercase, collapse whitespace and drop trailing punctuation."""
+
+        return re.sub(r"\s+", " ", question).strip().lower().rstrip("?!.;: ")
+
+    def embed(self, question: str) -> list[float]:
+        """Embedding of the normalized question (the cache key)."""
+
+        return self.qdrant.embedder.embed_batch([self.normalize(question)])[0]
+
+    def lookup(self, vector: list[float]) -> dict | None:
+        """Return the closest live entry for the current corpus if it clears the similarity threshold, else None."""
+
+        with span("answer_cache", "lookup"):
+            self._ensure_collection()
+            response = self.client.query_points(
+                collection_name=self.collection,
+                query=vector,
+                query_filter=Filter(must=[
+                    FieldCondition(key="corpus_version", match=MatchValue(value=self.corpus_version())),
+                    FieldCondition(key="expires_at", range=Range(gte=time.time()))
+                ]),
+                limit=1,
+                score_threshold=self.threshold,
+                with_payload=True
+            )
+
+        if not response.points:
+            return None
+
+        payload = response.points[0].payload
+        return {
+            "question": payload["question"],
+            "response": payload["response"],
+            "research_effort": payload["research_effort"],
+            "query_results": [
+                {**result, "result": tuple(result["result"])} for result in json.loads(payload["query_results"])
+            ]
+        }
+
+    def store(self, vector: list[float], question: str, response: str, research_effort: int,
+              query_results: list[QueryResult]):
+        """Cache an answer and its citations, pruning expired entries and ones from older corpus versions."""
+
+        version = self.corpus_version()
+        now = time.time()
+
+        # Only results that cite a source are kept (their texts are not stored)
+        citations = [
+            {"id": r["id"], "query": r["query"], "source": r["source"], "result": list(r["result"])}
+            for r in query_results if type(r.get("result")) == tuple
+        ]
+
+        normalized = self.normalize(question)
+        point = models.PointStruct(
+            id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"{version}:{normalized}")),
+            vector=vector,
+            payload={
+                "question": normalized,
+                "response": response,
+                "research_effort": research_effort,
+                "query_results": json.dumps(citations),
+                "corpus_version": version,
+                "expires_at": now + self.ttl
+            }
+        )
+
+        with span("answer_cache", "store"):
+            self._ensure_collection()
+            self.client.upsert(collection_name=self.collection, points=[point], wait=False)
+            self.client.delete(
+                collection_name=self.collection,
+                points_selector=models.FilterSelector(filter=Filter(should=[
+                    FieldCondition(key="expires_at", range=Range(lt=now)),
+                    Filter(must_not=[FieldCondition(key="corpus_version", match=MatchValue(value=version))])
+                ])),
+                wait=False
+            )
+
+    def invalidate(self):
+        """Drop every cached answer."""
+
+        with self._lock:
+            if self.client.collection_exists(self.collection):
+                self.client.delete_collection(self.collection)
+            self._ready = False
+
+    def corpus_version(self) -> str:
+        """Fingerprint of what answers were researched against: the collection, its size and the filters."""
+
+        with self._lock:
+            now = time.monotonic()
+            if self._points_count is None or now - self._points_checked_at > CORPUS_CHECK_INTERVAL:
+                self._points_count = self.client.get_collection(self.corpus_collection).points_count
+                self._points_checked_at = now
+
+            # Postgres swaps in a new dict when the filters change, so identity tells us when to rehash
+            author_sources = self.filters.author_sources
+            if author_sources is not self._filters_seen:
+                filters_json = json.dumps(author_sources, sort_keys=True)
+                self._filters_hash = hashlib.blake2b(filters_json.encode("utf-8"), digest_size=8).hexdigest()
+                self._filters_seen = author_sources
+
+            return f"{self.corpus_collection}:{self._points_count}:{self._filters_hash}"
+
+    def _ensure_collection(self):
+        """Create the cache collection (sized for the embedder, indexed on the filter fields) on first use."""
+
+        with self._lock:
+            if self._ready:
+                return
+
+            if not self.client.collection_exists(self.collection):
+                self.client.create_collection(
+                    collection_name=self.collection,
+                    vectors_config=models.VectorParams(
+                        size=self.qdrant.embedder.dimensions, distance=models.Distance.COSINE
+                    )
+                )
+                self.client.create_payload_index(
+                    collection_name=self.collection, field_name="corpus_version",
+                    field_schema=models.PayloadSchemaType.KEYWORD, wait=True
+                )
+                self.client.create_payload_index(
+                    collection_name=self.collection, field_name="expires_at",
+                    field_schema=models.PayloadSchemaType.FLOAT, wait=True
+                )
+            self._ready = True
+
+
+def get_answer_cache(qdrant) -> AnswerCache | None:
+    """Answer cache backed by `qdrant`, or None if it's turned off with COGITO_ANSWER_CACHE=0."""
+
+    if os.getenv("COGITO_ANSWER_CACHE", "1") == "0":
+        return None
+    return AnswerCache(qdrant)
@@ -1,9 +1,31 @@
 import json
 import os
 import threading
+import time
 
 import psycopg2
 import select
+from psycopg2.extras import execute_batch
+
+# Notifications arriving within this many seconds of each other are applied together, but no burst is held back for
+# longer than FILTERS_MAX_DELAY
+FILTERS_DEBOUNCE = float(os.getenv("COGITO_FILTERS_DEBOUNCE", "0.1"))
+FILTERS_MAX_DELAY = 1.0
+
+
+
+def _digest_sql(prefix_length: str | None = None) -> str:
+    """SQL for the md5 of a conversation's messages, or of its first `prefix_length` (an SQL expression) messages.
+
+    Computed by Postgres from the stored JSON, so the same messages always give the same digest whichever client wrote
+    them.
+    """
+
+    bound = f"WHERE i <= {prefix_length}" if prefix_length is not None else ""
+    return (
+        f"(SELECT md5(COALESCE(json_agg(e ORDER BY i), '[]'::json)::text) "
+        f"FROM json_array_elements(conversation::json) WITH ORDINALITY AS t(e, i) {bound})"
+    )
 
 
 class Postgres:
@@ -29,6 +51,7 @@ class Postgres:
 
         # Dict: author -> list of sources
         self.author_sources: dict[str, list[str]] = {}
+        self._all_sources: tuple[dict, list[str]] | None = None
 
         self._update_filters()
 
@@ -46,7 +69,7 @@ class Postgres:
         thread.start()
 
     def _listen_loop(self):
-        """Internal loop to listen for PostgreSQL notifications."""
+        """Internal loop to listen for PostgreSQL notifications, applying each burst of them as one update."""
 
         # Create a separate connection for listening
         listen_conn = psycopg2.connect(**self._conn_params)
@@ -54,6 +77,9 @@ class Postgres:
         cur = listen_conn.cursor()
         cur.execute("LISTEN filters_changes;")
 
+        # Catch changes made between the initial load and LISTEN
+        self._update_filters(listen_conn)
+
         # Listen for notifications indefinitely
         try:
             while True:
@@ -61,19 +87,67 @@ class Postgres:
                 if select.select([listen_conn], [], [], 1) == ([], [], []):
                     continue
 
-                listen_conn.poll()
+                # Keep collecting until the burst goes quiet (or has been held for FILTERS_MAX_DELAY)
+                payloads = []
+                deadline = time.monotonic() + FILTERS_MAX_DELAY
+                while True:
+                    listen_conn.poll()
+                    while listen_conn.notifies:
+                        payloads.append(listen_conn.notifies.pop(0).payload)
+
+                    wait = min(FILTERS_DEBOUNCE, deadline - time.monotonic())
+                    if wait <= 0 or select.select([listen_conn], [], [], wait) == ([], [], []):
+                        break
 
-                while listen_conn.notifies:
-                    _ = listen_conn.notifies.pop(0)
-                    self._update_filters()
+                self._apply_notifications(payloads, listen_conn)
         finally:
             cur.close()
             listen_conn.close()
 
-    def _update_filters(self) -> None:
-        """Update the dict of authors to sources from the database."""
+    def _apply_notifications(self, payloads: list[str], conn) -> None:
+        """Apply a burst of row-level deltas (see `dbs/filters_notify.sql`) to a copy of the filters, then swap it in.
+
+        Falls back to re-reading the table if any notification isn't a delta (a TRUNCATE, an oversized row, or a
+        server without the row-level trigger).
+        """
+
+        deltas = []
+        for payload in payloads:
+            try:
+                delta = json.loads(payload)
+            except ValueError:
+                delta = None
+            if not isinstance(delta, dict) or delta.get("op") not in ("INSERT", "DELETE"):
+                self._update_filters(conn)
+                return
+            deltas.append(delta)
+
+        # Copy-on-write: only the touched authors' lists are rebuilt, and readers keep the old map until the swap
+        author_sources = dict(self.author_sources)
+        touched: dict[str, set[str]] = {}
+        for delta in deltas:
+            author, source = delta.get("author"), delta.get("source")
+            if author is None or source is None:
+                continue
+            if author not in touched:
+                touched[author] = set(author_sources.get(author, []))
+            if delta["op"] == "INSERT":
+                touched[author].add(source)
+            elif not delta.get("remaining"):
+                touched[author].discard(source)
+
+        for author, sources in touched.items():
+            if sources:
+                author_sources[author] = sorted(sources)
+            else:
+                author_sources.pop(author, None)
 
-        cur = self.conn.cursor()
+        self.author_sources = author_sources
+
+    def _update_filters(self, conn=None) -> None:
+        """Rebuild the dict of authors to sources from the database (on `conn`, default the main connection)."""
+
+        cur = (conn or self.conn).cursor()
         cur.execute(f"SELECT author, source FROM {self.filters_table};")
         rows = cur.fetchall()
 
@@ -86,11 +160,25 @@ class Postgres:
                 tmp[author] = set()
             tmp[author].add(source)
 
-        # Convert sets to sorted lists for stable order
+        # Convert sets to sorted lists for stable order (swapped in whole, so readers never see a partial map)
         self.author_sources = {a: sorted(list(sources)) for a, sources in tmp.items()}
 
         cur.close()
 
+    def add_filter(self, author: str, source: str) -> bool:
+        """Add an author/source pair to the filters table unless it's already there. Returns True if inserted."""
+
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                f"INSERT INTO {self.filters_table} (author, source) SELECT %s, %s "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {self.filters_table} WHERE author = %s AND source = %s);",
+                (author, source, author, source),
+            )
+            return cur.rowcount > 0
+        finally:
+            cur.close()
+
     def get_conversation(self, user_id: str | int, conversation_id: str | int):
         """Retrieve conversation data for a given user and conversation ID."""
 
@@ -124,6 +212,115 @@ class Postgres:
         finally:
             cur.close()
 
+    def has_conversation_versions(self) -> bool:
+        """Whether the conversations table has the version column from `dbs/conversations_version.sql`."""
+
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                "SELECT 1 FROM information_schema.columns WHERE table_name = %s AND column_name = 'version';",
+                (self.conversations_table,),
+            )
+            return cur.fetchone() is not None
+        finally:
+            cur.close()
+
+    def get_conversation_versioned(self, user_id: str | int,
+                                   conversation_id: str | int) -> tuple[int, str, list[dict]] | None:
+        """Retrieve a conversation with its version and digest, or None if it doesn't exist."""
+
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                f"SELECT version, {_digest_sql()}, conversation FROM {self.conversations_table} "
+                f"WHERE user_id = %s AND conversation_id = %s LIMIT 1;",
+                (int(user_id), int(conversation_id)),
+            )
+            row = cur.fetchone()
+            return (row[0], row[1], json.loads(row[2])) if row else None
+        finally:
+            cur.close()
+
+    def get_conversation_tail(self, user_id: str | int, conversation_id: str | int, version: int,
+                              known_length: int) -> tuple[int, str | None, str | None, list[dict] | None] | None:
+        """Fetch only what was appended to a conversation since `version`, when it held `known_length` messages.
+
+        Returns (current version, digest of the first `known_length` messages, digest of all messages, messages after
+        the first `known_length`). The last three are None if the version is unchanged. Returns None if the
+        conversation doesn't exist.
+        """
+
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                f"SELECT version, "
+                f"CASE WHEN version = %(version)s THEN NULL ELSE {_digest_sql('%(length)s')} END, "
+                f"CASE WHEN version = %(version)s THEN NULL ELSE {_digest_sql()} END, "
+                f"CASE WHEN version = %(version)s THEN NULL ELSE ("
+                f"SELECT COALESCE(json_agg(e ORDER BY i), '[]'::json) "
+                f"FROM json_array_elements(conversation::json) WITH ORDINALITY AS t(e, i) WHERE i > %(length)s"
+                f") END "
+                f"FROM {self.conversations_table} "
+                f"WHERE user_id = %(user_id)s AND conversation_id = %(conversation_id)s LIMIT 1;",
+                {"version": version, "length": known_length,
+                 "user_id": int(user_id), "conversation_id": int(conversation_id)},
+            )
+            row = cur.fetchone()
+            return (row[0], row[1], row[2], row[3]) if row else None
+        finally:
+            cur.close()
+
+    def update_conversation_versioned(self, user_id: str | int, conversation_id: str | int, messages: list[dict],
+                                      version: int) -> tuple[int, str] | None:
+        """Update a conversation only if it's still at `version`. Returns the new version and the conversation's
+        digest, or None on a conflict."""
+
+        cur = self.conn.cursor()
+        try:
+            payload = json.dumps(messages, ensure_ascii=False)
+            cur.execute(
+                f"UPDATE {self.conversations_table} SET conversation = %s, version = version + 1 "
+                f"WHERE user_id = %s AND conversation_id = %s AND version = %s RETURNING version, {_digest_sql()};",
+                (payload, int(user_id), int(conversation_id), version),
+            )
+            row = cur.fetchone()
+            return (row[0], row[1]) if row else None
+        finally:
+            cur.close()
+
+    def get_conversations(self, keys: list[tuple[str | int, str | int]]) -> dict[tuple[int, int], list[dict]]:
+        """Retrieve many conversations in one query, keyed by (user_id, conversation_id). Missing ones are omitted."""
+
+        if not keys:
+            return {}
+
+        keys = tuple((int(user_id), int(conversation_id)) for user_id, conversation_id in keys)
+
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                f"SELECT user_id, conversation_id, conversation FROM {self.conversations_table} "
+                f"WHERE (user_id, conversation_id) IN %s;",
+                (keys,),
+            )
+            return {(int(u), int(c)): json.loads(raw_data) for u, c, raw_data in cur.fetchall()}
+        finally:
+            cur.close()
+
+    def update_conversations(self, updates: list[tuple[str | int, str | int, list[dict]]]) -> None:
+        """Update many conversations, sending the UPDATEs in pages rather than one round trip each."""
+
+        cur = self.conn.cursor()
+        try:
+            execute_batch(
+                cur,
+                f"UPDATE {self.conversations_table} SET conversation = %s WHERE user_id = %s AND conversation_id = %s;",
+                [(json.dumps(messages, ensure_ascii=False), int(u), int(c)) for u, c, messages in updates],
+                page_size=100
+            )
+        finally:
+            cur.close()
+
     @property
     def all_authors(self) -> list[str]:
         """List of all authors."""
@@ -134,7 +331,11 @@ class Postgres:
     def all_sources(self) -> list[str]:
         """List of all unique sources."""
 
-        seen: set[str] = set()
-        for sources in self.author_sources.values():
-            seen.update(sources)
-        return sorted(seen)
+        # Computed once per version of the filters map
+        author_sources = self.author_sources
+        if self._all_sources is None or self._all_sources[0] is not author_sources:
+            seen: set[str] = set()
+            for sources in author_sources.values():
+                seen.update(sources)
+            self._all_sources = (author_sources, sorted(seen))
+        return self._all_sources[1]
@@ -6,11 +6,13 @@ from qdrant_client import QdrantClient, models
 from qdrant_client.http.models import MatchValue, FieldCondition, Filter
 from rapidfuzz import process
 
+from ai.models.tokens import count_tokens
 from ai.research_agent.schemas.Citation import Citation
 from ai.research_agent.schemas.QueryResult import QueryResult
 from dbs.Postgres import Postgres
 from dbs.QueryAndFilterSchemas import QueryAndFilters
-from embed.Embedder import Embedder
+from embed.embedders import get_embedder
+from telemetry.tracing import span
 
 # Cogito is meant to only be run in Docker compositions where Qdrant ports isn't publicly exposed or on local systems
 # without HTTPS. Change this and line #37 accordingly.
@@ -21,6 +23,16 @@ warnings.filterwarnings(
  module=r"dbs\.Qdrant",
 )
 
+# Searches rescore quantized candidates against the original vectors (no effect on collections without quantization)
+SEARCH_PARAMS = models.SearchParams(
+    hnsw_ef=int(os.getenv("COGITO_QDRANT_HNSW_EF")) if os.getenv("COGITO_QDRANT_HNSW_EF") else None,
+    quantization=models.QuantizationSearchParams(
+        rescore=True,
+        oversampling=float(os.getenv("COGITO_QDRANT_OVERSAMPLING", "2.0"))
+    )
+)
+
+
 class Qdrant:
     """Qdrant vector database client with fuzzy-matched filtering."""
 
@@ -31,12 +43,14 @@ class Qdrant:
         url = os.getenv("COGITO_QDRANT_URL")
         port = int(os.getenv("COGITO_QDRANT_PORT", "6334"))
         api_key = os.getenv("COGITO_QDRANT_API_KEY")
-        self.collection = os.getenv("COGITO_QDRANT_COLLECTION")
 
         # --- Initialize database clients ---
         self.client = QdrantClient(url=url, grpc_port=port, prefer_grpc=True, https=False, api_key=api_key)
         self.postgres_client = Postgres()
-        self.embedder = Embedder()
+        self.embedder = get_embedder()
+
+        # Each embedding backend/size has its own collection (the base collection holds full-size OpenAI embeddings)
+        self.collection = os.getenv("COGITO_QDRANT_COLLECTION") + self.embedder.collection_suffix
 
     def close(self):
         """Close Qdrant client connection."""
@@ -46,6 +60,12 @@ class Qdrant:
     def batch_query(self, queries: list[QueryAndFilters]) -> list[QueryResult]:
         """Batch query Qdrant with per-query fuzzy filters."""
 
+        with span("qdrant", "batch_query", batch_size=len(queries)):
+            return self._batch_query(queries)
+
+    def _batch_query(self, queries: list[QueryAndFilters]) -> list[QueryResult]:
+        """Untraced implementation of `batch_query`."""
+
         author_sources = self.postgres_client.author_sources
         all_authors = list(author_sources.keys())
         all_sources = self.postgres_client.all_sources
@@ -130,16 +150,18 @@ class Qdrant:
                     query=vector,
                     limit=1,
                     filter=filter_obj,
+                    params=SEARCH_PARAMS,
                     with_payload=True,
                     with_vector=False
                 )
             )
 
         # --- Execute all queries in a single batch ---
-        batch_results = self.client.query_batch_points(
-            collection_name=self.collection,
-            requests=search_requests
-        )
+        with span("qdrant", "query_batch_points"):
+            batch_results = self.client.query_batch_points(
+                collection_name=self.collection,
+                requests=search_requests
+            )
 
         # --- Convert Qdrant results into your desired payload lists ---
         seen_ids = set()
@@ -156,7 +178,75 @@ class Qdrant:
                     citation: Citation = {"title": source_title, "authors": [author], "source": "Project Gutenberg", "section": section}
 
                     result = (content, citation)
-                    r: QueryResult = {"id": int(uuid.uuid4()), "query": query, "source": "Project Gutenberg Vector DB", "result": result}
+                    r: QueryResult = {"id": int(uuid.uuid4()), "query": query, "source": "Project Gutenberg Vector DB", "result": result,
+                                     "score": point.score}
+                    if payload.get("chunk_index") is not None:
+                        r["chunk_index"] = payload["chunk_index"]
                     results_out.append(r)
 
         return results_out
+
+    def expand_context(self, hits: list[tuple[str, str, str, int]], window: int = 2,
+                       max_tokens: int = 600) -> list[tuple[list[str], list[str]]]:
+        """Fetch the text around retrieved chunks without another semantic search.
+
+        For each (author, title, section, chunk_index) hit, neighbours up to `window` positions either side within the
+        same book (author and title, as titles like "Essays" recur) and section are looked up in a single
+        payload-filtered scroll for all hits. The nearest neighbours are kept until `max_tokens` is reached. Returns one
+        (chunks before, chunks after) pair per hit, in book order.
+        """
+
+        if not hits:
+            return []
+
+        # Hits missing an author, title or section can't be matched on it (and MatchValue rejects None)
+        lookups = [hit for hit in hits if None not in hit]
+        points = []
+        if lookups:
+            with span("qdrant", "expand_context", batch_size=len(lookups)):
+                hit_filters = [
+                    Filter(must=[
+                        FieldCondition(key="author", match=MatchValue(value=author)),
+                        FieldCondition(key="title", match=MatchValue(value=title)),
+                        FieldCondition(key="section", match=MatchValue(value=section)),
+                        FieldCondition(key="chunk_index", range=models.Range(gte=index - window, lte=index + window))
+                    ])
+                    for author, title, section, index in lookups
+                ]
+                points, _ = self.client.scroll(
+                    collection_name=self.collection,
+                    scroll_filter=Filter(should=hit_filters),
+                    limit=len(lookups) * (2 * window + 1),
+                    with_payload=["text", "author", "title", "section", "chunk_index"],
+                    with_vectors=False
+                )
+
+        chunks = {
+            (p.payload.get("author"), p.payload.get("title"), p.payload.get("section"), p.payload.get("chunk_index")):
+                p.payload.get("text", "")
+            for p in points
+        }
+
+        expanded = []
+        for author, title, section, index in hits:
+            before, after = [], []
+            budget = max_tokens
+
+            # Nearest neighbours first, alternating before/after, until the budget runs out. A side stops at the first
+            # missing or over-budget chunk so its text stays contiguous with the hit.
+            open_sides = {"before", "after"}
+            for offset in range(1, window + 1):
+                for name, side, position in (("before", before, index - offset), ("after", after, index + offset)):
+                    if name not in open_sides:
+                        continue
+                    text = chunks.get((author, title, section, position))
+                    tokens = count_tokens(text) if text is not None else 0
+                    if text is None or tokens > budget:
+                        open_sides.discard(name)
+                        continue
+                    budget -= tokens
+                    side.append((position, text))
+
+            expanded.append(([text for _, text in sorted(before)], [text for _, text in sorted(after)]))
+
+        return expanded
@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient
+
+from dbs.Qdrant import SEARCH_PARAMS
+from dbs.collection_management import (
+    build_truncated_variant, collection_report, configure_quantization, ensure_payload_indexes, recall_at_k, tune_hnsw,
+    wait_until_green
+)
+from embed.Embedder import Embedder, FULL_DIMENSIONS
+
+
+def _parse_args():
+    """Parse command-line arguments."""
+
+    parser = argparse.ArgumentParser(description="Manage the Qdrant collection (COGITO_QDRANT_COLLECTION)")
+    parser.add_argument("--collection", default=os.getenv("COGITO_QDRANT_COLLECTION"))
+    parser.add_argument("--samples", type=int, default=50, help="queries used to measure latency")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("verify", help="report index status, memory footprint and query latency")
+
+    optimize = commands.add_parser("optimize", help="create payload indexes, quantize and tune HNSW (reports before "
+                                                    "and after)")
+    optimize.add_argument("--quantization", choices=["scalar", "binary", "none"], default="scalar")
+    optimize.add_argument("--m", type=int, default=16, help="HNSW links per node")
+    optimize.add_argument("--ef-construct", type=int, default=128, help="HNSW build-time candidate list size")
+    optimize.add_argument("--vectors-on-disk", action="store_true",
+                          help="keep original vectors on disk and only quantized vectors in RAM")
+
+    variant = commands.add_parser("build-variant", help="copy the collection into a reduced-dimension variant by "
+                                                        "truncating its vectors (no re-embedding)")
+    variant.add_argument("--dimensions", type=int, required=True)
+
+    evaluate = commands.add_parser("evaluate", help="recall@k of reduced-dimension variants against the full "
+                                                    "collection")
+    evaluate.add_argument("--dimensions", type=int, nargs="+", required=True)
+    evaluate.add_argument("--questions", type=Path, default=Path("bench/questions.json"),
+                          help='JSON list of {"question": ...} (the benchmark corpus by default)')
+    evaluate.add_argument("--k", type=int, default=10)
+
+    return parser.parse_args()
+
+def _print_report(title: str, report: dict):
+    """Print a collection report."""
+
+    print(f"--- {title} ---")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+
+    load_dotenv()
+    args = _parse_args()
+
+    client = QdrantClient(
+        url=os.getenv("COGITO_QDRANT_URL"),
+        grpc_port=int(os.getenv("COGITO_QDRANT_PORT", "6334")),
+        prefer_grpc=True,
+        https=False,
+        api_key=os.getenv("COGITO_QDRANT_API_KEY")
+    )
+
+    try:
+        if args.command == "verify":
+            _print_report("Current", collection_report(client, args.collection, SEARCH_PARAMS, args.samples))
+
+        elif args.command == "optimize":
+            _print_report("Before", collection_report(client, args.collection, SEARCH_PARAMS, args.samples))
+
+            created = ensure_payload_indexes(client, args.collection)
+            print(f"Created payload indexes: {created or 'none (already present)'}")
+
+            configure_quantization(client, args.collection, args.quantization)
+            tune_hnsw(client, args.collection, m=args.m, ef_construct=args.ef_construct,
+                      vectors_on_disk=True if args.vectors_on_disk else None)
+
+            print("Waiting for optimizers to rebuild the collection...")
+            wait_until_green(client, args.collection)
+
+            _print_report("After", collection_report(client, args.collection, SEARCH_PARAMS, args.samples))
+
+        elif args.command == "build-variant":
+            target = build_truncated_variant(client, args.collection, args.dimensions)
+            print(f"Built '{target}'. Use it with COGITO_EMBEDDING_DIMENSIONS={args.dimensions}.")
+
+        elif args.command == "evaluate":
+            questions = [q["question"] for q in json.loads(args.questions.read_text(encoding="utf-8"))]
+            query_vectors = Embedder(dimensions=FULL_DIMENSIONS).embed_batch(questions)
+
+            results = [recall_at_k(client, args.collection, query_vectors, d, args.k) for d in args.dimensions]
+            print(json.dumps(results, indent=2))
+    finally:
+        client.close()
@@ -0,0 +1,228 @@
+import random
+import time
+
+from qdrant_client import QdrantClient, models
+
+from embed.Embedder import FULL_DIMENSIONS, truncate_embedding
+
+# Payload fields `Qdrant.batch_query` filters on with `MatchValue`, plus the section and chunk position
+# `Qdrant.expand_context` looks neighbours up by
+PAYLOAD_INDEXES = {
+    "author": models.PayloadSchemaType.KEYWORD,
+    "title": models.PayloadSchemaType.KEYWORD,
+    "section": models.PayloadSchemaType.KEYWORD,
+    "chunk_index": models.PayloadSchemaType.INTEGER
+}
+
+
+def variant_collection(base: str, dimensions: int) -> str:
+    """Name of the collection holding `dimensions`-sized embeddings (the base collection holds full-size ones)."""
+
+    return base if dimensions == FULL_DIMENSIONS else f"{base}_d{dimensions}"
+
+def ensure_payload_indexes(client: QdrantClient, collection: str, fields: dict = None) -> list[str]:
+    """Create any missing payload indexes. Returns the fields that were created."""
+
+    fields = fields or PAYLOAD_INDEXES
+    existing = client.get_collection(collection).payload_schema or {}
+
+    created = []
+    for field, schema in fields.items():
+        if field in existing:
+            continue
+        client.create_payload_index(collection_name=collection, field_name=field, field_schema=schema, wait=True)
+        created.append(field)
+
+    return created
+
+def configure_quantization(client: QdrantClient, collection: str, kind: str = "scalar"):
+    """Turn on scalar (int8, ~4x smaller) or binary (1 bit, ~32x smaller) quantization, kept in RAM; `none` disables it.
+
+    Searches rescore quantized candidates against the original vectors (see `SEARCH_PARAMS` in `dbs.Qdrant`).
+    """
+
+    if kind == "scalar":
+        config = models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    elif kind == "binary":
+        config = models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+    elif kind == "none":
+        config = models.Disabled.DISABLED
+    else:
+        raise ValueError(f"Unknown quantization kind: {kind}")
+
+    client.update_collection(collection_name=collection, quantization_config=config)
+
+def tune_hnsw(client: QdrantClient, collection: str, m: int = 16, ef_construct: int = 128,
+              vectors_on_disk: bool | None = None):
+    """Set HNSW graph parameters, and optionally move the original vectors to disk (quantized copies stay in RAM)."""
+
+    vectors_config = None
+    if vectors_on_disk is not None:
+        vectors_config = {"": models.VectorParamsDiff(on_disk=vectors_on_disk)}
+
+    client.update_collection(
+        collection_name=collection,
+        hnsw_config=models.HnswConfigDiff(m=m, ef_construct=ef_construct),
+        vectors_config=vectors_config
+    )
+
+def wait_until_green(client: QdrantClient, collection: str, timeout: float = 3600):
+    """Wait for the optimizers to finish rebuilding after a configuration change."""
+
+    deadline = time.monotonic() + timeout
+    while client.get_collection(collection).status != models.CollectionStatus.GREEN:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Collection '{collection}' still optimizing after {timeout}s")
+        time.sleep(2)
+
+def estimate_memory(info: models.CollectionInfo) -> dict:
+    """Rough RAM footprint in MiB of vectors, quantized vectors and the HNSW graph."""
+
+    params = info.config.params.vectors
+    params = params.get("") if isinstance(params, dict) else params
+    points = info.points_count or 0
+    dims = params.size
+
+    full = points * dims * 4
+    quantization = info.config.quantization_config
+    if isinstance(quantization, models.ScalarQuantization):
+        quantized = points * dims
+    elif isinstance(quantization, models.BinaryQuantization):
+        quantized = points * dims / 8
+    else:
+        quantized = 0
+
+    # Layer 0 holds up to 2*m links per point, 4 bytes each; upper layers add little
+    graph = points * info.config.hnsw_config.m * 2 * 4
+
+    mib = 1024 * 1024
+    return {
+        "vectors_mib": round(full / mib, 1),
+        "vectors_in_ram": not params.on_disk,
+        "quantized_mib": round(quantized / mib, 1),
+        "hnsw_graph_mib": round(graph / mib, 1),
+        "resident_mib": round(((0 if params.on_disk else full) + quantized + graph) / mib, 1)
+    }
+
+def measure_latency(client: QdrantClient, collection: str, search_params: models.SearchParams = None,
+                    samples: int = 50) -> dict:
+    """Query latency (ms) for unfiltered and author-filtered searches using stored vectors as queries."""
+
+    points, _ = client.scroll(collection_name=collection, limit=samples, with_vectors=True, with_payload=["author"])
+    if not points:
+        return {}
+
+    def timed(filtered: bool) -> list[float]:
+        latencies = []
+        for point in points:
+            query_filter = None
+            if filtered and point.payload.get("author"):
+                query_filter = models.Filter(must=[
+                    models.FieldCondition(key="author", match=models.MatchValue(value=point.payload["author"]))
+                ])
+            start = time.perf_counter()
+            client.query_points(collection_name=collection, query=point.vector, limit=1, query_filter=query_filter,
+                                search_params=search_params, with_payload=True)
+            latencies.append((time.perf_counter() - start) * 1000)
+        return sorted(latencies)
+
+    random.shuffle(points)
+    report = {}
+    for label, filtered in (("unfiltered", False), ("author_filtered", True)):
+        latencies = timed(filtered)
+        report[label] = {
+            "p50_ms": round(latencies[len(latencies) // 2], 2),
+            "p95_ms": round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)], 2)
+        }
+    return report
+
+def collection_report(client: QdrantClient, collection: str, search_params: models.SearchParams = None,
+                      samples: int = 50) -> dict:
+    """Status, index, memory and latency report for a collection."""
+
+    info = client.get_collection(collection)
+    quantization = info.config.quantization_config
+
+    return {
+        "collection": collection,
+        "status": str(info.status.value if hasattr(info.status, "value") else info.status),
+        "points": info.points_count,
+        "indexed_vectors": info.indexed_vectors_count,
+        "payload_indexes": {
+            field: {"type": str(schema.data_type.value), "points": schema.points}
+            for field, schema in (info.payload_schema or {}).items()
+        },
+        "missing_payload_indexes": [f for f in PAYLOAD_INDEXES if f not in (info.payload_schema or {})],
+        "quantization": type(quantization).__name__ if quantization else None,
+        "hnsw": {"m": info.config.hnsw_config.m, "ef_construct": info.config.hnsw_config.ef_construct},
+        "memory": estimate_memory(info),
+        "latency": measure_latency(client, collection, search_params, samples)
+    }
+
+def build_truncated_variant(client: QdrantClient, source: str, dimensions: int, batch_size: int = 256) -> str:
+    """Copy a full-size collection into its `dimensions` variant by truncating and re-normalizing every vector.
+
+    Avoids re-embedding the corpus: text-embedding-3-small is trained so that prefixes of its embeddings are
+    themselves embeddings. Point ids and payloads are kept, so results are directly comparable. Returns the variant name.
+    """
+
+    target = variant_collection(source, dimensions)
+    if not client.collection_exists(target):
+        client.create_collection(
+            collection_name=target,
+            vectors_config=models.VectorParams(size=dimensions, distance=models.Distance.COSINE)
+        )
+        ensure_payload_indexes(client, target)
+
+    offset = None
+    copied = 0
+    while True:
+        points, offset = client.scroll(collection_name=source, limit=batch_size, offset=offset, with_vectors=True,
+                                       with_payload=True)
+        if points:
+            client.upsert(collection_name=target, wait=True, points=[
+                models.PointStruct(id=p.id, vector=truncate_embedding(p.vector, dimensions), payload=p.payload)
+                for p in points
+            ])
+            copied += len(points)
+            print(f"Copied {copied} points into '{target}'...")
+        if offset is None:
+            return target
+
+def recall_at_k(client: QdrantClient, full_collection: str, query_vectors: list[list[float]], dimensions: int,
+                k: int = 10) -> dict:
+    """Recall@k of the `dimensions` variant against the full collection, plus search latency of each.
+
+    `query_vectors` are full-size query embeddings; they're truncated the same way the variant's vectors were.
+    """
+
+    variant = variant_collection(full_collection, dimensions)
+    recalls, full_latencies, variant_latencies = [], [], []
+
+    for vector in query_vectors:
+        start = time.perf_counter()
+        truth = client.query_points(collection_name=full_collection, query=vector, limit=k).points
+        full_latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        found = client.query_points(collection_name=variant, query=truncate_embedding(vector, dimensions), limit=k).points
+        variant_latencies.append((time.perf_counter() - start) * 1000)
+
+        truth_ids = {p.id for p in truth}
+        if truth_ids:
+            recalls.append(len(truth_ids & {p.id for p in found}) / len(truth_ids))
+
+    def median(values: list[float]) -> float:
+        return round(sorted(values)[len(values) // 2], 2) if values else 0.0
+
+    return {
+        "dimensions": dimensions,
+        "collection": variant,
+        f"recall@{k}": round(sum(recalls) / len(recalls), 4) if recalls else None,
+        "min_recall": round(min(recalls), 4) if recalls else None,
+        "full_p50_ms": median(full_latencies),
+        "variant_p50_ms": median(variant_latencies),
+        "memory": estimate_memory(client.get_collection(variant))
+    }
@@ -0,0 +1,24 @@
+-- Version column for the conversations table, used by the gRPC servicer's conversation cache (see
+-- `cogito_servicer/ConversationCache.py`) to tell whether its copy of a conversation is still current.
+--
+-- Every UPDATE bumps the version, including writers that don't know about the column. Servers write with
+-- `version = version + 1 ... WHERE version = <the version they read>` so concurrent replicas can't silently overwrite
+-- each other.
+--
+-- Apply with: psql -f dbs/conversations_version.sql
+
+ALTER TABLE conversations ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION bump_conversation_version() RETURNS trigger AS $$
+BEGIN
+    IF NEW.version IS NOT DISTINCT FROM OLD.version THEN
+        NEW.version := OLD.version + 1;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS conversations_version_bump ON conversations;
+CREATE TRIGGER conversations_version_bump
+    BEFORE UPDATE ON conversations
+    FOR EACH ROW EXECUTE FUNCTION bump_conversation_version();
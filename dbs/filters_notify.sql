@@ -0,0 +1,72 @@
+-- Row-level change notifications for the filters table, consumed by `dbs.Postgres`.
+--
+-- Each changed row sends a JSON delta on the `filters_changes` channel, e.g.
+--   {"op": "INSERT", "author": "Immanuel Kant", "source": "The Critique of Pure Reason"}
+--   {"op": "DELETE", "author": "...", "source": "...", "remaining": false}
+-- `remaining` tells listeners whether an identical row is still in the table (duplicates are allowed). TRUNCATE, and
+-- rows too large for a NOTIFY payload, send {"op": "RELOAD"} and listeners re-read the whole table.
+--
+-- This replaces the statement-level trigger the filters image ships with: its plain-text notifications on the same
+-- channel would otherwise turn every burst into a full reload.
+--
+-- Apply with: psql -f dbs/filters_notify.sql
+
+CREATE OR REPLACE FUNCTION notify_filters_changes() RETURNS trigger AS $$
+DECLARE
+    payload text;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM pg_notify('filters_changes', '{"op": "RELOAD"}');
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        payload := json_build_object(
+            'op', 'DELETE', 'author', OLD.author, 'source', OLD.source,
+            'remaining', EXISTS (SELECT 1 FROM filters WHERE author = OLD.author AND source = OLD.source)
+        )::text;
+        IF octet_length(payload) > 7900 THEN
+            payload := '{"op": "RELOAD"}';
+        END IF;
+        PERFORM pg_notify('filters_changes', payload);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        payload := json_build_object('op', 'INSERT', 'author', NEW.author, 'source', NEW.source)::text;
+        IF octet_length(payload) > 7900 THEN
+            payload := '{"op": "RELOAD"}';
+        END IF;
+        PERFORM pg_notify('filters_changes', payload);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Drop any other trigger on the table that notifies on filters_changes (the image's statement-level one)
+DO $$
+DECLARE
+    old_trigger record;
+BEGIN
+    FOR old_trigger IN
+        SELECT t.tgname
+        FROM pg_trigger t JOIN pg_proc p ON p.oid = t.tgfoid
+        WHERE t.tgrelid = 'filters'::regclass
+          AND NOT t.tgisinternal
+          AND t.tgname NOT IN ('filters_changes_rows', 'filters_changes_truncate')
+          AND p.prosrc LIKE '%filters_changes%'
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON filters', old_trigger.tgname);
+    END LOOP;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS filters_changes_rows ON filters;
+CREATE TRIGGER filters_changes_rows
+    AFTER INSERT OR UPDATE OR DELETE ON filters
+    FOR EACH ROW EXECUTE FUNCTION notify_filters_changes();
+
+DROP TRIGGER IF EXISTS filters_changes_truncate ON filters;
+CREATE TRIGGER filters_changes_truncate
+    AFTER TRUNCATE ON filters
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_filters_changes();
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+
+
+class BaseEmbedder(ABC):
+    """Interface for text embedding backends."""
+
+    # Backend name (used in traces and benchmark reports)
+    name: str
+
+    # Size of the vectors `embed_batch` returns
+    dimensions: int
+
+    # Appended to COGITO_QDRANT_COLLECTION to pick the collection embedded with this backend
+    collection_suffix: str
+
+    # --- Methods ---
+    @abstractmethod
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed a list of texts into dense vectors."""
@@ -1,25 +1,55 @@
+import math
 import os
 
 from openai import OpenAI
 
+from embed.BaseEmbedder import BaseEmbedder
+from telemetry.tracing import span, annotate
 
-class Embedder:
+# Native size of text-embedding-3-small; smaller sizes are Matryoshka truncations of it
+FULL_DIMENSIONS = 1536
+
+
+def truncate_embedding(vector: list[float], dimensions: int) -> list[float]:
+    """Truncate a full embedding to its first `dimensions` components and re-normalize to unit length.
+
+    Matches what the API returns when asked for `dimensions` directly.
+    """
+
+    head = vector[:dimensions]
+    norm = math.sqrt(sum(x * x for x in head)) or 1.0
+    return [x / norm for x in head]
+
+
+class Embedder(BaseEmbedder):
     """Embedder using OpenAI's text-embedding-3-small model."""
 
+    name = "openai"
+
     # --- Methods ---
-    def __init__(self):
-        """Initialize OpenAI client."""
+    def __init__(self, dimensions: int | None = None):
+        """Initialize OpenAI client. `dimensions` defaults to COGITO_EMBEDDING_DIMENSIONS, else the full 1536."""
 
         key = os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=key)
+        self.dimensions = dimensions or int(os.getenv("COGITO_EMBEDDING_DIMENSIONS", FULL_DIMENSIONS))
+
+        # Reduced-dimension embeddings live in their own collection variant
+        self.collection_suffix = "" if self.dimensions == FULL_DIMENSIONS else f"_d{self.dimensions}"
 
     def embed_batch(self, texts: list[str]):
         """Embed a list of texts into dense vectors using text-embedding-3-small model."""
 
-        response = self.client.embeddings.create(
-            model="text-embedding-3-small",
-            input=texts
-        )
+        # Only send `dimensions` when reducing, so full-size requests stay identical to before
+        extra = {"dimensions": self.dimensions} if self.dimensions != FULL_DIMENSIONS else {}
+
+        with span("embed", "text-embedding-3-small", batch_size=len(texts), dimensions=self.dimensions):
+            response = self.client.embeddings.create(
+                model="text-embedding-3-small",
+                input=texts,
+                **extra
+            )
+            annotate(input_tokens=response.usage.prompt_tokens)
         out = [d.embedding for d in response.data]
 
         return out
@@ -0,0 +1,59 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from embed.BaseEmbedder import BaseEmbedder
+from telemetry.tracing import span
+
+DEFAULT_LOCAL_MODEL = "BAAI/bge-small-en-v1.5"
+
+
+class LocalEmbedder(BaseEmbedder):
+    """CPU-local embedder using a sentence-transformers model (optionally through ONNX Runtime).
+
+    Needs `pip install sentence-transformers` (plus `optimum[onnxruntime]` for the ONNX backend); neither is imported
+    unless this backend is selected.
+    """
+
+    name = "local"
+
+    # --- Methods ---
+    def __init__(self, model_name: str | None = None, batch_size: int = 32, workers: int = 2, onnx: bool | None = None):
+        """Load the model. Defaults come from COGITO_LOCAL_EMBEDDING_MODEL and COGITO_LOCAL_EMBEDDING_ONNX."""
+
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError("The local embedding backend needs `pip install -r requirements-local.txt`.") from e
+
+        self.model_name = model_name or os.getenv("COGITO_LOCAL_EMBEDDING_MODEL", DEFAULT_LOCAL_MODEL)
+        if onnx is None:
+            onnx = os.getenv("COGITO_LOCAL_EMBEDDING_ONNX") == "1"
+
+        self.model = SentenceTransformer(self.model_name, device="cpu", backend="onnx" if onnx else "torch")
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+        self.batch_size = batch_size
+
+        # Each model gets its own collection, e.g. `_local_bge-small-en-v1.5`
+        slug = re.sub(r"[^A-Za-z0-9.-]+", "-", self.model_name.split("/")[-1]).lower()
+        self.collection_suffix = f"_local_{slug}"
+
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, splitting large inputs into batches encoded in parallel (inference releases the GIL)."""
+
+        with span("embed", self.model_name, batch_size=len(texts)):
+            # Planner-sized inputs are encoded inline; a thread hop would only add latency
+            if len(texts) <= self.batch_size:
+                vectors = self._encode(texts)
+            else:
+                batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+                vectors = [v for batch in self._executor.map(self._encode, batches) for v in batch]
+
+        return vectors
+
+    def _encode(self, texts: list[str]) -> list[list[float]]:
+        """Encode one batch to unit-length vectors."""
+
+        return self.model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True).tolist()
@@ -0,0 +1,65 @@
+import queue
+import threading
+from concurrent.futures import Future
+
+from embed.BaseEmbedder import BaseEmbedder
+
+
+class MicroBatchingEmbedder(BaseEmbedder):
+    """Wraps an embedder so concurrent `embed_batch` calls from different threads share one request.
+
+    Calls arriving within `max_wait` seconds of each other (up to `max_texts` texts) are merged into a single call to
+    the wrapped embedder and the vectors are handed back to each caller. Meant for running many agent runs on threads
+    at once, where each planner iteration embeds only 1-3 queries.
+    """
+
+    # --- Methods ---
+    def __init__(self, embedder: BaseEmbedder, max_wait: float = 0.02, max_texts: int = 256):
+        """Start the background batching thread."""
+
+        self.embedder = embedder
+        self.name = embedder.name
+        self.dimensions = embedder.dimensions
+        self.collection_suffix = embedder.collection_suffix
+        self.max_wait = max_wait
+        self.max_texts = max_texts
+
+        self._requests: queue.Queue[tuple[list[str], Future]] = queue.Queue()
+        thread = threading.Thread(target=self._batch_loop, daemon=True)
+        thread.start()
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Queue texts for the next merged call and wait for their vectors."""
+
+        future: Future = Future()
+        self._requests.put((texts, future))
+        return future.result()
+
+    def _batch_loop(self):
+        """Collect queued calls into merged batches and embed them."""
+
+        while True:
+            batch = [self._requests.get()]
+            size = len(batch[0][0])
+
+            # Gather whatever else arrives within the window
+            while size < self.max_texts:
+                try:
+                    item = self._requests.get(timeout=self.max_wait)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            texts = [t for item_texts, _ in batch for t in item_texts]
+            try:
+                vectors = self.embedder.embed_batch(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for item_texts, future in batch:
+                future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
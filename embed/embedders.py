@@ -0,0 +1,20 @@
+import os
+
+from embed.BaseEmbedder import BaseEmbedder
+
+EMBEDDING_BACKENDS = ("openai", "local")
+
+
+def get_embedder(backend: str | None = None) -> BaseEmbedder:
+    """Build the embedder for `backend`, defaulting to COGITO_EMBEDDING_BACKEND (else `openai`)."""
+
+    backend = backend or os.getenv("COGITO_EMBEDDING_BACKEND", "openai")
+
+    if backend == "openai":
+        from embed.Embedder import Embedder
+        return Embedder()
+    if backend == "local":
+        from embed.LocalEmbedder import LocalEmbedder
+        return LocalEmbedder()
+
+    raise ValueError(f"Unknown embedding backend '{backend}'; expected one of {EMBEDDING_BACKENDS}")
@@ -0,0 +1,49 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class Checkpoint:
+    """JSON record of which books have been fully ingested, so an interrupted run can resume.
+
+    The settings that shape the index (collection, chunking) are stored alongside; if they change, the old progress no
+    longer applies and the checkpoint starts over.
+    """
+
+    # --- Methods ---
+    def __init__(self, path: Path, settings: dict):
+        """Load an existing checkpoint for the same settings, or start a new one."""
+
+        self.path = path
+        self.settings = settings
+        self.completed: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("settings") == settings:
+                self.completed = data.get("completed", {})
+            else:
+                print(f"Checkpoint {path} was written with different settings; starting over.")
+
+    def is_done(self, book_id: str) -> bool:
+        """Whether a book was fully ingested."""
+
+        return book_id in self.completed
+
+    def mark_done(self, book_id: str, chunks: int):
+        """Record a fully ingested book and persist the checkpoint."""
+
+        with self._lock:
+            self.completed[book_id] = {"chunks": chunks, "finished": time.time()}
+            self._save()
+
+    def _save(self):
+        """Write the checkpoint atomically so a crash mid-write can't corrupt it."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps({"settings": self.settings, "completed": self.completed}), encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,154 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from typing import Iterable, Iterator
+
+import tiktoken
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from qdrant_client import models
+
+from dbs.Qdrant import Qdrant
+from ingest.Checkpoint import Checkpoint
+from ingest.RateLimiter import RateLimiter
+from ingest.chunking import Chunk, chunk_book, EMBEDDING_ENCODING
+from ingest.gutenberg import Book, stream_book
+
+# Fixed namespace so a chunk always gets the same point id, making re-ingestion idempotent
+POINT_ID_NAMESPACE = uuid.UUID("5b0c7a5e-4c1f-4f7e-9a53-0f6f1c0a9e21")
+
+_RETRYABLE = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+def point_id(book_id: str, chunk_index: int) -> str:
+    """Deterministic Qdrant point id for a chunk."""
+
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{book_id}:{chunk_index}"))
+
+def batched(chunks: Iterable[Chunk], size: int) -> Iterator[list[Chunk]]:
+    """Group a chunk stream into lists of `size`."""
+
+    batch = []
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class IngestionPipeline:
+    """Streams books into the vector collection and the filters table, resumably.
+
+    Each book is streamed, chunked and embedded in batches on a thread pool (rate limited), and each embedded batch is
+    upserted as soon as it's ready. Only once all of a book's points are written is its author/title added to the
+    filters table and the book marked done in the checkpoint. Point ids are deterministic, so a book interrupted halfway
+    is simply re-ingested over itself.
+    """
+
+    # --- Methods ---
+    def __init__(self, qdrant: Qdrant, checkpoint: Checkpoint, rate_limiter: RateLimiter, batch_size: int = 64,
+                 workers: int = 4, max_tokens: int = 512, overlap_tokens: int = 64, max_retries: int = 5):
+        """Initialize with a connected Qdrant (whose embedder and Postgres client are reused)."""
+
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError(f"overlap_tokens must be at least 0 and less than max_tokens ({max_tokens}), "
+                             f"got {overlap_tokens}")
+
+        self.qdrant = qdrant
+        self.checkpoint = checkpoint
+        self.rate_limiter = rate_limiter
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.max_retries = max_retries
+
+        self.encoding = tiktoken.get_encoding(EMBEDDING_ENCODING)
+
+    def ensure_collection(self, recreate: bool = False):
+        """Create the collection (cosine distance, sized for the embedder's dimensions) if it doesn't exist."""
+
+        client, collection = self.qdrant.client, self.qdrant.collection
+
+        if recreate and client.collection_exists(collection):
+            client.delete_collection(collection)
+
+        if not client.collection_exists(collection):
+            client.create_collection(
+                collection_name=collection,
+                vectors_config=models.VectorParams(
+                    size=self.qdrant.embedder.dimensions, distance=models.Distance.COSINE
+                )
+            )
+
+    def ingest(self, books: list[Book]):
+        """Ingest every book not already in the checkpoint."""
+
+        pending = [b for b in books if not self.checkpoint.is_done(str(b["id"]))]
+        print(f"{len(books) - len(pending)} of {len(books)} books already ingested; {len(pending)} to go.")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for i, book in enumerate(pending, start=1):
+                start = time.perf_counter()
+                try:
+                    chunks = self._ingest_book(book, executor)
+                except Exception as e:
+                    # Leave the book out of the checkpoint so the next run retries it
+                    print(f"[{i}/{len(pending)}] Failed '{book['title']}' ({book['id']}): {e}")
+                    continue
+
+                self.qdrant.postgres_client.add_filter(book["author"], book["title"])
+                self.checkpoint.mark_done(str(book["id"]), chunks)
+                print(f"[{i}/{len(pending)}] '{book['title']}': {chunks} chunks in {time.perf_counter() - start:.1f}s")
+
+    def _ingest_book(self, book: Book, executor: ThreadPoolExecutor) -> int:
+        """Embed and upsert one book, keeping at most two batches per worker in flight. Returns the chunk count."""
+
+        chunks = chunk_book(stream_book(book), book["author"], book["title"], self.max_tokens, self.overlap_tokens)
+
+        in_flight: set[Future] = set()
+        total = 0
+
+        for batch in batched(chunks, self.batch_size):
+            if len(in_flight) >= self.workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                total += self._upsert_finished(book, done)
+
+            in_flight.add(executor.submit(self._embed_batch, batch))
+
+        done, _ = wait(in_flight)
+        total += self._upsert_finished(book, done)
+
+        return total
+
+    def _embed_batch(self, batch: list[Chunk]) -> tuple[list[Chunk], list[list[float]]]:
+        """Embed a batch within the rate limit, retrying transient API errors with exponential backoff."""
+
+        tokens = sum(len(self.encoding.encode(c["text"])) for c in batch)
+
+        for attempt in range(self.max_retries):
+            self.rate_limiter.acquire(tokens)
+            try:
+                return batch, self.qdrant.embedder.embed_batch([c["text"] for c in batch])
+            except _RETRYABLE as e:
+                if attempt == self.max_retries - 1:
+                    raise
+                delay = 2 ** attempt
+                print(f"Embedding failed ({type(e).__name__}); retrying in {delay}s...")
+                time.sleep(delay)
+
+    def _upsert_finished(self, book: Book, done: set[Future]) -> int:
+        """Upsert the points of finished embedding batches in one request. Returns the number of points written."""
+
+        points = []
+        for future in done:
+            batch, vectors = future.result()
+            points += [
+                models.PointStruct(id=point_id(str(book["id"]), chunk["chunk_index"]), vector=vector, payload=dict(chunk))
+                for chunk, vector in zip(batch, vectors)
+            ]
+
+        if points:
+            self.qdrant.client.upsert(collection_name=self.qdrant.collection, points=points, wait=True)
+        return len(points)
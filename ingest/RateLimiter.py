@@ -0,0 +1,50 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token-bucket limiter on requests per minute and tokens per minute."""
+
+    # --- Methods ---
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        """Initialize with full buckets."""
+
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+        self._lock = threading.Lock()
+        self._requests = requests_per_minute
+        self._tokens = tokens_per_minute
+        self._updated = time.monotonic()
+
+    def acquire(self, tokens: int):
+        """Block until one request of `tokens` tokens fits within both limits, then consume it."""
+
+        # A single request larger than the whole bucket can never fit; let it through once the bucket is full
+        tokens = min(tokens, self.tokens_per_minute)
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+
+                # Time until both buckets have refilled enough
+                wait = max(
+                    (1 - self._requests) / self.requests_per_minute * 60,
+                    (tokens - self._tokens) / self.tokens_per_minute * 60
+                )
+
+            time.sleep(max(wait, 0.01))
+
+    def _refill(self):
+        """Top up both buckets for the time elapsed since the last refill."""
+
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
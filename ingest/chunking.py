@@ -0,0 +1,130 @@
+import re
+from typing import Iterator, TypedDict
+
+import tiktoken
+
+# text-embedding-3-small uses the cl100k_base tokenizer
+EMBEDDING_ENCODING = "cl100k_base"
+
+# A heading word opening a paragraph, and what follows it
+_HEADING = re.compile(
+    r"^(BOOK|PART|CHAPTER|SECTION|LECTURE|ESSAY|DIALOGUE|ARTICLE|PREFACE|INTRODUCTION|APPENDIX|CONCLUSION)\b\W*(.*)$",
+    re.IGNORECASE
+)
+# A heading number: Roman (upper case only, so words like "civil" don't count), Arabic, spelled out or ordinal
+_HEADING_NUMBER = re.compile(
+    r"^(?:THE\s+)?(?:(?-i:[IVXLCDM]+)|\d+|ONE|TWO|THREE|FOUR|FIVE|SIX|SEVEN|EIGHT|NINE|TEN|ELEVEN|TWELVE|FIRST|SECOND"
+    r"|THIRD|FOURTH|FIFTH|SIXTH|SEVENTH|EIGHTH|NINTH|TENTH|LAST)\b(\W*)(.*)$",
+    re.IGNORECASE
+)
+_ROMAN_NUMERAL = re.compile(r"^[IVXLC]+\.?$", re.IGNORECASE)
+# Words a title-cased heading may leave in lower case
+_MINOR_WORDS = {"a", "an", "and", "as", "at", "by", "for", "from", "in", "into", "of", "on", "or", "the", "to", "upon",
+                "with"}
+_MAX_HEADING_CHARS = 80
+
+
+class Chunk(TypedDict):
+    """Schema for one chunk; matches the payload fields `Qdrant.batch_query` reads, plus its position in the book."""
+
+    text: str
+    author: str
+    title: str
+    section: str
+    chunk_index: int
+
+
+def paragraphs(lines: Iterator[str]) -> Iterator[str]:
+    """Group lines into paragraphs separated by blank lines, unwrapping hard line breaks."""
+
+    current = []
+    for line in lines:
+        if line.strip():
+            current.append(line.strip())
+        elif current:
+            yield " ".join(current)
+            current = []
+    if current:
+        yield " ".join(current)
+
+def is_heading(paragraph: str) -> bool:
+    """Whether a paragraph looks like a section heading: short, and either all caps, a Roman numeral, or a heading word
+    standing alone or followed by a number and/or a title ("Chapter IV. Of Property", "Introduction to Ethics")."""
+
+    if len(paragraph) > _MAX_HEADING_CHARS:
+        return False
+
+    heading = _HEADING.match(paragraph)
+    if heading:
+        rest = heading.group(2)
+        numbered = _HEADING_NUMBER.match(rest)
+        if numbered:
+            # Whatever follows the number must be set off by punctuation or be a title, not the rest of a sentence
+            separator, title = numbered.groups()
+            return not title or any(c in separator for c in ".:-–—") or _is_title(title)
+        return not rest or _is_title(rest)
+
+    if _ROMAN_NUMERAL.match(paragraph):
+        return True
+    letters = [c for c in paragraph if c.isalpha()]
+    return len(letters) >= 3 and all(c.isupper() for c in letters)
+
+def _is_title(text: str) -> bool:
+    """Whether text reads as (the rest of) a title: each word capitalized or minor, and at least one capitalized."""
+
+    words = re.findall(r"[^\W\d_][\w'’]*", text)
+    return any(word[0].isupper() for word in words) and all(
+        word[0].isupper() or word.lower() in _MINOR_WORDS for word in words
+    )
+
+def chunk_book(lines: Iterator[str], author: str, title: str, max_tokens: int = 512,
+               overlap_tokens: int = 64) -> Iterator[Chunk]:
+    """Stream section-aware chunks of at most `max_tokens` tokens from a book's body lines.
+
+    Paragraphs are packed into chunks without crossing section boundaries. A paragraph longer than `max_tokens` is split
+    into token windows overlapping by `overlap_tokens`.
+    """
+
+    encoding = tiktoken.get_encoding(EMBEDDING_ENCODING)
+
+    section = "Beginning"
+    pending: list[str] = []
+    pending_tokens = 0
+    chunk_index = 0
+
+    def emit(text: str) -> Chunk:
+        nonlocal chunk_index
+        chunk: Chunk = {"text": text, "author": author, "title": title, "section": section, "chunk_index": chunk_index}
+        chunk_index += 1
+        return chunk
+
+    for paragraph in paragraphs(lines):
+        if is_heading(paragraph):
+            if pending:
+                yield emit("\n\n".join(pending))
+                pending, pending_tokens = [], 0
+            section = paragraph
+            continue
+
+        tokens = encoding.encode(paragraph)
+
+        if len(tokens) > max_tokens:
+            if pending:
+                yield emit("\n\n".join(pending))
+                pending, pending_tokens = [], 0
+            step = max_tokens - overlap_tokens
+            for start in range(0, len(tokens), step):
+                yield emit(encoding.decode(tokens[start:start + max_tokens]))
+                if start + max_tokens >= len(tokens):
+                    break
+            continue
+
+        if pending_tokens + len(tokens) > max_tokens:
+            yield emit("\n\n".join(pending))
+            pending, pending_tokens = [], 0
+
+        pending.append(paragraph)
+        pending_tokens += len(tokens)
+
+    if pending:
+        yield emit("\n\n".join(pending))
@@ -0,0 +1,69 @@
+import io
+import re
+import urllib.request
+from typing import Iterator, TypedDict
+
+GUTENBERG_TEXT_URL = "https://www.gutenberg.org/cache/epub/{id}/pg{id}.txt"
+
+_START_MARKER = re.compile(r"^\*\*\*\s*START OF (THE|THIS) PROJECT GUTENBERG EBOOK", re.IGNORECASE)
+_END_MARKER = re.compile(r"^\*\*\*\s*END OF (THE|THIS) PROJECT GUTENBERG EBOOK", re.IGNORECASE)
+
+
+class Book(TypedDict, total=False):
+    """Schema for one manifest entry. `location` is a local path or URL; defaults to the Gutenberg URL for `id`."""
+
+    id: str
+    author: str
+    title: str
+    location: str
+
+
+def book_location(book: Book) -> str:
+    """Where to read a book's plain text from."""
+
+    return book.get("location") or GUTENBERG_TEXT_URL.format(id=book["id"])
+
+def stream_lines(location: str) -> Iterator[str]:
+    """Stream a text file line by line from a local path or URL without loading it whole."""
+
+    if location.startswith(("http://", "https://")):
+        request = urllib.request.Request(location, headers={"User-Agent": "cogito-ingest"})
+        with urllib.request.urlopen(request, timeout=60) as response:
+            for line in io.TextIOWrapper(response, encoding="utf-8-sig", errors="replace"):
+                yield line.rstrip("\r\n")
+    else:
+        with open(location, encoding="utf-8-sig", errors="replace") as f:
+            for line in f:
+                yield line.rstrip("\r\n")
+
+def strip_boilerplate(lines: Iterator[str]) -> Iterator[str]:
+    """Yield only the body of a Project Gutenberg text, dropping the license header and footer.
+
+    Texts without the standard markers are passed through unchanged.
+    """
+
+    buffered = []
+    started = False
+
+    for line in lines:
+        if not started:
+            if _START_MARKER.match(line):
+                started = True
+                buffered = []
+                continue
+            # Keep the preamble until we know whether a start marker exists at all
+            buffered.append(line)
+            continue
+
+        if _END_MARKER.match(line):
+            return
+        yield line
+
+    # No start marker: the whole file was the body
+    if not started:
+        yield from buffered
+
+def stream_book(book: Book) -> Iterator[str]:
+    """Stream the body lines of a manifest entry."""
+
+    return strip_boilerplate(stream_lines(book_location(book)))
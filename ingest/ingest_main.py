@@ -0,0 +1,77 @@
+import argparse
+import json
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from dbs.Qdrant import Qdrant
+from ingest.Checkpoint import Checkpoint
+from ingest.IngestionPipeline import IngestionPipeline
+from ingest.RateLimiter import RateLimiter
+
+
+def _parse_args():
+    """Parse command-line arguments."""
+
+    parser = argparse.ArgumentParser(
+        description="Ingest Project Gutenberg texts into the Qdrant collection (COGITO_QDRANT_COLLECTION) and the "
+                    "Postgres filters table."
+    )
+    parser.add_argument("manifest", type=Path,
+                        help='JSON list of books: [{"id": "4280", "author": "...", "title": "...", "location": '
+                             '"optional path or URL"}, ...]')
+    parser.add_argument("--checkpoint", type=Path, default=Path("ingest_checkpoint.json"),
+                        help="progress file; rerun with the same file to resume")
+    parser.add_argument("--recreate", action="store_true", help="drop and recreate the collection (and the checkpoint)")
+    parser.add_argument("--batch-size", type=int, default=64, help="chunks per embedding request")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent embedding requests")
+    parser.add_argument("--max-tokens", type=int, default=512, help="maximum tokens per chunk")
+    parser.add_argument("--overlap-tokens", type=int, default=64, help="overlap when splitting long paragraphs")
+    parser.add_argument("--rpm", type=float, default=3000, help="embedding requests per minute")
+    parser.add_argument("--tpm", type=float, default=1_000_000, help="embedding tokens per minute")
+
+    args = parser.parse_args()
+    if args.max_tokens <= 0:
+        parser.error("--max-tokens must be positive")
+    if not 0 <= args.overlap_tokens < args.max_tokens:
+        parser.error("--overlap-tokens must be at least 0 and less than --max-tokens")
+
+    return args
+
+
+if __name__ == "__main__":
+
+    load_dotenv()
+    args = _parse_args()
+
+    books = json.loads(args.manifest.read_text(encoding="utf-8"))
+
+    # Connect to Qdrant (also opens the Postgres filters connection and the embedder)
+    qdrant = Qdrant()
+
+    settings = {
+        "collection": qdrant.collection,
+        "dimensions": qdrant.embedder.dimensions,
+        "max_tokens": args.max_tokens,
+        "overlap_tokens": args.overlap_tokens
+    }
+    if args.recreate:
+        args.checkpoint.unlink(missing_ok=True)
+    checkpoint = Checkpoint(args.checkpoint, settings)
+
+    pipeline = IngestionPipeline(
+        qdrant,
+        checkpoint,
+        RateLimiter(args.rpm, args.tpm),
+        batch_size=args.batch_size,
+        workers=args.workers,
+        max_tokens=args.max_tokens,
+        overlap_tokens=args.overlap_tokens
+    )
+
+    try:
+        pipeline.ensure_collection(recreate=args.recreate)
+        pipeline.ingest(books)
+    finally:
+        qdrant.postgres_client.close()
+        qdrant.close()
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from telemetry.tracing import add_sink, RunTrace
+
+# Histogram buckets for span durations (seconds)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class PrometheusExporter:
+    """Aggregates spans into Prometheus metrics, rendered in the text exposition format.
+
+    The output is scrapeable by Prometheus and by the OpenTelemetry Collector's Prometheus receiver.
+    """
+
+    # --- Methods ---
+    def __init__(self):
+        """Initialize empty metric families."""
+
+        self._lock = threading.Lock()
+        self._durations: dict[tuple[str, str], list] = {}     # (kind, name) -> [bucket counts, sum, count]
+        self._counters: dict[tuple[str, tuple], float] = {}   # (metric, labels) -> value
+
+    def on_span(self, record: dict):
+        """Fold a finished span into the metrics."""
+
+        key = (record["kind"], record["name"])
+        labels = (("kind", record["kind"]), ("name", record["name"]))
+
+        with self._lock:
+            buckets, total, count = self._durations.setdefault(key, [[0] * len(DURATION_BUCKETS), 0.0, 0])
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if record["duration"] <= bound:
+                    buckets[i] += 1
+            self._durations[key] = [buckets, total + record["duration"], count + 1]
+
+            # Counters are taken from leaf spans only; node spans hold roll-ups of the same values
+            if record["kind"] != "node":
+                self._inc("cogito_input_tokens_total", labels, record["input_tokens"])
+                self._inc("cogito_output_tokens_total", labels, record["output_tokens"])
+                self._inc("cogito_cached_tokens_total", labels, record["cached_tokens"])
+                self._inc("cogito_cache_hits_total", labels, record["cache_hits"])
+            self._inc("cogito_retries_total", labels, record["retries"] if record["kind"] == "node" else 0)
+            if record["error"]:
+                self._inc("cogito_span_errors_total", labels + (("error", record["error"]),), 1)
+            for metric, value in record.get("metrics", {}).items():
+                self._inc(metric, labels, value)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+
+        lines = [
+            "# HELP cogito_span_duration_seconds Wall time of agent spans (nodes, LLM, embedding, Qdrant, SEP).",
+            "# TYPE cogito_span_duration_seconds histogram"
+        ]
+
+        with self._lock:
+            for (kind, name), (buckets, total, count) in sorted(self._durations.items()):
+                label_str = f'kind="{kind}",name="{_escape(name)}"'
+                for bound, bucket_count in zip(DURATION_BUCKETS, buckets):
+                    lines.append(f'cogito_span_duration_seconds_bucket{{{label_str},le="{bound}"}} {bucket_count}')
+                lines.append(f'cogito_span_duration_seconds_bucket{{{label_str},le="+Inf"}} {count}')
+                lines.append(f"cogito_span_duration_seconds_sum{{{label_str}}} {total}")
+                lines.append(f"cogito_span_duration_seconds_count{{{label_str}}} {count}")
+
+            seen_metrics = set()
+            for (metric, labels), value in sorted(self._counters.items()):
+                if metric not in seen_metrics:
+                    lines.append(f"# TYPE {metric} counter")
+                    seen_metrics.add(metric)
+                label_str = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels)
+                lines.append(f"{metric}{{{label_str}}} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int) -> ThreadingHTTPServer:
+        """Serve `/metrics` on a daemon thread."""
+
+        exporter = self
+
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def _inc(self, metric: str, labels: tuple, value: float):
+        """Increment a counter (caller holds the lock)."""
+
+        if not value:
+            return
+        self._counters[(metric, labels)] = self._counters.get((metric, labels), 0) + value
+
+
+class JsonTraceExporter:
+    """Writes one JSON trace file per agent run."""
+
+    # --- Methods ---
+    def __init__(self, directory: Path):
+        """Initialize the exporter, creating the output directory if needed."""
+
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def on_run(self, trace: RunTrace):
+        """Write the finished run to `trace-<run_id>.json`."""
+
+        path = self.directory / Path(f"trace-{trace.run_id}.json")
+        path.write_text(json.dumps(trace.to_dict(), indent=2, default=str), encoding="utf-8")
+
+
+_configured = False
+_configure_lock = threading.Lock()
+prometheus_exporter: PrometheusExporter | None = None
+
+def configure_exporters_from_env():
+    """Register exporters based on the environment (safe to call more than once).
+
+    - COGITO_TRACE_DIR: write a JSON trace per run into this directory
+    - COGITO_METRICS_PORT: serve Prometheus metrics on this port at /metrics
+    """
+
+    global _configured, prometheus_exporter
+
+    with _configure_lock:
+        if _configured:
+            return
+        _configured = True
+
+        trace_dir = os.getenv("COGITO_TRACE_DIR")
+        if trace_dir:
+            add_sink(JsonTraceExporter(Path(trace_dir)))
+
+        metrics_port = os.getenv("COGITO_METRICS_PORT")
+        if metrics_port:
+            prometheus_exporter = PrometheusExporter()
+            add_sink(prometheus_exporter)
+            prometheus_exporter.serve(int(metrics_port))
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
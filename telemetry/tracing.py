@@ -0,0 +1,227 @@
+"""Lightweight per-run tracing for the research agent.
+
+A run (one `ResearchAgent.run`) is made of nested spans: graph nodes, and inside them LLM calls, embedding calls, Qdrant
+queries and SEP lookups. Each span records wall time plus counters (tokens, cache hits, retries) which roll up into its
+parent, so a node span holds the totals of everything that happened inside it. Finished spans and runs are handed to
+registered sinks (see `telemetry.exporters`).
+
+State lives in context variables, so work handed to a thread pool must be wrapped with `propagate()` to stay attached
+to the right run.
+"""
+
+import contextvars
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable
+
+# Counters that roll up from child spans into their parents
+COUNTERS = ("input_tokens", "output_tokens", "cached_tokens", "cache_hits", "retries")
+
+_current_run: contextvars.ContextVar["RunTrace | None"] = contextvars.ContextVar("cogito_run", default=None)
+_current_span: contextvars.ContextVar[dict | None] = contextvars.ContextVar("cogito_span", default=None)
+
+_sinks: list = []
+_sinks_lock = threading.Lock()
+
+
+class RunTrace:
+    """All spans recorded during a single agent run."""
+
+    # --- Methods ---
+    def __init__(self, **attrs):
+        """Start a new run trace."""
+
+        self.run_id = uuid.uuid4().hex
+        self.started = time.time()
+        self.duration = 0.0
+        self.attrs = attrs
+        self.spans: list[dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: dict):
+        """Add a finished span."""
+
+        with self._lock:
+            self.spans.append(record)
+
+    def to_dict(self) -> dict:
+        """JSON-serializable view of the run."""
+
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start"])
+
+        return {
+            "run_id": self.run_id,
+            "started": self.started,
+            "duration": self.duration,
+            **self.attrs,
+            "spans": spans
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunTrace":
+        """Rebuild a run from its `to_dict()` view (e.g. one recorded in another process)."""
+
+        data = dict(data)
+        trace = cls()
+        trace.run_id = data.pop("run_id")
+        trace.started = data.pop("started")
+        trace.duration = data.pop("duration")
+        trace.spans = data.pop("spans")
+        trace.attrs = data
+        return trace
+
+
+class RunCollector:
+    """Sink that keeps finished runs until they're taken, so a worker process can ship them to its parent."""
+
+    # --- Methods ---
+    def __init__(self):
+        """Initialize an empty collector."""
+
+        self._runs: list[RunTrace] = []
+        self._lock = threading.Lock()
+
+    def on_run(self, trace: RunTrace):
+        """Keep a finished run."""
+
+        with self._lock:
+            self._runs.append(trace)
+
+    def take(self) -> list[dict]:
+        """Return every run collected so far (as `to_dict()` views) and forget them."""
+
+        with self._lock:
+            runs, self._runs = self._runs, []
+        return [trace.to_dict() for trace in runs]
+
+
+def add_sink(sink):
+    """Register a sink. Sinks may implement `on_span(record)` and/or `on_run(trace)`."""
+
+    with _sinks_lock:
+        if sink not in _sinks:
+            _sinks.append(sink)
+
+def remove_sink(sink):
+    """Unregister a sink."""
+
+    with _sinks_lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+def emit_recorded_run(data: dict):
+    """Hand a run recorded elsewhere (a `to_dict()` view) and its spans to this process's sinks."""
+
+    trace = RunTrace.from_dict(data)
+    for record in trace.spans:
+        _emit("on_span", record)
+    _emit("on_run", trace)
+
+def current_run() -> RunTrace | None:
+    """The run being traced in this context, if any."""
+
+    return _current_run.get()
+
+@contextmanager
+def trace_run(**attrs):
+    """Trace everything inside the block as one run."""
+
+    trace = RunTrace(**attrs)
+    token = _current_run.set(trace)
+    start = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.duration = time.perf_counter() - start
+        _current_run.reset(token)
+        _emit("on_run", trace)
+
+@contextmanager
+def span(kind: str, name: str, **attrs):
+    """Time the block as a span of `kind` (node, llm, embed, qdrant, sep) named `name`."""
+
+    parent = _current_span.get()
+    record = {
+        "kind": kind,
+        "name": name,
+        "parent": parent["name"] if parent else None,
+        "node": parent["node"] if parent else None,
+        "iteration": parent["iteration"] if parent else None,
+        "start": time.time(),
+        "duration": 0.0,
+        **{counter: 0 for counter in COUNTERS},
+        "error": None
+    }
+    record.update(attrs)
+
+    token = _current_span.set(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        record["duration"] = time.perf_counter() - start
+        _current_span.reset(token)
+
+        if parent is not None:
+            for counter in COUNTERS:
+                parent[counter] += record[counter]
+
+        run = _current_run.get()
+        if run is not None:
+            run.add(record)
+        _emit("on_span", record)
+
+def annotate(**values):
+    """Attach values to the current span. Counters are added to, anything else is set."""
+
+    record = _current_span.get()
+    if record is None:
+        return
+
+    for key, value in values.items():
+        if key in COUNTERS:
+            record[key] += value
+        else:
+            record[key] = value
+
+def record_llm_usage(result):
+    """Annotate the current span with token usage from a LangChain chat model result."""
+
+    usage = getattr(result, "usage_metadata", None) or {}
+    annotate(
+        input_tokens=usage.get("input_tokens", 0) or 0,
+        output_tokens=usage.get("output_tokens", 0) or 0,
+        cached_tokens=(usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+    )
+
+def propagate(func: Callable) -> Callable:
+    """Bind `func` to the current tracing context so it can be run on another thread."""
+
+    ctx = contextvars.copy_context()
+
+    def wrapped(*args, **kwargs):
+        # A context can only be entered by one thread at a time, so each call gets its own copy
+        return ctx.copy().run(func, *args, **kwargs)
+
+    return wrapped
+
+def _emit(hook: str, payload):
+    """Hand a finished span or run to every sink that implements `hook`. Sink failures never break a run."""
+
+    with _sinks_lock:
+        sinks = list(_sinks)
+
+    for sink in sinks:
+        handler = getattr(sink, hook, None)
+        if handler is None:
+            continue
+        try:
+            handler(payload)
+        except Exception as e:
+            print(f"::Telemetry sink {type(sink).__name__} failed: {e}")
@@ -0,0 +1,5 @@
+import os
+
+# Model clients are built at import time and require keys, even though no test calls a provider
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
@@ -0,0 +1,31 @@
+import unittest
+
+from ingest.chunking import is_heading
+from ingest.IngestionPipeline import IngestionPipeline
+
+
+class IsHeadingTest(unittest.TestCase):
+    def test_headings(self):
+        for paragraph in ("CHAPTER I.", "Chapter IV. Of Property", "BOOK II", "Part the First", "Introduction",
+                          "Introduction to the Critique of Pure Reason", "Chapter 3: of justice", "SECTION 12", "iv.",
+                          "Lecture XII—The Will", "PREFACE TO THE SECOND EDITION"):
+            with self.subTest(paragraph=paragraph):
+                self.assertTrue(is_heading(paragraph))
+
+    def test_prose_opening_with_a_heading_word(self):
+        for paragraph in ("Part of the problem is that he never left.", "Introduction of the concept came later.",
+                          "Part two of my argument shows this.", "Section civil law is complex.",
+                          "Book I have always loved.", "Conclusion: we must act."):
+            with self.subTest(paragraph=paragraph):
+                self.assertFalse(is_heading(paragraph))
+
+
+class IngestionPipelineTest(unittest.TestCase):
+    def test_rejects_overlap_not_below_max_tokens(self):
+        for overlap in (64, 100, -1):
+            with self.subTest(overlap=overlap), self.assertRaises(ValueError):
+                IngestionPipeline(None, None, None, max_tokens=64, overlap_tokens=overlap)
+
+
+if __name__ == "__main__":
+    unittest.main()
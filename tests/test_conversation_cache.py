@@ -0,0 +1,84 @@
+import hashlib
+import json
+import unittest
+
+from langchain_core.messages import AIMessage, HumanMessage, messages_to_dict
+
+from cogito_servicer.ConversationCache import ConversationCache
+
+
+def digest(messages: list[dict]) -> str:
+    return hashlib.md5(json.dumps(messages, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class FakeConversations:
+    """In-memory stand-in for the versioned conversation queries in `dbs.Postgres`."""
+
+    def __init__(self, messages: list[dict]):
+        self.messages = messages
+        self.version = 0
+        self.full_reads = 0
+
+    def write(self, messages: list[dict]):
+        """Another writer updating the row (the trigger bumps the version)."""
+
+        self.messages = messages
+        self.version += 1
+
+    def get_conversation_versioned(self, user_id, conversation_id):
+        self.full_reads += 1
+        return self.version, digest(self.messages), list(self.messages)
+
+    def get_conversation_tail(self, user_id, conversation_id, version, known_length):
+        if version == self.version:
+            return self.version, None, None, None
+        return (self.version, digest(self.messages[:known_length]), digest(self.messages),
+                self.messages[known_length:])
+
+    def update_conversation_versioned(self, user_id, conversation_id, messages, version):
+        if version != self.version:
+            return None
+        self.write(list(messages))
+        return self.version, digest(self.messages)
+
+
+def contents(conversation) -> list[str]:
+    return [m.content for m in conversation["messages"]]
+
+
+class ConversationCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeConversations(messages_to_dict([HumanMessage("What is virtue?")]))
+        self.cache = ConversationCache(self.db, max_entries=4)
+
+        conversation = self.cache.load(1, 1)
+        answer = AIMessage("Excellence of character.")
+        conversation["messages"].append(answer)
+        conversation["message_dicts"] += messages_to_dict([answer])
+        self.assertTrue(self.cache.store(1, 1, conversation))
+        self.db.full_reads = 0
+
+    def test_append_reads_only_the_tail(self):
+        self.db.write(self.db.messages + messages_to_dict([HumanMessage("Who said so?")]))
+
+        conversation = self.cache.load(1, 1)
+        self.assertEqual(contents(conversation), ["What is virtue?", "Excellence of character.", "Who said so?"])
+        self.assertEqual(self.db.full_reads, 0)
+
+    def test_edit_earlier_message_and_append(self):
+        edited = messages_to_dict([HumanMessage("What is justice?")]) + self.db.messages[1:]
+        self.db.write(edited + messages_to_dict([HumanMessage("Who said so?")]))
+
+        conversation = self.cache.load(1, 1)
+        self.assertEqual(contents(conversation), ["What is justice?", "Excellence of character.", "Who said so?"])
+        self.assertEqual(self.db.full_reads, 1)
+
+    def test_conflicting_store_is_refused(self):
+        conversation = self.cache.load(1, 1)
+        self.db.write(self.db.messages + messages_to_dict([HumanMessage("Who said so?")]))
+
+        self.assertFalse(self.cache.store(1, 1, conversation))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cli.conversations import conversations
+from cli.conversations.ConversationJournal import ConversationJournal
+
+
+def message(text: str) -> dict:
+    return {"type": "human", "data": {"content": text, "type": "human"}}
+
+
+class ConversationJournalTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(conversations, "CONVERSATIONS_DIR", Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def contents(self, conversation_id: int) -> list[str]:
+        conversation = conversations.read_conversation_dict(conversation_id)
+        return [m["data"]["content"] for m in conversation["conversation"]]
+
+    def test_resume_after_torn_append(self):
+        journal = ConversationJournal(1, "Torn", compact_every=100)
+        journal.append([message("one"), message("two")])
+        journal._file.close()
+
+        # Crash halfway through writing the third record
+        with open(conversations.journal_path(1), "a", encoding="utf-8") as f:
+            f.write('{"seq": 3, "message": {"type": "hu')
+
+        resumed = ConversationJournal(1, "Torn", compact_every=100)
+        resumed.append([message("three")])
+        self.assertEqual(self.contents(1), ["one", "two", "three"])
+
+        resumed.close()
+        self.assertEqual(self.contents(1), ["one", "two", "three"])
+
+    def test_unterminated_final_record_is_dropped(self):
+        journal = ConversationJournal(2, "Unterminated", compact_every=100)
+        journal.append([message("one")])
+        journal._file.close()
+
+        # The record parses but its newline never made it to disk, so it was never acknowledged
+        with open(conversations.journal_path(2), "a", encoding="utf-8") as f:
+            f.write('{"seq": 2, "message": {"type": "human", "data": {"content": "lost", "type": "human"}}}')
+
+        resumed = ConversationJournal(2, "Unterminated", compact_every=100)
+        resumed.append([message("two")])
+        self.assertEqual(self.contents(2), ["one", "two"])
+        resumed.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import unittest
+
+from dbs.Postgres import Postgres
+
+
+class CountingConnection:
+    """Connection stand-in that serves the filters table and counts full reads."""
+
+    def __init__(self, rows: list[tuple[str, str]]):
+        self.rows = rows
+        self.reads = 0
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def execute(self, query, params=None):
+                connection.reads += 1
+
+            def fetchall(self):
+                return list(connection.rows)
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+
+class ApplyNotificationsTest(unittest.TestCase):
+    def setUp(self):
+        self.postgres = Postgres.__new__(Postgres)
+        self.postgres.filters_table = "filters"
+        self.postgres.author_sources = {"Immanuel Kant": ["Critique of Pure Reason"], "David Hume": ["Enquiry"]}
+        self.conn = CountingConnection([("Immanuel Kant", "Critique of Pure Reason")])
+
+    def test_burst_of_deltas_applies_without_reload(self):
+        before = self.postgres.author_sources
+        payloads = [json.dumps(d) for d in (
+            {"op": "INSERT", "author": "Immanuel Kant", "source": "Critique of Judgement"},
+            {"op": "INSERT", "author": "John Locke", "source": "Second Treatise"},
+            {"op": "DELETE", "author": "David Hume", "source": "Enquiry", "remaining": False},
+            {"op": "DELETE", "author": "Immanuel Kant", "source": "Critique of Pure Reason", "remaining": True}
+        )]
+
+        self.postgres._apply_notifications(payloads, self.conn)
+
+        self.assertEqual(self.conn.reads, 0)
+        self.assertEqual(self.postgres.author_sources, {
+            "Immanuel Kant": ["Critique of Judgement", "Critique of Pure Reason"],
+            "John Locke": ["Second Treatise"]
+        })
+        # Copy-on-write: the map readers already hold is untouched
+        self.assertIn("David Hume", before)
+
+    def test_plain_notification_reloads(self):
+        payloads = [json.dumps({"op": "INSERT", "author": "John Locke", "source": "Second Treatise"}), "filters"]
+
+        self.postgres._apply_notifications(payloads, self.conn)
+
+        self.assertEqual(self.conn.reads, 1)
+        self.assertEqual(self.postgres.author_sources, {"Immanuel Kant": ["Critique of Pure Reason"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
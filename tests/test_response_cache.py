@@ -0,0 +1,32 @@
+import unittest
+
+from langchain_core.messages import HumanMessage
+from langchain_groq import ChatGroq
+
+from ai.models.ResponseCache import ResponseCache
+from bench.fakes import FakeChatModel
+from bench.fixtures import FixtureStore, RecordReplayChatModel
+
+
+class MakeKeyTest(unittest.TestCase):
+    messages = [HumanMessage("What is virtue?")]
+
+    def test_stand_in_models(self):
+        store = FixtureStore(None, "record")
+        for model in (FakeChatModel("research_classifier", latency=0),
+                      RecordReplayChatModel("research_classifier", None, store)):
+            with self.subTest(model=type(model).__name__):
+                self.assertEqual(len(ResponseCache.make_key(model, self.messages)), 64)
+
+    def test_sampling_params_change_the_key(self):
+        cold = ChatGroq(model="llama-3.1-8b-instant", temperature=0.0)
+        warm = ChatGroq(model="llama-3.1-8b-instant", temperature=0.7)
+
+        self.assertEqual(ResponseCache.make_key(cold, self.messages), ResponseCache.make_key(cold, self.messages))
+        self.assertNotEqual(ResponseCache.make_key(cold, self.messages), ResponseCache.make_key(warm, self.messages))
+        self.assertNotEqual(ResponseCache.make_key(cold, self.messages),
+                            ResponseCache.make_key(cold.bind(max_tokens=5), self.messages))
+
+
+if __name__ == "__main__":
+    unittest.main()
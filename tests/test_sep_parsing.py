@@ -0,0 +1,48 @@
+import unittest
+
+from ai.research_agent.sources import sep
+
+ARTICLE = """<html><head>
+<meta property="citation_title" content="Immanuel Kant">
+<meta property="citation_author" content="Rohlf, Michael">
+<meta property="citation_publication_date" content="2010/05/20">
+<style>body { color: red; }</style>
+</head><body>
+<div id="aueditable">
+<div id="main-text">
+<h2>1. Kant's Life</h2>
+<p>Kant was born in <em>Königsberg</em> in 1724.<script>track("p1");</script> He never left.</p>
+<!-- editorial note -->
+<script>window.sepData = {"section": 1};</script>
+<h3>1.1 Education</h3>
+<p>He studied at the <a href="#">Collegium Fridericianum</a>.</p>
+<style>.note { display: none; }</style>
+<ul><li>Pietism</li><li>Wolffian  philosophy</li></ul>
+<h2>2. The Critique</h2>
+<div class="note"><style>p { margin: 0 }</style><p>The first  <b>Critique</b> appeared in 1781.</p></div>
+</div>
+</div>
+<div id="article-copyright">Copyright</div>
+</body></html>"""
+
+
+@unittest.skipIf(sep.lxml_html is None, "lxml is not installed")
+class SepParserParityTest(unittest.TestCase):
+    def test_parsers_agree(self):
+        lxml_result = sep._parse_sections_untraced(ARTICLE, parser="lxml")
+        bs4_result = sep._parse_sections_untraced(ARTICLE, parser="html.parser")
+        self.assertEqual(lxml_result, bs4_result)
+
+    def test_scripts_and_styles_are_dropped(self):
+        sections, citation = sep._parse_sections_untraced(ARTICLE, parser="lxml")
+        text = " ".join(" ".join([s["header"], *s["content"]]) for s in sections)
+
+        self.assertEqual(citation["title"], "Immanuel Kant")
+        self.assertEqual([s["header"] for s in sections], ["1. Kant's Life", "2. The Critique"])
+        self.assertIn("He never left.", text)
+        for fragment in ("track(", "sepData", "display: none", "margin"):
+            self.assertNotIn(fragment, text)
+
+
+if __name__ == "__main__":
+    unittest.main()